@@ -15,6 +15,14 @@ __url__ = 'https://github.com/rndusr/stig'
 
 
 def run():
+    # Let a running server do the work
+    import sys
+
+    from . import server
+    exit_code = server.forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
     try:
         from . import main
         if main.cliargs['profile_file'] is not None:
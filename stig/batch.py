@@ -0,0 +1,171 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""
+Run command lines from stdin in one process
+
+Each line is a command chain like in an rc file.  Output of each command line
+is printed when it has finished, in the order of the input lines, and followed
+by a line on stdout that starts with FOOTER, e.g. "<<< 0 ls foo".  The number
+is 0 if the command line succeeded and 1 if it failed.
+
+Up to `jobs` command lines run at the same time so their requests to the daemon
+can overlap.  Their output is captured per command line so it doesn't mix.
+"""
+
+import asyncio
+import sys
+
+from .logging import redirect_output
+from .settings.rcfile import _unescape_linebreaks
+
+from .logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+try:
+    import contextvars
+except ImportError:
+    # Python 3.6 doesn't propagate context to tasks; only one command line can
+    # run at a time
+    contextvars = None
+
+FOOTER = '<<<'
+
+
+class _GlobalVar():
+    # Minimal ContextVar replacement for running one command line at a time
+    def __init__(self, name, default=None):
+        self._value = default
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+if contextvars is not None:
+    _output = contextvars.ContextVar('output', default=None)
+else:
+    _output = _GlobalVar('output', default=None)
+
+
+class _RoutedStream():
+    """
+    Writable text stream that captures output of the current command line
+
+    Output from outside of any command line goes to `stream`.
+
+    stream: Stream that is written to if there is no capture buffer
+    index: 0 for stdout, 1 for stderr
+    """
+
+    def __init__(self, stream, index):
+        self._stream = stream
+        self._index = index
+
+    @property
+    def encoding(self):
+        return self._stream.encoding
+
+    def write(self, string):
+        buffers = _output.get()
+        if buffers is None:
+            return self._stream.write(string)
+        buffers[self._index].append(string)
+        return len(string)
+
+    def flush(self):
+        if _output.get() is None:
+            self._stream.flush()
+
+    def isatty(self):
+        return False
+
+
+def _read_cmdlines(lines):
+    # Skip empty lines and comments and join lines that end with "\" like in
+    # rc files
+    return _unescape_linebreaks(line
+                                for line in (line.strip() for line in lines)
+                                if line and not line.startswith('#'))
+
+
+async def _run_cmdline(cmdmgr, cmdline):
+    # Return success and captured stdout and stderr of `cmdline`
+    buffers = ([], [])
+    _output.set(buffers)
+    try:
+        success = await cmdmgr.run_async(cmdline)
+    except Exception as e:
+        log.exception(e)
+        success = False
+    finally:
+        _output.set(None)
+    return success, ''.join(buffers[0]), ''.join(buffers[1])
+
+
+async def run(cmdmgr, lines, jobs=1):
+    """
+    Run command lines from `lines` and print their output
+
+    lines: Iterable of strings
+    jobs: Maximum number of command lines that run at the same time
+
+    Return `True` if all command lines succeeded, `False` otherwise.
+    """
+    if contextvars is None:
+        jobs = 1
+    loop = asyncio.get_event_loop()
+    slots = asyncio.Semaphore(max(1, int(jobs)))
+    queue = asyncio.Queue()
+    cmdlines = _read_cmdlines(lines)
+
+    async def start_cmdlines():
+        while True:
+            await slots.acquire()
+            # Reading from stdin blocks
+            cmdline = await loop.run_in_executor(None, next, cmdlines, None)
+            if cmdline is None:
+                break
+            task = loop.create_task(_run_cmdline(cmdmgr, cmdline))
+            await queue.put((cmdline, task))
+        await queue.put(None)
+
+    producer = loop.create_task(start_cmdlines())
+    all_succeeded = True
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            cmdline, task = item
+            success, stdout, stderr = await task
+            if stderr:
+                sys.stderr.write(stderr)
+                sys.stderr.flush()
+            # Ignored commands return None, which is not a failure
+            exit_code = 1 if success is False else 0
+            if exit_code != 0:
+                all_succeeded = False
+            sys.stdout.write('%s%s %d %s\n' % (stdout, FOOTER, exit_code, cmdline))
+            sys.stdout.flush()
+            slots.release()
+    finally:
+        producer.cancel()
+    return all_succeeded
+
+
+def run_sync(cmdmgr, lines=sys.stdin, jobs=1):
+    """Blocking version of :func:`run`"""
+    stdout = _RoutedStream(sys.stdout, 0)
+    stderr = _RoutedStream(sys.stderr, 1)
+    with redirect_output(stdout, stderr):
+        return asyncio.get_event_loop().run_until_complete(run(cmdmgr, lines, jobs=jobs))
@@ -23,7 +23,8 @@ from .aiotransmission.torrent import Torrent
 from .api import API
 from .filters import FileFilter, PeerFilter, SettingFilter, TorrentFilter, TrackerFilter
 from .poll import RequestPoller
+from .priority import Priority, request_priority
 from .sorters import PeerSorter, SettingSorter, TorrentSorter, TrackerSorter
 from .trequestpool import TorrentRequestPool
 from .ttypes import TorrentFile, TorrentPeer, TorrentTracker
-from .utils import URL, Response
+from .utils import URL, Progress, Response
@@ -0,0 +1,96 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Combine peers or trackers of many torrents"""
+
+from ..logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+
+class Aggregator():
+    """
+    Items (e.g. peers or trackers) of many torrents in one dictionary
+
+    Item lists are expected to update their items in place and to have a
+    `revision` attribute that changes when items are added or removed.  Only
+    the lists of torrents that have a different list or revision than in the
+    previous call to :meth:`update` are processed.
+
+    This only keeps track of which items exist.  Item values (e.g. transfer
+    rates) change in place, so any filtering or sorting by them must still
+    look at every item.
+
+    key: Torrent key that holds the item list (e.g. "peers")
+    """
+
+    def __init__(self, key):
+        self._key = key
+        self._items = {}      # Item ID -> item
+        self._lists = {}      # Torrent ID -> (item list, revision, item IDs)
+
+    @property
+    def items(self):
+        """Dictionary that maps item IDs to items of all torrents"""
+        return self._items
+
+    def update(self, torrents):
+        """
+        Add, remove or keep items from `torrents`
+
+        Torrents that are not in `torrents` lose their items.  Return whether
+        any items were added or removed.
+        """
+        key = self._key
+        lists = self._lists
+        seen = set()
+        changed = False
+        for t in torrents:
+            tid = t['id']
+            seen.add(tid)
+            itemlist = t[key]
+            revision = getattr(itemlist, 'revision', None)
+            prev = lists.get(tid)
+            if prev is not None and prev[0] is itemlist and revision is not None and prev[1] == revision:
+                continue
+            old_ids = prev[2] if prev is not None else frozenset()
+            new_items = {item['id']: item for item in itemlist}
+            new_ids = frozenset(new_items)
+            if prev is None or prev[0] is not itemlist or new_ids != old_ids:
+                self._remove(old_ids)
+                self._add(new_items)
+                changed = True
+            lists[tid] = (itemlist, revision, new_ids)
+
+        for tid in tuple(lists):
+            if tid not in seen:
+                self._remove(lists.pop(tid)[2])
+                changed = True
+        return changed
+
+    def _add(self, items):
+        self._items.update(items)
+
+    def _remove(self, ids):
+        items = self._items
+        for id in ids:
+            items.pop(id, None)
+
+    def clear(self):
+        """Forget all items"""
+        self._items.clear()
+        self._lists.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return '<%s %s: %d items from %d torrents>' % (
+            type(self).__name__, self._key, len(self._items), len(self._lists))
@@ -9,6 +9,7 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import json
 import os
 from collections import abc, defaultdict
 from types import SimpleNamespace
@@ -103,7 +104,8 @@ class SettingsAPI(abc.Mapping, RequestPoller):
         self._on_update = blinker.Signal()
         self._on_set = defaultdict(lambda: blinker.Signal())
 
-        super().__init__(self._srvapi.rpc.session_get, interval=interval)
+        super().__init__(self._srvapi.rpc.session_get, interval=interval,
+                         fingerprint=self._fingerprint_session_get)
         self.on_response(self._handle_session_get)
         self.on_error(self._handle_error)
 
@@ -146,6 +148,12 @@ class SettingsAPI(abc.Mapping, RequestPoller):
         log.debug('Requesting immediate settings update')
         self._handle_session_get(await self.request())
 
+    @staticmethod
+    def _fingerprint_session_get(response):
+        # Settings rarely change, so we don't want to bother callbacks with
+        # identical 'session-get' responses
+        return hash(json.dumps(response, sort_keys=True))
+
     def _handle_session_get(self, response):
         """Request update from server"""
         log.debug('Handling settings update')
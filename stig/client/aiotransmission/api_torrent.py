@@ -9,6 +9,7 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import asyncio
 import base64
 import os
 import time
@@ -16,29 +17,66 @@ from collections import abc
 from enum import Enum
 from string import hexdigits as HEXDIGITS
 
+import blinker
 from natsort import humansorted
 
-from .. import ClientError
+from .. import bencode
 from ..base import TorrentAPIBase
 from ..constants import MAX_TORRENT_FILE_SIZE
+from ..errors import ClientError, ConnectionError, TimeoutError
 from ..filters import FileFilter, TorrentFilter
-from ..utils import (URL, Bandwidth, Bool, BoolOrBandwidth, Response, SizeInBytes,
-                     SmartCmpPath)
+from ..utils import (URL, Bandwidth, Bool, BoolOrBandwidth, Progress, Response,
+                     SizeInBytes, SmartCmpPath)
 from .torrent import Torrent, TorrentFields
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
+def _read_torrent_file(torrent_str, torrent_path):
+    # Return torrent file content as base64 string and info hash (or None if
+    # the file can't be parsed); raise ValueError if the file can't be read
+    try:
+        torrent_file_size = os.path.getsize(torrent_path)
+    except OSError:
+        raise ValueError('Torrent file vanished: %r' % (torrent_str,))
+    if torrent_file_size > MAX_TORRENT_FILE_SIZE:
+        raise ValueError('%s is bigger than %s: %s (%s bytes)' % (
+            torrent_str, MAX_TORRENT_FILE_SIZE,
+            SizeInBytes(torrent_file_size), torrent_file_size))
+
+    try:
+        with open(torrent_path, 'rb') as f:
+            data = f.read(MAX_TORRENT_FILE_SIZE)
+    except OSError as e:
+        raise ValueError('%s: %s' % (e.strerror, torrent_path))
+
+    try:
+        info_hash = bencode.info_hash(data)
+    except ValueError as e:
+        # Let the daemon report invalid torrent files
+        log.debug('Unable to find info hash of %s: %s', torrent_path, e)
+        info_hash = None
+    return str(base64.b64encode(data), encoding='ascii'), info_hash
+
+
 class _TorrentCache():
+    # RPC fields that are requested less often than others (see `is_outdated`)
+    _THROTTLED_FIELDS = ('trackerStats',)
+
     def __init__(self, raw_torrents=()):
         self._tdict = {}  # Map torrent IDs to Torrent objects
+        self._times = {}  # Map (torrent ID, field) to time when the field was received
 
     def update(self, raw_torrents):
         # import time ; start = time.time()
         tdict = self._tdict
+        now = time.monotonic()
         for rt in raw_torrents:
             tid = rt['id']
+            for field in self._THROTTLED_FIELDS:
+                if field in rt:
+                    self._times[(tid, field)] = now
             if tid in tdict:
                 # Update existing torrent
                 # log.debug('Updating torrent #%d, %d keys: %s', tid, len(rt), tuple(rt))
@@ -50,15 +88,62 @@ class _TorrentCache():
         # log.debug('Updated %d cached with %d new torrents in %.3fms',
         #           len(tdict), len(raw_torrents), (time.time()-start)*1000)
 
+    def needs_files(self, raw_torrent):
+        """
+        Whether the static 'files' field must be requested for `raw_torrent`
+
+        The 'files' field (file names and sizes) never changes once a torrent's
+        metadata is known, so it is only requested for torrents we haven't seen
+        yet or if the number of files changed (e.g. metadata of a magnet link
+        was downloaded).
+        """
+        torrent = self._tdict.get(raw_torrent['id'])
+        if torrent is None:
+            return True
+        files = torrent._raw.get('files')
+        if files is None:
+            return True
+        fileStats = raw_torrent.get('fileStats')
+        return fileStats is not None and len(fileStats) != len(files)
+
+    def is_outdated(self, raw_torrent, field, max_age):
+        """
+        Whether `field` of `raw_torrent` is missing from the cache or is older
+        than `max_age`
+
+        Fields of all torrents are usually received at the same time.  To
+        spread later requests over time, each torrent gets a different maximum
+        age between half of `max_age` and `max_age`.
+        """
+        tid = raw_torrent['id']
+        received = self._times.get((tid, field))
+        if received is None:
+            return True
+        # Fractional part of tid * golden ratio is evenly distributed
+        spread = (tid * 0.6180339887) % 1
+        return time.monotonic() - received > max_age * (1 - spread / 2)
+
+    def forget_files(self, tid):
+        """Make sure the 'files' field of torrent `tid` is requested again"""
+        torrent = self._tdict.get(tid)
+        if torrent is not None:
+            torrent._raw.pop('files', None)
+            torrent._cache.pop('files', None)
+
     def purge(self, existing_tids):
         """Remove torrents with IDs that are not in `existing_ids`"""
+        self.remove(*set(self._tdict).difference(existing_tids))
+
+    def remove(self, *tids):
+        """Remove torrents with IDs `tids`"""
         tdict = self._tdict
-        known_tids = set(tdict)
-        removed_tids = known_tids.difference(existing_tids)
+        removed_tids = set(tid for tid in tids if tid in tdict)
         if removed_tids:
             log.debug('Clearing cached torrents: %r', removed_tids)
-        for tid in removed_tids:
-            del tdict[tid]
+            for tid in removed_tids:
+                del tdict[tid]
+            self._times = {(tid, field): t for (tid, field), t in self._times.items()
+                           if tid not in removed_tids}
 
     def get(self, *ids):
         """Return tuple of Torrent objects"""
@@ -79,9 +164,33 @@ class _TorrentCache():
 class TorrentAPI(TorrentAPIBase):
     """High-level abstraction of the Transmission RPC protocol"""
 
-    def __init__(self, rpc):
+    # Keys that need the current 'trackerStats' field; other keys (e.g. 'status')
+    # only use it to derive values and accept older tracker information
+    _CURRENT_TRACKERS_KEYS = ('trackers',)
+
+    def __init__(self, rpc, tracker_stats_max_age=30, concurrency=10, chunk_size=1000, retries=2,
+                 retry_delay=1):
         self.rpc = rpc
+        self.tracker_stats_max_age = tracker_stats_max_age
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.retry_delay = retry_delay
         self._tcache = _TorrentCache()
+        self._on_progress = blinker.Signal()
+
+    def on_progress(self, callback, autoremove=True):
+        """
+        Register `callback` to be called while torrents are processed in chunks
+
+        `callback` gets a :class:`Progress` instance after each chunk.  It is
+        not called if all torrents fit into one chunk.
+
+        If `autoremove` is True, `callback` is removed automatically when it is
+        deleted.
+        """
+        log.debug('Registering %r to receive progress updates', callback)
+        self._on_progress.connect(callback, weak=autoremove)
 
     def clearcache(self):
         """Remove all torrents from cache"""
@@ -151,9 +260,7 @@ class TorrentAPI(TorrentAPIBase):
             msgs:    List of info messages
             errors:  List of error messages
         """
-        torrent_str = torrent
         args = {'paused': bool(stopped), 'labels': labels}
-
         if path is not None:
             response = await self._abs_download_path(path)
             if not response.success:
@@ -161,37 +268,114 @@ class TorrentAPI(TorrentAPIBase):
             else:
                 args['download-dir'] = response.path
 
-        # Check if torrent_str is path to local torrent file
-        torrent_path = os.path.expanduser(torrent_str)
-        if os.path.exists(torrent_path):
-            try:
-                torrent_file_size = os.path.getsize(torrent_path)
-            except OSError:
-                return Response(success=False, torrent=None,
-                                errors=('Torrent file vanished: %r' % (torrent_str,)))
+        try:
+            args.update(await self._get_torrent_add_source(torrent))
+        except ValueError as e:
+            return Response(success=False, torrent=None, errors=(str(e),))
+        return await self._torrent_add(torrent, args, labels)
+
+    async def add_many(self, torrents, stopped=False, path=None, labels=[]):
+        """
+        Add many torrents from files, URLs or hashes
+
+        torrents: Sequence of paths to local files, web/magnet links or hashes
+
+        See `add` for the other arguments.
+
+        Local torrent files are read and parsed in a thread pool.  Torrent files
+        and hashes of torrents that already exist (or that are given twice) are
+        not sent to the daemon.  Up to `concurrency` torrents are added at the
+        same time.
+
+        Return Response with the following properties:
+            torrents: Tuple of added Torrent objects with the keys 'id' and 'name'
+            results:  Tuple of Responses from `add` for each item in `torrents`
+                      or empty tuple if the daemon is unreachable
+            success:  True if all torrents were added, False otherwise
+            msgs:     List of info messages
+            errors:   List of error messages
+        """
+        args = {'paused': bool(stopped), 'labels': labels}
+        if path is not None:
+            response = await self._abs_download_path(path)
+            if not response.success:
+                return Response(success=False, torrents=(), results=(), errors=response.errors)
             else:
-                if torrent_file_size > MAX_TORRENT_FILE_SIZE:
-                    e = '%s is bigger than %s: %s (%s bytes)' % (
-                        torrent_str, MAX_TORRENT_FILE_SIZE,
-                        SizeInBytes(torrent_file_size), torrent_file_size)
-                    return Response(success=False, torrent=None, errors=(e,))
+                args['download-dir'] = response.path
 
-            # Read local file
-            try:
-                with open(torrent_path, 'rb') as f:
-                    args['metainfo'] = str(base64.b64encode(f.read(MAX_TORRENT_FILE_SIZE)),
-                                           encoding='ascii')
-            except OSError as e:
-                return Response(success=False, torrent=None,
-                                errors=('%s: %s' % (e.strerror, torrent_path),))
-        elif len(torrent_str) == 40 and all(c in HEXDIGITS for c in torrent_str):
+        # Map info hashes of existing torrents to their names to avoid sending
+        # torrent files the daemon would reject.  The cache may know torrents
+        # that were removed since, so the hashes must be current.  This isn't
+        # worth a request for a single torrent; the daemon reports duplicates.
+        existing = {}
+        if len(torrents) > 1:
+            response = await self.torrents(keys=('hash', 'name'))
+            if not response.success:
+                return Response(success=False, torrents=(), results=(), errors=response.errors)
+            existing = {t['hash'].lower(): t['name'] for t in response.torrents}
+
+        slots = asyncio.Semaphore(max(1, self.concurrency))
+        unreachable = False
+
+        async def add(torrent):
+            nonlocal unreachable
+            async with slots:
+                try:
+                    source_args = await self._get_torrent_add_source(torrent)
+                except ValueError as e:
+                    return Response(success=False, torrent=None, errors=(str(e),))
+
+                info_hash = source_args.get('hash')
+                if info_hash is not None:
+                    if info_hash in existing:
+                        return Response(success=False, torrent=None,
+                                        errors=('Torrent already exists: %s' % (existing[info_hash],),))
+                    existing[info_hash] = torrent
+                response = await self._torrent_add(torrent, dict(args, **source_args), labels)
+                # The connection is closed on any error except RPCError
+                if not response.success and not self.rpc.connected:
+                    unreachable = True
+                return response
+
+        responses = await asyncio.gather(*(add(torrent) for torrent in torrents))
+        if unreachable and not any(r.success for r in responses):
+            errors = []
+            for r in responses:
+                errors.extend(e for e in r.errors if e not in errors)
+            return Response(success=False, torrents=(), results=(), errors=errors)
+        return Response(success=all(r.success for r in responses),
+                        torrents=tuple(r.torrent for r in responses if r.success),
+                        results=tuple(responses),
+                        msgs=[msg for r in responses for msg in r.msgs],
+                        errors=[error for r in responses for error in r.errors])
+
+    async def _get_torrent_add_source(self, torrent):
+        """
+        Return 'torrent-add' arguments that specify the torrent
+
+        The returned dictionary also contains the key "hash" with the lowercase
+        info hash if it is known without asking the daemon.
+
+        Raise ValueError if `torrent` is a local file that can't be read.
+        """
+        # Check if torrent is path to local torrent file
+        torrent_path = os.path.expanduser(torrent)
+        if os.path.exists(torrent_path):
+            loop = asyncio.get_event_loop()
+            metainfo, info_hash = await loop.run_in_executor(None, _read_torrent_file,
+                                                             torrent, torrent_path)
+            return {'metainfo': metainfo, 'hash': info_hash}
+        elif len(torrent) == 40 and all(c in HEXDIGITS for c in torrent):
             # Convert hash to magnet link
-            args['filename'] = 'magnet:?xt=urn:btih:' + torrent_str
+            return {'filename': 'magnet:?xt=urn:btih:' + torrent, 'hash': torrent.lower()}
         else:
             # It's either a link or a torrent file on the server - let the
             # daemon figure it out
-            args['filename'] = torrent_str
+            return {'filename': torrent}
 
+    async def _torrent_add(self, torrent_str, args, labels):
+        # Send 'torrent-add' request and return Response for `add`
+        args = {k: v for k,v in args.items() if k != 'hash'}
         response = await self._request(self.rpc.torrent_add, **args)
         if not response.success:
             errors = []
@@ -228,10 +412,14 @@ class TorrentAPI(TorrentAPIBase):
             return Response(success=success, torrent=torrent, msgs=msgs, errors=errors)
 
 
-    async def _request_torrents(self, fields, ids=None):
+    async def _request_torrents(self, fields, ids=None, throttle_trackers=False):
         """
         Make 'torrent-get' RPC request
 
+        throttle_trackers: Whether the 'trackerStats' field may be taken from
+                           the cache if it is not older than
+                           `tracker_stats_max_age` seconds
+
         Return a Response object with 'raw_torrents' set to a tuple of torrents
         according to the RPC spec.
         """
@@ -240,6 +428,22 @@ class TorrentAPI(TorrentAPIBase):
 
         if 'id' not in fields:
             fields = ('id',) + tuple(fields)
+
+        # File names and sizes are static and can be huge, so we only request
+        # them for torrents that don't have them cached already
+        want_files = 'files' in fields
+        if want_files:
+            fields = tuple(f for f in fields if f != 'files')
+            if 'fileStats' not in fields:
+                fields += ('fileStats',)
+
+        # Tracker information is big and is requested separately if it is
+        # outdated; without cached torrents (e.g. in the CLI), everything is
+        # outdated and a separate request is a waste of time
+        throttle_trackers = throttle_trackers and 'trackerStats' in fields and len(self._tcache) > 0
+        if throttle_trackers:
+            fields = tuple(f for f in fields if f != 'trackerStats')
+
         try:
             if ids is None:
                 # Request all IDs
@@ -251,6 +455,13 @@ class TorrentAPI(TorrentAPIBase):
                 else:
                     # No IDs (i.e. empty torrent list) requested
                     raw_tlist = []
+
+            if want_files:
+                await self._request_missing_field(raw_tlist, 'files', self._tcache.needs_files)
+            if throttle_trackers:
+                def is_outdated(rt):
+                    return self._tcache.is_outdated(rt, 'trackerStats', self.tracker_stats_max_age)
+                await self._request_missing_field(raw_tlist, 'trackerStats', is_outdated)
         except ClientError as e:
             return Response(success=False, raw_torrents=(), errors=(str(e),))
         else:
@@ -265,6 +476,20 @@ class TorrentAPI(TorrentAPIBase):
             log.debug('Requested %d torrents in %.3fms', len(raw_tlist), (time() - start) * 1e3)
             return Response(success=True, raw_torrents=raw_tlist)
 
+    async def _request_missing_field(self, raw_tlist, field, is_missing):
+        """
+        Add `field` to each torrent in `raw_tlist` if `is_missing` returns `True`
+        for it
+        """
+        missing = {rt['id']: rt for rt in raw_tlist if is_missing(rt)}
+        if missing:
+            log.debug('Requesting %r of %d torrents', field, len(missing))
+            raw_values = await self.rpc.torrent_get(fields=('id', field), ids=tuple(missing))
+            for rv in raw_values:
+                rt = missing.get(rv.get('id'))
+                if rt is not None and field in rv:
+                    rt[field] = rv[field]
+
     def _get_torrents_from_cache(self, ids):
         """
         Get torrents from internal cache without making a request
@@ -305,8 +530,10 @@ class TorrentAPI(TorrentAPIBase):
         """
         if keys == 'ALL':
             fields = TorrentFields(keys)
+            throttle_trackers = False
         else:
             fields = TorrentFields(*keys)
+            throttle_trackers = not any(key in keys for key in self._CURRENT_TRACKERS_KEYS)
 
         if from_cache:
             response = self._get_torrents_from_cache(ids)
@@ -324,7 +551,7 @@ class TorrentAPI(TorrentAPIBase):
             else:
                 log.debug('Some fields are missing from torrent - enforcing request')
 
-        response = await self._request_torrents(fields, ids)
+        response = await self._request_torrents(fields, ids, throttle_trackers=throttle_trackers)
         if not response.success:
             return Response(success=False, torrents=(), errors=response.errors)
         else:
@@ -406,7 +633,7 @@ class TorrentAPI(TorrentAPIBase):
 
 
     async def _torrent_action(self, method, torrents=None, method_args={},
-                              check=None, check_keys=()):
+                              check=None, check_keys=(), idempotent=True):
         """
         Helper method that operates on torrents (start, stop, remove, etc)
 
@@ -420,6 +647,14 @@ class TorrentAPI(TorrentAPIBase):
                      otherwise not.
         check_keys:  List of Torrent keys the check function needs ('id' and
                      'name' are always included)
+        idempotent:  Whether sending the same request again is harmless; False
+                     disables retries
+
+        Torrents are passed to `method` in chunks of `chunk_size` torrents (or
+        all at once if `chunk_size` is 0).  Up to `concurrency` chunks are sent at
+        the same time and each chunk is retried `retries` times on connection
+        errors and timeouts if `idempotent` is True.  Each failed chunk adds one
+        error message.
 
         Return Response with the following properties:
             torrents: Tuple of Torrents that `method` was applied to with the
@@ -459,20 +694,93 @@ class TorrentAPI(TorrentAPIBase):
         # Apply method to torrents that passed the check function
         if len(tlist) <= 0:
             return Response(success=False, torrents=(), msgs=msgs, errors=errors)
-        else:
+
+        chunk_size = self.chunk_size if self.chunk_size > 0 else len(tlist)
+        chunks = [tlist[i:i + chunk_size] for i in range(0, len(tlist), chunk_size)]
+        action = method.__name__.replace('_', '-')
+        slots = asyncio.Semaphore(max(1, self.concurrency))
+        done = failed = 0
+
+        async def apply(chunk_index, chunk):
+            nonlocal done, failed
+            # Ignore response because it is always {}, except for
+            # 'torrent-get' requests, which this method is not meant for.
+            ids = tuple(t['id'] for t in chunk)
+            async with slots:
+                error = await self._request_with_retries(method, dict(method_args, ids=ids),
+                                                         retry=idempotent)
+            done += len(chunk)
+            if error is not None:
+                failed += len(chunk)
+                if len(chunks) > 1:
+                    error = 'Chunk %d of %d (%d torrent%s): %s' % (
+                        chunk_index + 1, len(chunks), len(chunk),
+                        '' if len(chunk) == 1 else 's', error)
+            if len(chunks) > 1:
+                self._on_progress.send(Progress(action=action, done=done,
+                                                failed=failed, total=len(tlist)))
+            return error
+
+        chunk_errors = await asyncio.gather(*(apply(i, chunk) for i,chunk in enumerate(chunks)))
+        applied = []
+        for chunk, error in zip(chunks, chunk_errors):
+            if error is None:
+                applied.extend(chunk)
+            else:
+                errors.append(error)
+        return Response(success=len(applied) > 0, torrents=tuple(applied),
+                        msgs=msgs, errors=errors)
+
+    async def _request_with_retries(self, method, kwargs, retry=True):
+        """
+        Call `method` with `kwargs` and retry on connection errors and timeouts
+
+        The first retry happens after `retry_delay` seconds and the delay is
+        doubled for each further retry so that an overloaded daemon can recover.
+
+        A failed request may still have been processed by the daemon (e.g. when
+        the response timed out), so `retry` must be False for requests that
+        have a different effect when they are repeated (e.g. moving or deleting
+        files).
+
+        Return `None` on success or the error message of the last attempt
+        """
+        attempts = max(0, self.retries) + 1 if retry else 1
+        for attempt in range(1, attempts + 1):
             try:
-                # Ignore response because it is always {}, except for
-                # 'torrent-get' requests, which this method is not meant for.
-                ids = tuple(t['id'] for t in tlist)
-                # log.debug('Sending %s(%s) for IDs: %s', method.__qualname__,
-                #           ', '.join(('%s=%r' % (k,v) for k,v in method_args.items())),
-                #           ids)
-                await method(ids=ids, **method_args)
+                await method(**kwargs)
+            except (ConnectionError, TimeoutError) as e:
+                log.debug('Attempt %d of %d failed: %s: %r', attempt, attempts, method.__name__, e)
+                if attempt >= attempts:
+                    return str(e)
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
             except ClientError as e:
-                errors.append(str(e))
-                return Response(success=False, torrents=(), msgs=msgs, errors=errors)
+                return str(e)
             else:
-                return Response(success=True, torrents=tuple(tlist), msgs=msgs, errors=errors)
+                return None
+
+    async def _torrent_set_many(self, requests):
+        """
+        Send many 'torrent-set' requests without fetching torrents
+
+        requests: Iterable of (method_args, ids) tuples where `method_args` is a
+                  dictionary with 'torrent-set' arguments (except 'ids') and
+                  `ids` is a sequence of torrent IDs
+
+        Up to `concurrency` requests are queued at the same time.  Each request
+        is retried like in `_torrent_action`.
+
+        Return list of error messages or `None` for each request in `requests`
+        """
+        slots = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def torrent_set(method_args, ids):
+            async with slots:
+                return await self._request_with_retries(self.rpc.torrent_set,
+                                                        dict(method_args, ids=tuple(ids)))
+
+        return await asyncio.gather(*(torrent_set(method_args, ids)
+                                      for method_args,ids in requests))
 
     async def stop(self, torrents):
         """
@@ -609,9 +917,14 @@ class TorrentAPI(TorrentAPIBase):
         def create_info_msg(t):
             return (True, msg % t['name'])
 
-        return await self._torrent_action(self.rpc.torrent_remove, torrents,
-                                          check=create_info_msg,
-                                          method_args={'delete-local-data': delete})
+        # Repeating a request that deletes files could report errors for
+        # torrents that were removed by the first request
+        response = await self._torrent_action(self.rpc.torrent_remove, torrents,
+                                              check=create_info_msg,
+                                              method_args={'delete-local-data': delete},
+                                              idempotent=not delete)
+        self._tcache.remove(*(t['id'] for t in response.torrents))
+        return response
 
 
     async def move(self, torrents, destination):
@@ -641,9 +954,12 @@ class TorrentAPI(TorrentAPIBase):
             else:
                 return (False, 'Already in %s: %s' % (destination, t['name']))
 
+        # Don't start moving files again while the first request may still be
+        # moving them
         return await self._torrent_action(self.rpc.torrent_set_location, torrents,
                                           check=create_info_msg, check_keys=('path',),
-                                          method_args={'move': True, 'location': destination})
+                                          method_args={'move': True, 'location': destination},
+                                          idempotent=False)
 
     async def rename(self, tid, path, new_name):
         """
@@ -719,14 +1035,18 @@ class TorrentAPI(TorrentAPIBase):
         # Send the rename RPC call
         def create_info_msg(t):
             return (True, 'Renaming %s to %s' % (path, new_name))
+        # The old path doesn't exist anymore if the first request was processed
         response = await self._torrent_action(self.rpc.torrent_rename_path, (torrent['id'],),
                                               check=create_info_msg, check_keys=('name',),
-                                              method_args={'path': path, 'name': new_name})
+                                              method_args={'path': path, 'name': new_name},
+                                              idempotent=False)
         if not response.success:
             return Response(success=False, torrent=None, errors=response.errors)
         else:
             # Preserve info messages for final response
             msgs = response.msgs
+            # File names are cached and must be requested again
+            self._tcache.forget_files(tid)
 
         # Fetch new torrent data and return final response
         response = await self._get_torrents_by_ids(ids=(tid,),
@@ -894,11 +1214,11 @@ class TorrentAPI(TorrentAPIBase):
                 torrent_set_args[args] = [tid]
 
         # Send one 'torrent-set' request for each list of torrent IDs
-        for args,tids in torrent_set_args.items():
-            response = await self._torrent_action(self.rpc.torrent_set, tids,
-                                                  method_args=dict(args))
-            if not response.success:
-                return Response(success=False, torrents=(), errors=response.errors)
+        request_errors = await self._torrent_set_many((dict(args), tids)
+                                                      for args,tids in torrent_set_args.items())
+        request_errors = [e for e in request_errors if e is not None]
+        if request_errors:
+            return Response(success=False, torrents=(), errors=request_errors)
 
         # Fetch torrents again and return Response with new rate limit messages
         all_tids = sum(torrent_set_args.values(), []) + list(errors)
@@ -1212,11 +1532,11 @@ class TorrentAPI(TorrentAPIBase):
             self.label_manage_mode.REMOVE: 'Removing',
             self.label_manage_mode.SET: 'Setting',
         }
-        for ls, tids in inv_label_dict.items():
-            args = {'labels': list(ls)}
-            response = await self._torrent_action(self.rpc.torrent_set, tids, method_args=args)
-            if not response.success:
-                errors.extend(response.errors)
+        request_errors = await self._torrent_set_many(({'labels': list(ls)}, tids)
+                                                      for ls,tids in inv_label_dict.items())
+        for tids, error in zip(inv_label_dict.values(), request_errors):
+            if error is not None:
+                errors.append(error)
                 continue
             for t in tids:
                 if mode == self.label_manage_mode.ADD:
@@ -1233,7 +1553,8 @@ class TorrentAPI(TorrentAPIBase):
                     )
                     modded_any = True
 
-        response = await self.torrents(torrents, keys=('id', 'name', 'labels',))
+        # Fetch the same torrents again even if they don't match `torrents` anymore
+        response = await self.torrents(tuple(tor_dict), keys=('id', 'name', 'labels',))
         if not modded_any:
             errors.append('No labels were changed')
         if not response.success:
@@ -18,6 +18,7 @@ import async_timeout
 from blinker import Signal
 
 from ..errors import AuthError, ClientError, ConnectionError, RPCError, TimeoutError
+from ..priority import PriorityLock
 from ..utils import URL
 
 from ...logging import make_logger  # isort:skip
@@ -38,10 +39,14 @@ class TransmissionRPC():
     interface.  It does not implement the RPC protocol, only basic things like
     authentication, sending requests and receiving responses.  High-level RPCs
     are done in the *API classes.
+
+    Requests are sent one at a time in order of their priority (see
+    `priority.request_priority`).
     """
 
     def __init__(self, host='localhost', port=9091, *, tls=False, user='',
-                 password='', proxy='', path='/transmission/rpc', enabled=True):
+                 password='', proxy='', path='/transmission/rpc', enabled=True,
+                 preempt=False):
         self.host = host
         self.port = port
         self.path = path
@@ -53,7 +58,7 @@ class TransmissionRPC():
         self._session = None
         self._enabled_event = asyncio.Event()
         self.enabled = enabled
-        self._request_lock = asyncio.Lock()
+        self._request_lock = PriorityLock(preempt=preempt)
         self._connecting_lock = asyncio.Lock()
         self._connection_tested = False
         self._connection_exception = None
@@ -266,6 +271,15 @@ class TransmissionRPC():
     def timeout(self, timeout):
         self._timeout = float(timeout)
 
+    @property
+    def preempt(self):
+        """Whether interactive requests cancel any ongoing background request"""
+        return self._request_lock.preempt
+
+    @preempt.setter
+    def preempt(self, preempt):
+        self._request_lock.preempt = bool(preempt)
+
     @property
     def enabled(self):
         """
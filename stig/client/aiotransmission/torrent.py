@@ -11,8 +11,11 @@
 
 """Torrent class and value modifiers for compatibility with ttypes"""
 
+import itertools
 import os
+import sys
 import time
+from collections import abc
 
 from .. import base, ttypes, utils
 from ..utils import LazyDict
@@ -195,7 +198,185 @@ class TorrentFileID(tuple):
     def __repr__(self):
         return 'TorrentFileID(torrent_id=%d, file_id=%d)' % self
 
+class _TorrentFiles():
+    """
+    Flat storage of a torrent's files and directories
+
+    Files are identified by their index in the list provided by Transmission
+    and their values are stored in lists.  Directories are identified by their
+    index in the `dir_*` lists.  The root directory has the index 0 and the
+    parent -1.  Because subdirectories are always added after their parent,
+    every directory has a higher index than its parent.
+
+    Each directory stores the sums of all files beneath it.  They are
+    adjusted for changed files only when `update` is called.
+    """
+
+    def __init__(self, torrent_id, location, filelist):
+        self.tid = torrent_id
+        self.location = location
+
+        # File index -> value
+        self.sizes = []
+        self.downloaded = []
+        self.wanted = []
+        self.priorities = []
+        self.file_dir = []
+        self.tfiles = []
+
+        # Directory index -> value
+        self.dir_parent = [-1]
+        self.dir_path = ['']
+        self.dir_files = [{}]    # Map file names to file indexes
+        self.dir_subdirs = [{}]  # Map directory names to directory indexes
+        self.dir_file_count = [0]
+        self.dir_first_file = [-1]  # Index of any file beneath the directory
+        self.dir_size_total = [0]
+        self.dir_size_downloaded = [0]
+        self.dir_priorities = [{}]  # Map effective priority to number of files
+        self.dir_nodes = [None]     # TorrentFileTree instances
+
+        for entry in filelist:
+            self._add_file(entry)
+
+        # Sum up files bottom-up
+        dir_parent = self.dir_parent
+        for d in range(len(dir_parent) - 1, 0, -1):
+            parent = dir_parent[d]
+            self.dir_file_count[parent] += self.dir_file_count[d]
+            self.dir_size_total[parent] += self.dir_size_total[d]
+            self.dir_size_downloaded[parent] += self.dir_size_downloaded[d]
+            parent_prios = self.dir_priorities[parent]
+            for prio,count in self.dir_priorities[d].items():
+                parent_prios[prio] = parent_prios.get(prio, 0) + count
+
+    def _add_file(self, entry):
+        *dirnames, filename = entry['name'].split(os.sep)
+        d = 0
+        for dirname in dirnames:
+            subdir = self.dir_subdirs[d].get(dirname)
+            if subdir is None:
+                subdir = self._add_dir(d, dirname)
+            d = subdir
+
+        index = len(self.tfiles)
+        self.sizes.append(entry['length'])
+        self.downloaded.append(entry['bytesCompleted'])
+        self.wanted.append(entry['wanted'])
+        self.priorities.append(entry['priority'])
+        self.file_dir.append(d)
+        self.tfiles.append(ttypes.TorrentFile(
+            tid=self.tid, id=entry['id'],
+            name=filename, path=self.dir_path[d], location=self.location,
+            size_total=entry['length'],
+            size_downloaded=entry['bytesCompleted'],
+            is_wanted=entry['wanted'],
+            priority=entry['priority']))
+        self.dir_files[d][filename] = index
+
+        # Parents of a directory with a file always have a file too
+        first_file, parent = self.dir_first_file, d
+        while parent >= 0 and first_file[parent] < 0:
+            first_file[parent] = index
+            parent = self.dir_parent[parent]
+
+        self.dir_file_count[d] += 1
+        self.dir_size_total[d] += entry['length']
+        self.dir_size_downloaded[d] += entry['bytesCompleted']
+        prios = self.dir_priorities[d]
+        prio = self._effective_priority(index)
+        prios[prio] = prios.get(prio, 0) + 1
+
+    def _add_dir(self, parent, name):
+        d = len(self.dir_parent)
+        self.dir_parent.append(parent)
+        self.dir_path.append(os.path.join(self.dir_path[parent], name))
+        self.dir_files.append({})
+        self.dir_subdirs.append({})
+        self.dir_file_count.append(0)
+        self.dir_first_file.append(-1)
+        self.dir_size_total.append(0)
+        self.dir_size_downloaded.append(0)
+        self.dir_priorities.append({})
+        self.dir_nodes.append(None)
+        self.dir_subdirs[parent][name] = d
+        return d
+
+    def _effective_priority(self, index):
+        return self.priorities[index] if self.wanted[index] else 'off'
+
+    def dir_files_recursive(self, d):
+        """Return list of indexes of all files in directory `d` and its subdirectories"""
+        indexes = []
+        stack = [d]
+        while stack:
+            d = stack.pop()
+            indexes.extend(self.dir_files[d].values())
+            stack.extend(reversed(tuple(self.dir_subdirs[d].values())))
+        return indexes
+
+    def node(self, d):
+        """Return TorrentFileTree instance for directory `d`"""
+        node = self.dir_nodes[d]
+        if node is None:
+            node = self.dir_nodes[d] = TorrentFileTree(self, d)
+        return node
+
+    def update(self, fileStats=None, location=None):
+        """
+        Apply new file information and adjust directory sums
+
+        Return sequence of indexes of changed files
+        """
+        changed = []
+        if fileStats:
+            downloaded, wanted, priorities = self.downloaded, self.wanted, self.priorities
+            for i,fstats in enumerate(fileStats):
+                new_downloaded = fstats['bytesCompleted']
+                new_wanted = fstats['wanted']
+                new_priority = fstats['priority']
+                if downloaded[i] == new_downloaded and wanted[i] == new_wanted \
+                   and priorities[i] == new_priority:
+                    continue
+
+                delta = new_downloaded - downloaded[i]
+                old_prio = self._effective_priority(i)
+                downloaded[i] = new_downloaded
+                wanted[i] = new_wanted
+                priorities[i] = new_priority
+                new_prio = self._effective_priority(i)
+                d = self.file_dir[i]
+                while d >= 0:
+                    self.dir_size_downloaded[d] += delta
+                    if old_prio != new_prio:
+                        prios = self.dir_priorities[d]
+                        prios[old_prio] -= 1
+                        if prios[old_prio] == 0:
+                            del prios[old_prio]
+                        prios[new_prio] = prios.get(new_prio, 0) + 1
+                    d = self.dir_parent[d]
+
+                self.tfiles[i].update({'size-downloaded': new_downloaded,
+                                       'is-wanted': new_wanted,
+                                       'priority': new_priority})
+                changed.append(i)
+
+        if location is not None and location != self.location:
+            self.location = location
+            for tfile in self.tfiles:
+                tfile.update({'location': location})
+            changed = range(len(self.tfiles))
+        return changed
+
+
 class TorrentFileTree(base.TorrentFileTreeBase):
+    """
+    Nested mapping of a torrent's files backed by flat lists
+
+    Instances are created by the `create` classmethod and share the same
+    storage with all their subtrees.
+    """
+
     @classmethod
     def create(cls, raw_torrent):
         fileStats = raw_torrent['fileStats']
@@ -210,78 +391,207 @@ class TorrentFileTree(base.TorrentFileTreeBase):
             tid = raw_torrent['id']
             filelist = ({'id': TorrentFileID(tid, i), **f, **fS}
                         for i,(f,fS) in enumerate(zip(raw_torrent['files'], fileStats)))
-        return cls(raw_torrent['id'], raw_torrent['downloadDir'], filelist, path=())
+        log.debug('Creating new TorrentFileTree for torrent %r', raw_torrent['id'])
+        return _TorrentFiles(raw_torrent['id'], raw_torrent['downloadDir'], filelist).node(0)
 
-    def __init__(self, torrent_id, torrent_location, filelist, path):
-        log.debug('Creating new TorrentFileTree for torrent %r: %r', torrent_id, path)
-        path_str = os.sep.join(path)
-        super().__init__(torrent_location, path_str)
+    def __init__(self, storage, dir_index):
+        self._storage = storage
+        self._dir = dir_index
+        self._id = None
+        super().__init__(storage.location, storage.dir_path[dir_index])
 
-        items = {}
-        subdirs = {}
-        for entry in filelist:
-            parts = entry['name'].split(os.sep, 1)
-            if len(parts) == 1:
-                filename = parts[0]
-                items[filename] = ttypes.TorrentFile(
-                    tid=torrent_id, id=entry['id'],
-                    name=entry['name'], path=path_str, location=torrent_location,
-                    size_total=entry['length'],
-                    size_downloaded=entry['bytesCompleted'],
-                    is_wanted=entry['wanted'],
-                    priority=entry['priority'])
-
-            elif len(parts) == 2:
-                subdir, subpath = parts
-                if subdir not in subdirs:
-                    subdirs[subdir] = []
-                entry['name'] = subpath
-                subdirs[subdir].append(entry)
-            else:
-                raise RuntimeError(parts)
+    def update(self, raw_torrent):
+        """
+        Apply volatile file information (progress, priority, etc) from `raw_torrent`
+
+        File names and sizes ('files' field) are ignored because they don't
+        change.  Return whether the tree could be updated in place or `False`
+        if the number of files changed and the tree must be re-created.
+        """
+        fileStats = raw_torrent.get('fileStats')
+        if fileStats is not None and len(fileStats) != len(self._storage.tfiles):
+            # Metadata was downloaded since the tree was created
+            return False
+        self._storage.update(fileStats, raw_torrent.get('downloadDir'))
+        return True
+
+    @property
+    def id(self):
+        # Files never change, so we can cache the IDs
+        if self._id is None:
+            self._id = super().id
+        return self._id
+
+    @property
+    def files(self):
+        tfiles = self._storage.tfiles
+        return (tfiles[i] for i in self._storage.dir_files_recursive(self._dir))
+
+    @property
+    def first_file(self):
+        storage = self._storage
+        return storage.tfiles[storage.dir_first_file[self._dir]]
+
+    @property
+    def directories(self):
+        storage = self._storage
+        for name,subdir in storage.dir_subdirs[self._dir].items():
+            node = storage.node(subdir)
+            yield (name, node)
+            yield from node.directories
+
+    @property
+    def location(self):
+        return self._storage.location
+
+    @property
+    def file_count(self):
+        return self._storage.dir_file_count[self._dir]
+
+    @property
+    def size_total(self):
+        return self._storage.dir_size_total[self._dir]
+
+    @property
+    def size_downloaded(self):
+        return self._storage.dir_size_downloaded[self._dir]
+
+    @property
+    def priority(self):
+        prios = self._storage.dir_priorities[self._dir]
+        if len(prios) == 1:
+            return ttypes.TorrentFilePriority(next(iter(prios)))
+        else:
+            return ''
+
+    def __getitem__(self, key):
+        storage = self._storage
+        index = storage.dir_files[self._dir].get(key)
+        if index is not None:
+            return storage.tfiles[index]
+        subdir = storage.dir_subdirs[self._dir].get(key)
+        if subdir is not None:
+            return storage.node(subdir)
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self._storage.dir_files[self._dir]
+        yield from self._storage.dir_subdirs[self._dir]
+
+    def __len__(self):
+        return len(self._storage.dir_files[self._dir]) + len(self._storage.dir_subdirs[self._dir])
+
+    def __repr__(self):
+        return '<%s path=%r: %r>' % (type(self).__name__, self._path, dict(self.items()))
+
+
+# Revisions are unique across all Torrent instances so that a new instance for
+# the same torrent ID never has the same revision as the old one
+_REVISIONS = itertools.count()
 
-        for subdir,filelist in subdirs.items():
-            items[subdir] = TorrentFileTree(torrent_id, torrent_location,
-                                            filelist, path=path + (subdir,))
-        self._items = items
+
+# Strings that are often identical in many torrents, trackers or peers
+_INTERNED_FIELDS = ('downloadDir', 'errorString')
+_INTERNED_TRACKER_FIELDS = ('announce', 'scrape', 'host', 'sitename',
+                            'lastAnnounceResult', 'lastScrapeResult')
+_INTERNED_PEER_FIELDS = ('clientName', 'flagStr')
+
+def _intern_strings(raw_torrent):
+    """Replace repeated strings in `raw_torrent` with interned copies"""
+    intern = sys.intern
+    for field in _INTERNED_FIELDS:
+        value = raw_torrent.get(field)
+        if value.__class__ is str:
+            raw_torrent[field] = intern(value)
+
+    labels = raw_torrent.get('labels')
+    if labels:
+        raw_torrent['labels'] = [intern(label) for label in labels]
+
+    for fields, items in ((_INTERNED_TRACKER_FIELDS, raw_torrent.get('trackerStats')),
+                          (_INTERNED_PEER_FIELDS, raw_torrent.get('peers'))):
+        if items:
+            for item in items:
+                for field in fields:
+                    value = item.get(field)
+                    if value.__class__ is str:
+                        item[field] = intern(value)
+
+
+class PeerList(abc.Sequence):
+    """
+    List of TorrentPeer objects
+
+    Peers are updated in place by update() so they keep their identity (and
+    their cached values) between requests.
+    """
+
+    _FIELDS = ('id', 'name', 'totalSize', 'peers')
+
+    def __init__(self, raw_torrent):
+        self._peers = {}  # Map peer IDs to TorrentPeer instances
+        self._items = ()
+        self._revision = next(_REVISIONS)
+        self.update(raw_torrent)
+
+    @staticmethod
+    def _peer_values(t, p):
+        return {'tname': t['name'], 'tsize': t['totalSize'], 'client': p['clientName'],
+                'downloaded': p['progress'] * t['totalSize'],
+                'pdownloaded': p['progress'] * 100,
+                'rate_up': p['rateToPeer'], 'rate_down': p['rateToClient']}
 
     def update(self, raw_torrent):
-        def update_files(ftree, fileStats):
-            if not fileStats:
-                # We don't have any metadata yet, so there is nothing to update
-                return
-
-            for entry in ftree.values():
-                if isinstance(entry, ttypes.TorrentFile):
-                    # File ID is its index in the list provided by
-                    # Transmission (see _create_TorrentFileTree)
-                    index = entry['id'].file_id
-                    fstats = fileStats[index]
-                    entry.update({'size-downloaded': fstats['bytesCompleted'],
-                                  'is-wanted': fstats['wanted'],
-                                  'priority': fstats['priority'],
-                                  'location': raw_torrent['downloadDir']})
-                else:
-                    update_files(entry, fileStats)
-
-        update_files(self._items, raw_torrent['fileStats'])
-
-
-class PeerList(tuple):
-    def __new__(cls, t):
+        """
+        Add, remove or update peers from `raw_torrent`
+
+        Return `False` if `raw_torrent` doesn't provide all needed fields,
+        `True` otherwise.
+        """
+        if any(field not in raw_torrent for field in self._FIELDS):
+            return False
         TorrentPeer = ttypes.TorrentPeer
-        return super().__new__(
-            cls,
-            (TorrentPeer(tid=t['id'], tname=t['name'], tsize=t['totalSize'],
-                         ip=p['address'], port=p['port'], client=p['clientName'],
-                         downloaded=p['progress'] * t['totalSize'],
-                         pdownloaded=p['progress'] * 100,
-                         rate_up=p['rateToPeer'], rate_down=p['rateToClient'])
-             for p in t['peers'])
-        )
-
-
-class TrackerList(tuple):
+        tid = raw_torrent['id']
+        old_peers = self._peers
+        new_peers = {}
+        for p in raw_torrent['peers']:
+            peer_id = (tid, p['address'], p['port'])
+            values = self._peer_values(raw_torrent, p)
+            peer = old_peers.get(peer_id)
+            if peer is None:
+                peer = TorrentPeer(tid=tid, ip=p['address'], port=p['port'], **values)
+            else:
+                peer.update(**values)
+            new_peers[peer_id] = peer
+        if new_peers.keys() != old_peers.keys():
+            self._revision = next(_REVISIONS)
+        self._peers = new_peers
+        self._items = tuple(new_peers.values())
+        return True
+
+    @property
+    def revision(self):
+        """Number that changes every time peers are added or removed"""
+        return self._revision
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, self._items)
+
+
+class TrackerList(abc.Sequence):
+    """
+    List of TorrentTracker objects
+
+    Trackers are updated in place by update() so they keep their identity
+    between requests.
+    """
+
     _STATES_ANNOUNCE = {
         # From libtransmission/transmission.h:
         # /* we won't (announce,scrape) this torrent to this tracker because
@@ -345,34 +655,85 @@ class TrackerList(tuple):
         else:
             return utils.Timestamp.NEVER
 
-    def __new__(cls, raw_torrent):
-        return super().__new__(cls, (
-            ttypes.TorrentTracker(
-                LazyDict({
-                    'id'                 : (raw_torrent['id'], raw_tracker['id']),
-                    'tid'                : raw_torrent['id'],
-                    'tname'              : raw_torrent['name'],
-                    'tier'               : raw_tracker['tier'],
+    _FIELDS = ('id', 'name', 'trackerStats')
+
+    @classmethod
+    def _tracker_dict(cls, raw_torrent, raw_tracker):
+        return LazyDict({
+            'id'                 : (raw_torrent['id'], raw_tracker['id']),
+            'tid'                : raw_torrent['id'],
+            'tname'              : raw_torrent['name'],
+            'tier'               : raw_tracker['tier'],
+
+            'url-announce'       : raw_tracker['announce'],
+            'url-scrape'         : raw_tracker['scrape'],
+
+            'status-announce'    : cls._STATES_ANNOUNCE[raw_tracker['announceState']],
+            'status-scrape'      : cls._STATES_SCRAPE[raw_tracker['scrapeState']],
+
+            'error-announce'     : lambda: cls._error_announce(raw_tracker),
+            'error-scrape'       : lambda: cls._error_scrape(raw_tracker),
+
+            'count-downloads'    : raw_tracker['downloadCount'],
+            'count-leeches'      : raw_tracker['leecherCount'],
+            'count-seeds'        : raw_tracker['seederCount'],
+
+            'time-last-announce' : lambda: cls._last_time(raw_tracker, 'Announce'),
+            'time-last-scrape'   : lambda: cls._last_time(raw_tracker, 'Scrape'),
+            'time-next-announce' : lambda: cls._next_time(raw_tracker, 'Announce'),
+            'time-next-scrape'   : lambda: cls._next_time(raw_tracker, 'Scrape'),
+        })
 
-                    'url-announce'       : raw_tracker['announce'],
-                    'url-scrape'         : raw_tracker['scrape'],
+    def __init__(self, raw_torrent):
+        self._items = ()
+        self._revision = next(_REVISIONS)
+        self._trackers = {}  # Map (torrent ID, tracker ID) to TorrentTracker instances
+        self._raw = {}       # Map (torrent ID, tracker ID) to raw tracker stats
+        self.update(raw_torrent)
 
-                    'status-announce'    : cls._STATES_ANNOUNCE[raw_tracker['announceState']],
-                    'status-scrape'      : cls._STATES_SCRAPE[raw_tracker['scrapeState']],
+    def update(self, raw_torrent):
+        """
+        Add, remove or update trackers from `raw_torrent`
 
-                    'error-announce'     : lambda: cls._error_announce(raw_tracker),
-                    'error-scrape'       : lambda: cls._error_scrape(raw_tracker),
+        Trackers with unchanged stats are not touched.  Return `False` if
+        `raw_torrent` doesn't provide all needed fields, `True` otherwise.
+        """
+        if any(field not in raw_torrent for field in self._FIELDS):
+            return False
+        TorrentTracker = ttypes.TorrentTracker
+        tid = raw_torrent['id']
+        old_trackers, old_raw = self._trackers, self._raw
+        new_trackers, new_raw = {}, {}
+        for raw_tracker in raw_torrent['trackerStats']:
+            tracker_id = (tid, raw_tracker['id'])
+            tracker = old_trackers.get(tracker_id)
+            if tracker is None:
+                tracker = TorrentTracker(self._tracker_dict(raw_torrent, raw_tracker))
+            elif old_raw[tracker_id] != raw_tracker or tracker['tname'] != raw_torrent['name']:
+                tracker.update(self._tracker_dict(raw_torrent, raw_tracker))
+            new_trackers[tracker_id] = tracker
+            new_raw[tracker_id] = raw_tracker
+        if new_trackers.keys() != old_trackers.keys() or \
+           any(raw['announce'] != old_raw[tracker_id]['announce']
+               for tracker_id,raw in new_raw.items() if tracker_id in old_raw):
+            self._revision = next(_REVISIONS)
+        self._trackers, self._raw = new_trackers, new_raw
+        self._items = tuple(new_trackers.values())
+        return True
 
-                    'count-downloads'    : raw_tracker['downloadCount'],
-                    'count-leeches'      : raw_tracker['leecherCount'],
-                    'count-seeds'        : raw_tracker['seederCount'],
+    @property
+    def revision(self):
+        """Number that changes every time trackers are added, removed or get a new URL"""
+        return self._revision
 
-                    'time-last-announce' : lambda: cls._last_time(raw_tracker, 'Announce'),
-                    'time-last-scrape'   : lambda: cls._last_time(raw_tracker, 'Scrape'),
-                    'time-next-announce' : lambda: cls._next_time(raw_tracker, 'Announce'),
-                    'time-next-scrape'   : lambda: cls._next_time(raw_tracker, 'Scrape'),
-                })) for raw_tracker in raw_torrent['trackerStats']
-        ))
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return '<%s %r>' % (type(self).__name__, self._items)
 
 
 # Map abstracted keys to tuples of needed RPC field names
@@ -479,13 +840,22 @@ class Torrent(base.TorrentBase):
     }
 
     def __init__(self, raw_torrent):
+        _intern_strings(raw_torrent)
         self._raw = raw_torrent
         self._cache = {}
+        self._revision = next(_REVISIONS)
 
     def update(self, raw_torrent):
+        _intern_strings(raw_torrent)
         cache = self._cache
         raw_old = self._raw
 
+        # Count changes so pollers can detect unchanged torrent lists cheaply
+        for field,new_value in raw_torrent.items():
+            if raw_old.get(field) != new_value:
+                self._revision = next(_REVISIONS)
+                break
+
         # Remove cached values if their original/raw value(s) differ
         for k in tuple(cache):
             # Each key depends on one or more RPC field
@@ -498,11 +868,11 @@ class Torrent(base.TorrentBase):
                     # New and previous value differ - if we are dealing with
                     # more complex data structures (e.g. a file tree), use the
                     # update() method to update the object in cache instead of
-                    # removing it from the cache.
+                    # removing it from the cache.  update() returns whether
+                    # the cached object is still valid.
                     value = cache[k]
-                    if hasattr(value, 'update') and all(field in raw_torrent for field in fields):
-                        value.update(raw_torrent)
-                    del cache[k]
+                    if not (hasattr(value, 'update') and value.update(raw_torrent)):
+                        del cache[k]
                     break
 
         # Now we can forget the old values
@@ -562,6 +932,11 @@ class Torrent(base.TorrentBase):
     def __hash__(self):
         return hash(self._raw['id'])
 
+    @property
+    def revision(self):
+        """Number that changes every time `update` changes any values"""
+        return self._revision
+
     def clearcache(self):
         self._cache = {}
 
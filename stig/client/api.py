@@ -102,7 +102,7 @@ class API():
     def treqpool(self):
         """TorrentRequestPool singleton"""
         log.debug('Creating TorrentRequestPool singleton')
-        return TorrentRequestPool(self, interval=self._interval)
+        return TorrentRequestPool(self, interval=self._interval, skip_unchanged=True)
 
 
     def create_poller(self, *args, interval=None, **kwargs):
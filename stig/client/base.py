@@ -79,8 +79,8 @@ class TorrentBase(abc.Mapping):
         'size-piece'                   : utils.SizeInBytes,
 
         'error'                        : str,
-        'trackers'                     : tuple,
-        'peers'                        : tuple,
+        'trackers'                     : None,
+        'peers'                        : None,
         'files'                        : None,
 
         'labels'                       : set,
@@ -177,6 +177,11 @@ class TorrentFileTreeBase(abc.Mapping):
                 yield (name, entry)
                 yield from entry.directories
 
+    @property
+    def first_file(self):
+        """Any TorrentFile in this tree for values that all files share (e.g. 'tid')"""
+        return next(iter(self.files))
+
     @property
     def location(self):
         """Absolute path of the torrent; base directory"""
@@ -191,6 +196,27 @@ class TorrentFileTreeBase(abc.Mapping):
     def id(self):
         return tuple(f['id'] for f in self.files)
 
+    @property
+    def file_count(self):
+        """Number of files in this tree"""
+        return sum(1 for _ in self.files)
+
+    @property
+    def size_total(self):
+        """Combined size of all files in this tree"""
+        return sum(f['size-total'] for f in self.files)
+
+    @property
+    def size_downloaded(self):
+        """Combined number of downloaded bytes of all files in this tree"""
+        return sum(f['size-downloaded'] for f in self.files)
+
+    @property
+    def priority(self):
+        """Priority of all files in this tree or empty string if they differ"""
+        prios = set(f['priority'] for f in self.files)
+        return prios.pop() if len(prios) == 1 else ''
+
     def __repr__(self):
         return '<%s path=%r: %r>' % (type(self).__name__, self._path, self._items)
 
@@ -211,17 +237,25 @@ class FreeSpaceAPIBase():
     path_getters: Iterable of callables that must return a path (str) or None
     rpc: Object that can be used by the implementation of get_free_space()
     settings: Object with an on_update() method that allows us to register a callback for
-              path changes
+              path changes; if it also has an on_response() method (i.e. it is a
+              RequestPoller), free space is also gathered for unchanged responses
     """
     def __init__(self, path_getters, rpc, settings):
         self._path_getters = tuple(path_getters)
         self._rpc = rpc
         self._on_update = blinker.Signal()
         self._info = defaultdict(lambda: SimpleNamespace(path=None, free=None, error=None))
+        self._gather_task = None
         settings.on_update(self._gather_info_wrapper)
-
-    def _gather_info_wrapper(self, settings):
-        asyncio.ensure_future(self._gather_info_wrapper_coro())
+        # on_update() callbacks are not called if the polled settings didn't
+        # change, but free space may change anyway
+        if hasattr(settings, 'on_response'):
+            settings.on_response(self._gather_info_wrapper, unchanged=True)
+
+    def _gather_info_wrapper(self, *_):
+        # Both hooks are called for the same changed response
+        if self._gather_task is None or self._gather_task.done():
+            self._gather_task = asyncio.ensure_future(self._gather_info_wrapper_coro())
 
     async def _gather_info_wrapper_coro(self):
         infos = {}
@@ -0,0 +1,73 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Find the info hash of torrent files without decoding them"""
+
+import hashlib
+
+from ..logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+
+def _string_end(data, pos):
+    # Return index after byte string that starts at `pos` (e.g. b'4:spam')
+    colon = data.index(b':', pos)
+    length = int(data[pos:colon])
+    if length < 0:
+        raise ValueError('Negative string length at %d' % (pos,))
+    end = colon + 1 + length
+    if end > len(data):
+        raise ValueError('String exceeds data at %d' % (pos,))
+    return end
+
+def _value_end(data, pos):
+    # Return index after value that starts at `pos`
+    # Lists and dictionaries are handled without recursion
+    depth = 0
+    while True:
+        char = data[pos:pos + 1]
+        if char == b'i':
+            pos = data.index(b'e', pos) + 1
+        elif char in (b'l', b'd'):
+            depth += 1
+            pos += 1
+            continue
+        elif char == b'e' and depth > 0:
+            depth -= 1
+            pos += 1
+        elif char.isdigit():
+            pos = _string_end(data, pos)
+        else:
+            raise ValueError('Invalid data at %d' % (pos,))
+        if depth == 0:
+            return pos
+
+def info_hash(data):
+    """
+    Return info hash of torrent file content `data` as lowercase hex string
+
+    Only the top level dictionary is parsed; the "info" value is hashed as it
+    is.
+
+    Raise ValueError if `data` is not a bencoded dictionary with an "info"
+    key.
+    """
+    if data[:1] != b'd':
+        raise ValueError('Not a bencoded dictionary')
+    pos = 1
+    while data[pos:pos + 1] != b'e':
+        key_end = _string_end(data, pos)
+        key = data[data.index(b':', pos) + 1:key_end]
+        value_end = _value_end(data, key_end)
+        if key == b'info':
+            return hashlib.sha1(data[key_end:value_end]).hexdigest()
+        pos = value_end
+    raise ValueError('Missing "info" key')
@@ -15,6 +15,7 @@ import functools
 import blinker
 
 from . import errors
+from .priority import Priority, request_priority
 from .utils import SleepUneasy
 
 from ..logging import make_logger  # isort:skip
@@ -47,20 +48,27 @@ class RequestPoller():
 
     request: Coroutine that is called at intervals
     interval: Delay between calls
+    fingerprint: None or callable that gets the return value from `request` and returns
+                 a hashable object; if it is equal to the fingerprint of the previous
+                 response, the response is not passed to callbacks
 
     Any other positional or keyword arguments are passed to `request`.
     """
-    def __init__(self, request, *args, interval=1, **kwargs):
+    def __init__(self, request, *args, interval=1, fingerprint=None, **kwargs):
         self._on_response = blinker.Signal()
+        self._on_response_unchanged = blinker.Signal()
         self._on_error = blinker.Signal()
         self._prev_error = None
+        self._fingerprint = fingerprint
+        self._prev_fingerprint = None
         self._interval = interval
         self._poll_task = None
         self._poll_loop_task = None
         self._sleep = SleepUneasy()
         self._skip_ongoing_request = False
         self._debug_info = {'request': 'No request specified yet',
-                            'update_cbs': [], 'error_cbs': []}
+                            'update_cbs': [], 'error_cbs': [],
+                            'responses': 0, 'skipped': 0}
         self.set_request(request, *args, **kwargs)
 
     async def start(self):
@@ -108,13 +116,17 @@ class RequestPoller():
         The return value from the request is passed to the 'response' event handlers.
 
         ClientErrors raised by the request are passed to the 'error' handlers.
+
+        Requests are made with background priority so that other requests don't
+        have to wait for them.
         """
         if self._request is None:
             log.debug('No request: %s', self._debug_info)
         else:
             log.debug('Polling: %s', self._debug_info['request'])
             try:
-                response = await self._request()
+                with request_priority(Priority.BACKGROUND, preempt=self.skip_ongoing_request):
+                    response = await self._request()
             except errors.ClientError as e:
                 # Report error but keep trying to connect
                 self._run_callbacks(error=e)
@@ -125,9 +137,15 @@ class RequestPoller():
         if self._skip_ongoing_request:
             log.debug('Request was skipped - not running callbacks: %s', self)
             self._skip_ongoing_request = False
+        elif self._is_unchanged(response, error):
+            log.debug('Response is unchanged - not running callbacks: %s', self)
+            self._debug_info['skipped'] += 1
+            self._on_response_unchanged.send(response)
         else:
             log.debug('Running callbacks: %s', self)
+            self._debug_info['responses'] += 1
             self._on_response.send(response)
+            self._on_response_unchanged.send(response)
             # Ignore duplicate errors
             if error is not None and str(self._prev_error) != str(error):
                 self._prev_error = error
@@ -137,6 +155,27 @@ class RequestPoller():
                     log.debug('Uncaught exception in %r', self)
                     raise error
 
+    def _is_unchanged(self, response, error):
+        # Return whether `response` has the same fingerprint as the previous
+        # response and remember its fingerprint
+        if self._fingerprint is None:
+            return False
+        elif response is None or error is not None:
+            # Always report errors and make sure the next response is reported
+            self._prev_fingerprint = None
+            return False
+        else:
+            fingerprint = self._fingerprint(response)
+            if fingerprint is not None and fingerprint == self._prev_fingerprint:
+                return True
+            else:
+                self._prev_fingerprint = fingerprint
+                return False
+
+    def _forget_fingerprint(self):
+        # Make sure the next response is passed to callbacks
+        self._prev_fingerprint = None
+
     def skip_ongoing_request(self):
         """Stop a currently ongoing request; do nothing if there is no ongoing request"""
         if self._poll_task is not None:
@@ -170,9 +209,12 @@ class RequestPoller():
         This also resets the interval - the next request is made `interval`
         seconds after this method is called.
 
+        The response is passed to callbacks even if it didn't change.
+
         Do nothing if this poller is not started.
         """
         if self.running:
+            self._forget_fingerprint()
             self._sleep.interrupt()
 
     @property
@@ -191,6 +233,7 @@ class RequestPoller():
 
         self._debug_info['request'] = _func_call_str(request, *args, **kwargs)
         log.debug('Setting new request: %s', self)
+        self._forget_fingerprint()
         if args or kwargs:
             self._request = functools.partial(request, *args, **kwargs)
         else:
@@ -205,13 +248,15 @@ class RequestPoller():
         """
         return self._request
 
-    def on_response(self, callback, autoremove=True):
+    def on_response(self, callback, autoremove=True, unchanged=False):
         """
         Register `callback` to receive responses
 
-        callback: Any callable that gets the return value from the request autoremove:
-        Store callback as weak reference and remove it automatically once there are no
-        other references to it left
+        callback: Any callable that gets the return value from the request
+        autoremove: Store callback as weak reference and remove it automatically once
+                    there are no other references to it left
+        unchanged: Whether `callback` should also get responses that have the same
+                   fingerprint as the previous response (see `fingerprint` argument)
 
         If the request raises an exception, 'response' callbacks are called
         with `None` and 'error' callbacks are called with the exception.
@@ -219,7 +264,12 @@ class RequestPoller():
         self._debug_info['update_cbs'].append(_func_call_str(callback))
         log.debug('Registering %r to receive %s responses',
                   self._debug_info['update_cbs'][-1], self._debug_info['request'])
-        self._on_response.connect(callback, weak=autoremove)
+        if unchanged:
+            self._on_response_unchanged.connect(callback, weak=autoremove)
+        else:
+            self._on_response.connect(callback, weak=autoremove)
+            # New callback must get the next response even if nothing changed
+            self._forget_fingerprint()
 
     def on_error(self, callback, autoremove=True):
         """Register `callback` to receive request exceptions (see `on_response`)"""
@@ -232,6 +282,7 @@ class RequestPoller():
     def has_callbacks(self):
         """Whether anyone is interested in response to callback"""
         return (bool(self._on_response.receivers) or
+                bool(self._on_response_unchanged.receivers) or
                 bool(self._on_error.receivers))
 
     @property
@@ -245,10 +296,23 @@ class RequestPoller():
         if self.running:
             self.poll()
 
+    @property
+    def stats(self):
+        """
+        Dictionary with the keys "responses" and "skipped"
+
+        responses: Number of responses passed to callbacks
+        skipped: Number of responses not passed to callbacks because their fingerprint
+                 didn't change
+        """
+        return {'responses': self._debug_info['responses'],
+                'skipped': self._debug_info['skipped']}
+
     def __repr__(self):
         if hasattr(self, '_debug_info'):
-            return '<%s %s, callbacks=%s, error_callbacks=%s>' % (
+            return '<%s %s, callbacks=%s, error_callbacks=%s, responses=%s, skipped=%s>' % (
                 type(self).__name__, self._debug_info.get('request'),
-                self._debug_info.get('update_cbs'), self._debug_info.get('error_cbs'))
+                self._debug_info.get('update_cbs'), self._debug_info.get('error_cbs'),
+                self._debug_info.get('responses'), self._debug_info.get('skipped'))
         else:
             return '<%s>' % type(self).__name__
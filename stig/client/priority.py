@@ -0,0 +1,150 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Dispatch RPC requests by priority"""
+
+import asyncio
+import enum
+import heapq
+import itertools
+from collections import namedtuple
+from contextlib import contextmanager
+
+from ..logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+try:
+    import contextvars
+except ImportError:
+    # Python 3.6 has no context variables; all requests get the default priority
+    contextvars = None
+
+
+class Priority(enum.IntEnum):
+    """Request classes; lower values are sent first"""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+RequestContext = namedtuple('RequestContext', ('priority', 'preempt'))
+
+
+class _DefaultVar():
+    # ContextVar replacement that always has its default value
+    def __init__(self, name, default):
+        self._default = default
+
+    def get(self):
+        return self._default
+
+    def set(self, value):
+        return None
+
+    def reset(self, token):
+        pass
+
+if contextvars is not None:
+    _request_context = contextvars.ContextVar(
+        'request_context', default=RequestContext(priority=Priority.NORMAL, preempt=None))
+else:
+    _request_context = _DefaultVar(
+        'request_context', default=RequestContext(priority=Priority.NORMAL, preempt=None))
+
+
+@contextmanager
+def request_priority(priority, preempt=None):
+    """
+    Context manager that sets the priority of all requests made in its body
+
+    priority: `Priority` instance
+    preempt: None or callable that cancels the requests made in the body (this
+             is only used for `Priority.BACKGROUND`)
+
+    Tasks created in the body inherit the priority.
+    """
+    token = _request_context.set(RequestContext(Priority(priority), preempt))
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+def current_request_context():
+    """Return `RequestContext` instance of the current task"""
+    return _request_context.get()
+
+
+class PriorityLock():
+    """
+    Lock that is acquired by waiters in order of their priority
+
+    The priority of each waiter is taken from the current `request_priority`.
+    Waiters with the same priority get the lock in the order they started
+    waiting.
+
+    preempt: Whether a waiter with `Priority.INTERACTIVE` calls the `preempt`
+             callable of the owner if it has `Priority.BACKGROUND`
+    """
+    def __init__(self, preempt=False):
+        self.preempt = preempt
+        self._owner = None
+        self._waiters = []
+        self._counter = itertools.count()
+
+    def locked(self):
+        """Whether anyone owns the lock"""
+        return self._owner is not None
+
+    async def acquire(self):
+        context = current_request_context()
+        if self._owner is None and not self._waiters:
+            self._owner = context
+            return
+
+        fut = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._waiters, (context.priority, next(self._counter), fut, context))
+        self._maybe_preempt(context)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # If we were cancelled after getting the lock, we must pass it on
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, fut, context = heapq.heappop(self._waiters)
+            # Ignore waiters that were cancelled
+            if not fut.done():
+                self._owner = context
+                fut.set_result(None)
+                return
+        self._owner = None
+
+    def _maybe_preempt(self, context):
+        owner = self._owner
+        if (self.preempt and
+            context.priority is Priority.INTERACTIVE and
+            owner is not None and
+            owner.priority is Priority.BACKGROUND and
+            owner.preempt is not None):
+            log.debug('Preempting background request: %r', owner.preempt)
+            # Don't preempt the same request twice
+            self._owner = owner._replace(preempt=None)
+            owner.preempt()
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
@@ -9,38 +9,192 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
-import concurrent
+"""Reverse DNS lookups of peer IP addresses"""
+
+import asyncio
+import concurrent.futures
 import socket
+import time
+from collections import OrderedDict
 
 from ..logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
-_cache = {}
-_lookup_pool = concurrent.futures.ThreadPoolExecutor(max_workers=10)
+
+def _lookup(ip):
+    # Blocking lookup; return None if `ip` can't be resolved
+    try:
+        hostname = socket.gethostbyaddr(ip)[0]
+    except OSError:
+        return None
+    else:
+        # I've seen IPs being resolved to ".", dunno why.
+        return None if hostname == '.' else hostname
+
+
+class Resolver():
+    """
+    Reverse DNS resolver with bounded cache
+
+    Lookups are made in a thread pool.  Concurrent lookups of the same IP
+    address are only made once.  Callbacks are called on the event loop in
+    batches.
+
+    max_size: Maximum number of cached IP addresses
+    ttl: Seconds until a resolved hostname is looked up again
+    negative_ttl: Seconds until an IP address that couldn't be resolved is
+                  looked up again
+    concurrency: Maximum number of simultaneous lookups
+    batch_delay: Seconds to wait for more finished lookups before calling
+                 callbacks
+    """
+
+    def __init__(self, max_size=10000, ttl=3600, negative_ttl=300, concurrency=10, batch_delay=0.1):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.batch_delay = batch_delay
+        self._cache = OrderedDict()  # IP -> (hostname or None, expiration time)
+        self._pending = {}           # IP -> Future of running lookup
+        self._finished = []          # (callback, hostname) tuples
+        self._flush_handle = None
+        self._on_resolved = []
+        self._executor = None
+        self.concurrency = concurrency
+
+    @property
+    def concurrency(self):
+        """Maximum number of simultaneous lookups"""
+        return self._concurrency
+
+    @concurrency.setter
+    def concurrency(self, concurrency):
+        self._concurrency = max(1, int(concurrency))
+        if self._executor is not None:
+            # Running lookups finish in the old pool
+            self._executor.shutdown(wait=False)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self._concurrency)
+
+    def cached(self, ip):
+        """
+        Return cached hostname of `ip`
+
+        Return `ip` if it couldn't be resolved or `None` if it wasn't looked up
+        yet or if the cached hostname expired.
+        """
+        cache = self._cache
+        entry = cache.get(ip)
+        if entry is not None:
+            hostname, expires = entry
+            if expires > time.monotonic():
+                cache.move_to_end(ip)
+                return ip if hostname is None else hostname
+            del cache[ip]
+
+    def _store(self, ip, hostname):
+        cache = self._cache
+        ttl = self.negative_ttl if hostname is None else self.ttl
+        cache[ip] = (hostname, time.monotonic() + ttl)
+        cache.move_to_end(ip)
+        while len(cache) > self.max_size:
+            cache.popitem(last=False)
+
+    def gethostbyaddr(self, ip):
+        """Return hostname or `ip` after blocking until `ip` is resolved"""
+        hostname = self.cached(ip)
+        if hostname is None:
+            hostname = _lookup(ip)
+            self._store(ip, hostname)
+            hostname = ip if hostname is None else hostname
+        return hostname
+
+    async def resolve(self, ip):
+        """Return hostname or `ip` if it couldn't be resolved"""
+        hostname = self.cached(ip)
+        if hostname is not None:
+            return hostname
+
+        future = self._pending.get(ip)
+        if future is None:
+            loop = asyncio.get_event_loop()
+            future = loop.run_in_executor(self._executor, _lookup, ip)
+            self._pending[ip] = future
+
+            def store(future):
+                del self._pending[ip]
+                hostname = None if future.cancelled() or future.exception() else future.result()
+                self._store(ip, hostname)
+            future.add_done_callback(store)
+
+        # Other callers may wait for the same lookup
+        hostname = await asyncio.shield(future)
+        return ip if hostname is None else hostname
+
+    def query(self, *ips, callback=None):
+        """
+        Look up `ips` in the background
+
+        callback: Callable that gets the hostname (or IP address if it can't be
+                  resolved) for each of `ips`
+
+        Cached hostnames are passed to `callback` immediately.  Other hostnames
+        are passed to `callback` in batches on the event loop, followed by a
+        call to each callback registered with :meth:`on_resolved`.
+        """
+        for ip in ips:
+            hostname = self.cached(ip)
+            if hostname is None:
+                asyncio.ensure_future(self._resolve_and_call(ip, callback))
+            elif callback is not None:
+                callback(hostname)
+
+    async def _resolve_and_call(self, ip, callback):
+        hostname = await self.resolve(ip)
+        if callback is not None:
+            self._finished.append((callback, hostname))
+            if self._flush_handle is None:
+                loop = asyncio.get_event_loop()
+                self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        finished, self._finished = self._finished, []
+        for callback, hostname in finished:
+            callback(hostname)
+        for callback in self._on_resolved:
+            callback()
+
+    def on_resolved(self, callback):
+        """Call `callback` with no arguments after each batch of lookup callbacks"""
+        self._on_resolved.append(callback)
+
+    def clear(self):
+        """Forget all cached hostnames"""
+        self._cache.clear()
+
+    @property
+    def stats(self):
+        """
+        Dictionary with the keys "cached" and "pending"
+
+        cached: Number of cached IP addresses
+        pending: Number of running lookups
+        """
+        return {'cached': len(self._cache), 'pending': len(self._pending)}
+
+
+resolver = Resolver()
+
 
 def gethostbyaddr(ip):
-    hostname = _cache.get(ip)
-    if hostname is None:
-        try:
-            hostname = socket.gethostbyaddr(ip)[0]
-        except OSError:
-            hostname = ip
-        finally:
-            # I've seen IPs being resolved to ".", dunno why.
-            if hostname == '.':
-                hostname = ip
-            _cache[ip] = hostname
-    return hostname
+    return resolver.gethostbyaddr(ip)
 
 def gethostbyaddr_from_cache(ip):
-    return _cache.get(ip)
+    return resolver.cached(ip)
 
 def query(*ips, callback=None):
-    def cb(fut):
-        hostname = fut.result()
-        if callback:
-            callback(hostname)
+    resolver.query(*ips, callback=callback)
 
-    for ip in ips:
-        fut = _lookup_pool.submit(gethostbyaddr, ip)
-        fut.add_done_callback(cb)
+async def resolve(*ips):
+    """Look up `ips` concurrently and return list of hostnames"""
+    return await asyncio.gather(*(resolver.resolve(ip) for ip in ips))
@@ -29,14 +29,25 @@ class TorrentRequestPool(RequestPoller):
 
     After the combined torrents have arrived, split it back up by using each
     subscriber's filter and provide it to its callbacks as tuples.
+
+    If `skip_unchanged` is True, subscribers are not called if no torrent has
+    changed since the previous request.
     """
-    def __init__(self, srvapi, interval=1):
+    def __init__(self, srvapi, interval=1, skip_unchanged=False):
         self._api = srvapi.torrent
         self._tfilters = {}
         self._keys = {}
-        super().__init__(request=None, interval=interval)
+        fingerprint = self._fingerprint_torrent_list if skip_unchanged else None
+        super().__init__(request=None, interval=interval, fingerprint=fingerprint)
         self.on_response(self._handle_torrent_list)
 
+    @staticmethod
+    def _fingerprint_torrent_list(response):
+        # Torrents are cached and updated in place, so we can compare their
+        # revisions instead of their values
+        return (response.success, tuple(response.errors),
+                tuple((t['id'], t.revision) for t in response.torrents))
+
     def register(self, sid, callback, keys=(), tfilter=None):
         """Add new request to request pool
 
@@ -11,9 +11,10 @@
 
 """More complex types for torrent data, e.g. lists of peers or a file tree"""
 
+import math
 import os
 import time
-from collections import abc, defaultdict, deque
+from collections import OrderedDict, abc
 
 from . import utils
 from .base import TorrentBase  # noqa: F401
@@ -144,6 +145,13 @@ class TorrentFile(abc.Mapping):
             except KeyError:
                 pass
 
+        # priority is "off" if the file is not wanted
+        if 'is-wanted' in raw:
+            try:
+                del cache['priority']
+            except KeyError:
+                pass
+
     def __repr__(self):
         return '<{} {!r}>'.format(type(self).__name__, self['name'])
 
@@ -157,6 +165,127 @@ class TorrentFile(abc.Mapping):
         return len(self.TYPES)
 
 
+class _PeerProgress():
+    __slots__ = ('seen', 'time', 'progress', 'rate')
+
+    def __init__(self, seen, progress):
+        self.seen = seen          # When the peer was last reported
+        self.time = None          # When `progress` was reported first or None if unknown
+        self.progress = progress  # Last known progress (0.0 - 1.0)
+        self.rate = None          # Averaged download rate in bytes per second
+
+
+class PeerRateEstimator():
+    """
+    Estimate peers' download rates from their reported progress
+
+    The rate is an exponential moving average of the download rates between
+    changes in progress.  Recent rates are weighted more heavily the more time
+    passed since the previous change.
+
+    max_size: Maximum number of remembered peers; the least recently reported
+              peers are forgotten first
+    max_age: Seconds until a peer that isn't reported any more is forgotten
+    time_constant: Seconds after which the previous average has less than 37%
+                   weight
+    """
+
+    def __init__(self, max_size=20000, max_age=1800, time_constant=60):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.time_constant = time_constant
+        self._peers = OrderedDict()  # Peer ID -> _PeerProgress in order of last report
+        self._stats = {'evicted': 0, 'expired': 0}
+
+    def estimate(self, peer_id, peer_progress, torrent_size):
+        """
+        Add progress sample and return estimated rate and ETA
+
+        peer_id: Any hashable that identifies the peer
+        peer_progress: Progress of the peer from 0.0 to 1.0
+        torrent_size: Total size of the torrent in bytes
+
+        Return a (rate, eta) tuple where rate is in bytes per second (0 if
+        unknown) and eta is a number of seconds or a special
+        :class:`Timedelta` value.
+        """
+        peers = self._peers
+        if peer_progress >= 1:
+            # Peer has already downloaded everything
+            peers.pop(peer_id, None)
+            return 0, utils.Timedelta.NOT_APPLICABLE
+
+        now = time.monotonic()
+        peer = peers.get(peer_id)
+        if peer is None:
+            # The first sample's time is inaccurate: The peer's progress is not
+            # current but the latest we received, which happened likely tens of
+            # seconds ago.
+            peers[peer_id] = _PeerProgress(now, peer_progress)
+            if len(peers) > self.max_size:
+                peers.popitem(last=False)
+                self._stats['evicted'] += 1
+            return 0, utils.Timedelta.UNKNOWN
+
+        peer.seen = now
+        peers.move_to_end(peer_id)
+        if peer_progress != peer.progress:
+            if peer.time is not None and peer_progress > peer.progress:
+                torrent_size = int(torrent_size)  # Don't copy unit + unit prefix from torrent_size
+                t_diff = now - peer.time
+                rate = torrent_size * (peer_progress - peer.progress) / t_diff
+                if peer.rate is None:
+                    peer.rate = rate
+                else:
+                    weight = 1 - math.exp(-t_diff / self.time_constant)
+                    peer.rate += weight * (rate - peer.rate)
+            elif peer_progress < peer.progress:
+                # Progress can go down, e.g. if a peer deletes a file
+                peer.rate = None
+            peer.time = now
+            peer.progress = peer_progress
+
+        rate = peer.rate
+        if not rate:
+            return 0, utils.Timedelta.UNKNOWN
+        size_remaining = int(torrent_size) * (1 - peer_progress)
+        return rate, size_remaining / rate
+
+    def prune(self):
+        """Forget peers that weren't reported for `max_age` seconds"""
+        peers = self._peers
+        oldest_allowed = time.monotonic() - self.max_age
+        expired = 0
+        while peers:
+            peer_id, peer = next(iter(peers.items()))
+            if peer.seen >= oldest_allowed:
+                break
+            del peers[peer_id]
+            expired += 1
+        self._stats['expired'] += expired
+        log.debug('Pruned %d peers from rate estimator: %r', expired, self)
+
+    def clear(self):
+        """Forget all peers"""
+        self._peers.clear()
+
+    @property
+    def stats(self):
+        """
+        Dictionary with the keys "size", "evicted" and "expired"
+
+        size: Number of remembered peers
+        evicted: Number of peers forgotten because `max_size` was reached
+        expired: Number of peers forgotten because they were not reported for
+                 `max_age` seconds
+        """
+        return {'size': len(self._peers), **self._stats}
+
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__,
+                            ', '.join('%s=%s' % (k, v) for k, v in self.stats.items()))
+
+
 class TorrentPeer(abc.Mapping):
     TYPES = {
         'id'          : None,
@@ -178,77 +307,31 @@ class TorrentPeer(abc.Mapping):
         'id'      : lambda p: (p['tid'], p['ip'], p['port']),
     }
 
-    _MAX_PEER_PROGRESS_SAMPLE_AGE = 1800  # 30 minutes
-    _PEER_PROGRESS_DATA = defaultdict(lambda: deque(maxlen=10))
+    _ESTIMATOR = PeerRateEstimator()
 
     @classmethod
     def gc_peer_progress_data(cls):
-        log.debug('Pruning peer progress data:')
-        for peer_id,samples in tuple(cls._PEER_PROGRESS_DATA.items()):
-            # Remove samples that are too old
-            while samples and (samples[0][0] + cls._MAX_PEER_PROGRESS_SAMPLE_AGE) < time.monotonic():
-                log.debug('Sample from %s is too old: %r', peer_id, samples[0])
-                samples.popleft()
-
-            # Remove samples where progress is 0.0.  A lot of the cache entries just have
-            # a single sample from peers connecting for some reason but not downloading.
-            if samples and samples[0][1] in (0.0, 1.0):
-                samples.popleft()
-
-            # Remove deque if there are no samples left
-            if not samples:
-                del cls._PEER_PROGRESS_DATA[peer_id]
-
-        log.debug('Pruned peer progress data:')
-        for peer_id,samples in tuple(cls._PEER_PROGRESS_DATA.items()):
-            log.debug('%s: %s', peer_id, samples)
-
-    @classmethod
-    def _guess_peer_rate_and_eta(cls, peer_id, peer_progress, torrent_size):
-        rate = 0
-        if peer_progress >= 1:
-            # Peer has already downloaded everything
-            eta = utils.Timedelta.NOT_APPLICABLE
-        else:
-            eta = utils.Timedelta.UNKNOWN
-            samples = cls._PEER_PROGRESS_DATA[peer_id]
-
-            # Don't add the same progress twice
-            if not samples or peer_progress != samples[-1][1]:
-                samples.append((time.monotonic(), peer_progress))
-
-            # We need at least 3 samples
-            if len(samples) >= 3:
-                # Use second and last sample to calculate rate.  The first sample is
-                # ignored because its timestamp may be inaccurate: When we add the
-                # first sample, the peer's progress is not current but the latest we
-                # received, which happened likely tens of seconds ago.
-                t_first, p_first = samples[1]
-                t_last, p_last = samples[-1]
-                p_diff = p_last - p_first
-                t_diff = t_last - t_first
-
-                # It's possible progress goes down, e.g. if a peer deletes a file
-                if p_diff > 0:
-                    torrent_size = int(torrent_size)  # Don't copy unit + unit prefix from torrent_size
-                    size_diff = torrent_size * p_diff
-                    rate = size_diff / t_diff
-                    size_remaining = torrent_size - (torrent_size * peer_progress)
-                    try:
-                        eta = size_remaining / rate
-                    except ZeroDivisionError:
-                        eta = utils.Timedelta.UNKNOWN
-
-        return rate, eta
+        cls._ESTIMATOR.prune()
 
     def __init__(self, tid, tname, tsize, ip, port, client, downloaded, pdownloaded, rate_up, rate_down):
         self._cache = {}
-        self._dct = {'tid': tid, 'tname': tname, 'tsize': tsize,
-                     'ip': ip, 'port': port, 'client': client,
-                     'downloaded': downloaded, '%downloaded': pdownloaded,
-                     'rate-up': rate_up, 'rate-down': rate_down}
-        self._dct['rate-est'], self._dct['eta'] = \
-            self._guess_peer_rate_and_eta(self['id'], pdownloaded / 100, tsize)
+        self._dct = {'tid': tid, 'ip': ip, 'port': port}
+        self.update(tname, tsize, client, downloaded, pdownloaded, rate_up, rate_down)
+
+    def update(self, tname, tsize, client, downloaded, pdownloaded, rate_up, rate_down):
+        """Replace volatile values and forget cached values that changed"""
+        dct = self._dct
+        cache = self._cache
+        for key,value in (('tname', tname), ('tsize', tsize), ('client', client),
+                          ('downloaded', downloaded), ('%downloaded', pdownloaded),
+                          ('rate-up', rate_up), ('rate-down', rate_down)):
+            if dct.get(key) != value:
+                dct[key] = value
+                cache.pop(key, None)
+        dct['rate-est'], dct['eta'] = \
+            self._ESTIMATOR.estimate(self['id'], pdownloaded / 100, tsize)
+        cache.pop('rate-est', None)
+        cache.pop('eta', None)
 
     def __getitem__(self, key):
         cache = self._cache
@@ -330,6 +413,11 @@ class TorrentTracker(abc.Mapping):
         self._dct = trkdict
         self._cache = {}
 
+    def update(self, trkdict):
+        """Replace all values with the ones from `trkdict`"""
+        self._dct = trkdict
+        self._cache.clear()
+
     def __getitem__(self, key):
         cache = self._cache
         value = cache.get(key)
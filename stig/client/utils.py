@@ -12,10 +12,12 @@
 import asyncio
 import calendar
 import datetime
+import functools
 import operator
 import os
 import re
 import time
+from collections import namedtuple
 from types import SimpleNamespace
 
 from async_timeout import timeout as async_timeout
@@ -119,7 +121,15 @@ class SmartCmpStr(str):
 
 class SmartCmpPath(SmartCmpStr):
     def __new__(cls, path):
-        return super().__new__(cls, os.path.normpath(path))
+        # Many torrents share the same path, so they can share the same
+        # instance.  Use the exact string as cache key because SmartCmpStr
+        # compares case-insensitively.
+        return cls._make(cls, path if path.__class__ is str else str(path))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _make(cls, path):
+        return SmartCmpStr.__new__(cls, os.path.normpath(path))
 
 
 BoolOrPath = multitype(Bool, Path)
@@ -147,7 +157,11 @@ class Ratio(Float):
 
 
 class Status(tuple):
-    """A Torrent's status as a tuple of strings"""
+    """
+    A Torrent's status as a tuple of strings
+
+    Instances are immutable and shared between torrents with the same status.
+    """
 
     IDLE      = 'idle'
     DOWNLOAD  = 'downloading'
@@ -162,6 +176,15 @@ class Status(tuple):
     ORDER = (VERIFY, DOWNLOAD, UPLOAD, INIT, CONNECTED,
              ISOLATED, QUEUED, IDLE, STOPPED, SEED)
 
+    _instances = {}
+
+    def __new__(cls, statuses):
+        key = (cls, tuple(statuses))
+        obj = cls._instances.get(key)
+        if obj is None:
+            obj = cls._instances[key] = super().__new__(cls, key[1])
+        return obj
+
     def __lt__(self, other):
         return self.ORDER.index(self[0]) < self.ORDER.index(other[0])
 
@@ -611,6 +634,21 @@ class Response(SimpleNamespace):
                          **kwargs)
 
 
+class Progress(namedtuple('Progress', ('action', 'done', 'failed', 'total'))):
+    """
+    Progress of an API call that is split into many requests
+
+    action: Name of the RPC method (e.g. "torrent-start")
+    done: Number of processed items, including `failed`
+    failed: Number of items that couldn't be processed
+    total: Number of items
+    """
+    @property
+    def finished(self):
+        """Whether all items were processed"""
+        return self.done >= self.total
+
+
 class LazyDict(dict):
     """Dictionary with callables as values that return the actual value on demand"""
     def __getitem__(self, key):
@@ -677,17 +715,17 @@ class URL():
 
         return dct
 
-    _obj_cache = {}
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_url_cached(cls, url):
+        return cls._parse_url(url)
 
     def __new__(cls, url):
         if isinstance(url, cls):
             return url
 
-        cache_id = url
-        cache = cls._obj_cache
-        url_dict = cache.get(cache_id)
-        if url_dict is None:
-            url_dict = cache[cache_id] = cls._parse_url(url)
+        # URL instances are mutable, so only the parsed parts can be shared
+        url_dict = cls._parse_url_cached(url if url.__class__ is str else str(url))
 
         obj = super().__new__(cls)
         for attr in ('scheme', 'host', 'port', 'path', 'user', 'password'):
@@ -0,0 +1,263 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Add torrent files that appear in a directory"""
+
+import asyncio
+import os
+import time
+
+import blinker
+
+from ..logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+
+# Events from inotify(7) that may mean a new file is ready
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_EVENTS = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+
+def _inotify_fd(path):
+    # Return non-blocking inotify file descriptor that watches `path` or None if
+    # inotify is not available
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        inotify_init1 = libc.inotify_init1
+        inotify_add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError) as e:
+        log.debug('inotify is not available: %r', e)
+        return None
+
+    fd = inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        log.debug('inotify_init1() failed: %s', os.strerror(ctypes.get_errno()))
+        return None
+    if inotify_add_watch(fd, os.fsencode(path), _IN_EVENTS) < 0:
+        log.debug('inotify_add_watch(%r) failed: %s', path, os.strerror(ctypes.get_errno()))
+        os.close(fd)
+        return None
+    return fd
+
+
+class WatchDir():
+    """
+    Add torrent files that appear in a directory
+
+    Files are added when their size and modification time didn't change for
+    `settle` seconds so that partially written files are not added.  Added
+    files are moved to the subdirectory `done_dir`, files that couldn't be
+    added are moved to `failed_dir`.
+
+    New files are detected with inotify if it is available.  Otherwise (and
+    additionally, in case events are missed) the directory is scanned every
+    `interval` seconds.
+
+    add: Coroutine function that gets a list of file paths and any
+         `add_kwargs` and returns a Response with the attribute `results`
+         (e.g. TorrentAPI.add_many)
+    directory: Path to directory that is watched
+    interval: Seconds between directory scans
+    settle: Seconds a file must stay unchanged before it is added
+    batch_size: Maximum number of files that are passed to `add` at once
+    done_dir: Name of subdirectory for added files
+    failed_dir: Name of subdirectory for files that couldn't be added
+
+    Any other keyword arguments are passed to `add`.
+    """
+
+    def __init__(self, add, directory, interval=10, settle=2, batch_size=100,
+                 done_dir='done', failed_dir='failed', **add_kwargs):
+        self._add = add
+        self._add_kwargs = add_kwargs
+        self._directory = os.path.abspath(directory)
+        self._done_dir = os.path.join(self._directory, done_dir)
+        self._failed_dir = os.path.join(self._directory, failed_dir)
+        self.interval = interval
+        self.settle = settle
+        self.batch_size = batch_size
+        self._pending = {}
+        self._unmovable = {}
+        self._changed = asyncio.Event()
+        self._task = None
+        self._on_response = blinker.Signal()
+        self._on_stopped = blinker.Signal()
+
+    @property
+    def directory(self):
+        """Absolute path of watched directory"""
+        return self._directory
+
+    @property
+    def running(self):
+        """Whether the directory is watched in the background"""
+        return self._task is not None and not self._task.done()
+
+    def on_response(self, callback, autoremove=True):
+        """
+        Register `callback` to get the Response of each `add` call
+
+        If `autoremove` is True, `callback` is removed automatically when it is
+        garbage collected.
+        """
+        self._on_response.connect(callback, weak=autoremove)
+
+    def on_stopped(self, callback, autoremove=True):
+        """
+        Register `callback` to be called when watching in the background ends
+        without a call to `stop` (e.g. because the directory was removed)
+
+        `callback` gets this WatchDir instance.
+
+        If `autoremove` is True, `callback` is removed automatically when it is
+        garbage collected.
+        """
+        self._on_stopped.connect(callback, weak=autoremove)
+
+    def start(self):
+        """Watch directory in the background until `stop` is called"""
+        if not self.running:
+            self._task = asyncio.ensure_future(self.run())
+            self._task.add_done_callback(self._handle_task_done)
+
+    def _handle_task_done(self, task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            log.error('Stopped watching %s: %s', self._directory, error)
+        self._on_stopped.send(self)
+
+    async def stop(self):
+        """Stop watching in the background"""
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def run(self, once=False):
+        """
+        Watch directory until cancelled
+
+        If `once` is True, only add the files that currently exist and return
+        when there are no unsettled files left.
+
+        Return True if all files were added, False otherwise.
+        """
+        if not os.path.isdir(self._directory):
+            raise NotADirectoryError('Not a directory: %s' % (self._directory,))
+
+        loop = asyncio.get_event_loop()
+        fd = None if once else _inotify_fd(self._directory)
+        if fd is not None:
+            log.debug('Watching %s with inotify', self._directory)
+            loop.add_reader(fd, self._read_events, fd)
+        else:
+            log.debug('Watching %s by scanning every %s seconds', self._directory, self.interval)
+
+        success = True
+        try:
+            while True:
+                ready = self._find_ready_files()
+                for i in range(0, len(ready), self.batch_size):
+                    if not await self._add_files(ready[i:i + self.batch_size]):
+                        success = False
+                if once and not self._pending:
+                    return success
+                await self._wait()
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+                os.close(fd)
+
+    def _read_events(self, fd):
+        # We don't care about individual events, only that something happened
+        try:
+            while os.read(fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        self._changed.set()
+
+    async def _wait(self):
+        if self._pending:
+            # Events from files that are still being written don't matter
+            await asyncio.sleep(self.settle)
+        else:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+        self._changed.clear()
+
+    def _find_ready_files(self):
+        # Return sorted list of torrent files that didn't change for `settle`
+        # seconds and remember all other torrent files
+        now = time.monotonic()
+        ready = []
+        pending = {}
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.name.endswith('.torrent'):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue  # File was removed
+                fingerprint = (stat.st_size, stat.st_mtime_ns)
+                if self._unmovable.get(entry.path) == fingerprint:
+                    continue
+                prev_fingerprint, since = self._pending.get(entry.path, (None, now))
+                if fingerprint != prev_fingerprint:
+                    since = now
+                if stat.st_size > 0 and now - since >= self.settle:
+                    ready.append(entry.path)
+                else:
+                    pending[entry.path] = (fingerprint, since)
+        self._pending = pending
+        return sorted(ready)
+
+    async def _add_files(self, filepaths):
+        # Add `filepaths` and move them to done/failed subdirectory
+        log.debug('Adding %d torrent files from %s', len(filepaths), self._directory)
+        response = await self._add(filepaths, **self._add_kwargs)
+        self._on_response.send(response)
+        if not response.results:
+            # Nothing was attempted (e.g. daemon is not reachable); retry the
+            # files on the next scan
+            return False
+        for filepath, result in zip(filepaths, response.results):
+            self._move(filepath, self._done_dir if result.success else self._failed_dir)
+        return response.success
+
+    def _move(self, filepath, directory):
+        try:
+            os.makedirs(directory, exist_ok=True)
+            os.replace(filepath, os.path.join(directory, os.path.basename(filepath)))
+        except OSError as e:
+            log.error('Failed to move %s to %s: %s', filepath, directory, e.strerror or e)
+            # Don't add the same file again unless it changes
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                pass
+            else:
+                self._unmovable[filepath] = (stat.st_size, stat.st_mtime_ns)
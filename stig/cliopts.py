@@ -19,7 +19,7 @@ DESCRIPTIONS = OrderedDict()
 
 # This is a function so all the objects get garbage collected after
 # parsing finished
-def parse():
+def parse(argv=None):
     _parser = argparse.ArgumentParser(add_help=False)
 
     def _add_arg(*args, section='OPTIONS', description=None, varname=None, **kwargs):
@@ -57,6 +57,25 @@ def parse():
              section='OPTIONS',
              description='Do not run commands from any rc file')
 
+    _add_arg('--batch', action='store_true',
+             section='OPTIONS',
+             description=('Run command lines from stdin and print a line that starts '
+                          'with "<<<" and the exit code after the output of each'))
+    _add_arg('--jobs', '-j', type=int, default=1,
+             section='OPTIONS',
+             description='Run up to N command lines from stdin at the same time (see --batch)',
+             varname='N')
+
+    _add_arg('--server', action='store_true',
+             section='OPTIONS',
+             description=('Keep running and run CLI commands of other invocations '
+                          'that connect to the socket'))
+    _add_arg('--socket', default=None,
+             section='OPTIONS',
+             description=('Unix socket of a server started with --server; '
+                          'must be the first option for other invocations'),
+             varname='FILE')
+
     _add_arg('--debug', type=lambda mods: mods.split(','), default=[],
              section='DEVELOPER OPTIONS',
              description=('Log debug messages from comma-separated list of MODULES'
@@ -75,7 +94,7 @@ def parse():
 
     # Anything not specified above is a subcommand or a subcommand option.
     _parser.add_argument('subcmds', nargs=argparse.REMAINDER)
-    args = vars(_parser.parse_args())
+    args = vars(_parser.parse_args(argv))
     _subcmds = args.pop('subcmds')
 
     # Convert -h option to 'help' command
@@ -74,7 +74,8 @@ are exceptions:
 OPS_AND = ('&', 'and')
 OPS_OR  = ('|', 'or')
 OPS_SEQ = (';', 'also')
-OPS = OPS_AND + OPS_OR + OPS_SEQ
+OPS_PAR = (',', 'meanwhile')
+OPS = OPS_AND + OPS_OR + OPS_SEQ + OPS_PAR
 
 from .cmdbase import CommandMeta, _CommandBase
 from .cmderror import *
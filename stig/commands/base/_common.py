@@ -22,6 +22,19 @@ def make_X_FILTER_spec(filtername, or_focused=False, more_text='', **kwargs):
     return spec
 
 
+OUTPUT_FORMATS = ('json', 'ndjson', 'csv')
+
+def make_FORMAT_spec(more_text=''):
+    spec = {'names': ('--format', '-f'),
+            'choices': OUTPUT_FORMATS,
+            'description': ('Print records as JSON array ("json"), one JSON object per line '
+                            '("ndjson") or comma-separated values ("csv") instead of a table '
+                            '(CLI only)')}
+    if more_text:
+        spec['description'] += '; %s' % more_text
+    return spec
+
+
 def make_SCRIPTING_doc(cmdname):
     return (("If invoked as a command line argument and the output does not "
              "go to a TTY (i.e. the terminal size can't be determined), "
@@ -32,7 +45,12 @@ def make_SCRIPTING_doc(cmdname):
             ("To enforce human-readable, formatted output, set the environment "
              "variables COLUMNS and LINES."),
             "",
-            "\t$ \tCOLUMNS=80 LINES=24 {{__appname__}} {CMDNAME} | less -R".format(CMDNAME=cmdname))
+            "\t$ \tCOLUMNS=80 LINES=24 {{__appname__}} {CMDNAME} | less -R".format(CMDNAME=cmdname),
+            "",
+            ("The --format option prints unformatted values as JSON or CSV records "
+             "that are easier to parse."),
+            "",
+            "\t$ \t{{__appname__}} {CMDNAME} --format ndjson".format(CMDNAME=cmdname))
 
 
 def make_SORT_ORDERS_doc(sortercls, option, setting, append=()):
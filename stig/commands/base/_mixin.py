@@ -178,6 +178,19 @@ class get_setting_columns():
         return objects.localcfg.validate('columns.settings', columns)
 
 
+class get_output_format():
+    def get_output_format(self, format):
+        """
+        Check if records can be printed in `format`
+
+        Raise ValueError if `format` is not None and this command doesn't
+        provide the CLI, otherwise return `format`.
+        """
+        if format is not None and 'cli' not in self.provides:
+            raise ValueError('--format is only supported in the CLI')
+        return format
+
+
 class get_rc_filepath():
     def get_rc_filepath(self, path):
         """Return `path` relative to default rc file path unless it is absolute."""
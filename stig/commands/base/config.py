@@ -25,8 +25,8 @@ from ...settings import defaults, rcfile
 from ...utils import cached_property, cliparser, string, usertypes
 from .. import CmdError, CommandMeta, utils
 from . import _mixin as mixin
-from ._common import (make_COLUMNS_doc, make_SCRIPTING_doc, make_SORT_ORDERS_doc,
-                      make_X_FILTER_spec)
+from ._common import (make_COLUMNS_doc, make_FORMAT_spec, make_SCRIPTING_doc,
+                      make_SORT_ORDERS_doc, make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -358,7 +358,7 @@ class ResetCmdbase(metaclass=CommandMeta):
 
 
 class SetCmdbase(mixin.get_setting_sorter, mixin.get_setting_columns,
-                 metaclass=CommandMeta):
+                 mixin.get_output_format, metaclass=CommandMeta):
     name = 'set'
     category = 'configuration'
     provides = set()
@@ -386,6 +386,8 @@ class SetCmdbase(mixin.get_setting_sorter, mixin.get_setting_columns,
          'default_description': "current value of 'columns.settings' setting",
          'description': ('Comma-separated list of column names when listing settings '
                          '(see COLUMNS section)')},
+
+        make_FORMAT_spec(more_text='only used when listing settings'),
     )
     more_sections = {
         'COLUMNS': make_COLUMNS_doc(COLUMNS, '--columns', 'columns.settings'),
@@ -395,7 +397,7 @@ class SetCmdbase(mixin.get_setting_sorter, mixin.get_setting_columns,
                       'for a list of available local and remote settings.'),),
     }
 
-    async def run(self, NAME, VALUE, sort, columns):
+    async def run(self, NAME, VALUE, sort, columns, format):
         if not NAME and not VALUE:
             # Get remote setting values
             try:
@@ -411,10 +413,11 @@ class SetCmdbase(mixin.get_setting_sorter, mixin.get_setting_columns,
             try:
                 sort = self.get_setting_sorter(sort)
                 columns = self.get_setting_columns(columns)
+                format = self.get_output_format(format)
             except ValueError as e:
                 raise CmdError(e)
             else:
-                self.make_setting_list(sort, columns)
+                self.make_setting_list(sort, columns, format)
                 if error:
                     raise CmdError(error)
             return
@@ -531,9 +534,9 @@ class SetCmdbase(mixin.get_setting_sorter, mixin.get_setting_columns,
     @classmethod
     def completion_candidates_posargs(cls, args):
         """Complete positional arguments"""
-        # If --columns or --sort is anywhere, we only display options
+        # If --columns, --sort or --format is anywhere, we only display options
         for arg in args:
-            if cls.short_options.get(arg, arg) in ('--columns', '--sort'):
+            if cls.short_options.get(arg, arg) in ('--columns', '--sort', '--format'):
                 return
 
         settings = candidates.setting_names()
@@ -551,9 +554,10 @@ class SetCmdbase(mixin.get_setting_sorter, mixin.get_setting_columns,
         # Only complete options or parameters for options if there are no
         # positional arguments (i.e. when the command doesn't look like it's
         # changing a setting).  But positional arguments may also be parameters
-        # for --columns or --sort.
+        # for --columns, --sort or --format.
         posargs = args.posargs({('--columns', '-c'): 1,
-                                ('--sort', '-s'): 1})
+                                ('--sort', '-s'): 1,
+                                ('--format', '-f'): 1})
         if len(posargs) == 1:
             if args.curarg_index == 1:
                 return (super().completion_candidates_opts(args),
@@ -568,6 +572,8 @@ class SetCmdbase(mixin.get_setting_sorter, mixin.get_setting_columns,
             return candidates.sort_orders('SettingSorter')
         elif option == '--columns':
             return candidates.column_names('settings')
+        elif option == '--format':
+            return candidates.output_formats()
 
 
 class RateLimitCmdbase(metaclass=CommandMeta):
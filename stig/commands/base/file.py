@@ -15,13 +15,15 @@ from ... import objects
 from ...completion import candidates
 from .. import CmdError, CommandMeta
 from . import _mixin as mixin
-from ._common import make_COLUMNS_doc, make_SCRIPTING_doc, make_X_FILTER_spec
+from ._common import (make_COLUMNS_doc, make_FORMAT_spec, make_SCRIPTING_doc,
+                      make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
-class ListFilesCmdbase(mixin.get_file_columns, metaclass=CommandMeta):
+class ListFilesCmdbase(mixin.get_file_columns, mixin.get_output_format,
+                       metaclass=CommandMeta):
     name = 'filelist'
     aliases = ('fls', 'lsf')
     provides = set()
@@ -40,6 +42,7 @@ class ListFilesCmdbase(mixin.get_file_columns, metaclass=CommandMeta):
          'default_description': "current value of 'columns.files' setting",
          'description': ('Comma-separated list of column names '
                          "(see COLUMNS section)")},
+        make_FORMAT_spec(more_text='records contain all file values'),
     )
 
     from ...views.file import COLUMNS
@@ -48,7 +51,7 @@ class ListFilesCmdbase(mixin.get_file_columns, metaclass=CommandMeta):
         'SCRIPTING': make_SCRIPTING_doc(name),
     }
 
-    async def run(self, TORRENT_FILTER, FILE_FILTER, columns):
+    async def run(self, TORRENT_FILTER, FILE_FILTER, columns, format):
         columns = objects.localcfg['columns.files'] if columns is None else columns
         try:
             columns = self.get_file_columns(columns)
@@ -58,20 +61,22 @@ class ListFilesCmdbase(mixin.get_file_columns, metaclass=CommandMeta):
             ffilter = self.select_files(FILE_FILTER,
                                         allow_no_filter=True,
                                         discover_file=False)
+            format = self.get_output_format(format)
         except ValueError as e:
             raise CmdError(e)
 
         log.debug('Listing %s files of %s torrents', ffilter, tfilter)
 
         if asyncio.iscoroutinefunction(self.make_file_list):
-            await self.make_file_list(tfilter, ffilter, columns)
+            await self.make_file_list(tfilter, ffilter, columns, format)
         else:
-            self.make_file_list(tfilter, ffilter, columns)
+            self.make_file_list(tfilter, ffilter, columns, format)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
         """Complete positional arguments"""
-        posargs = args.posargs({('--columns', '-c'): 1})
+        posargs = args.posargs({('--columns', '-c'): 1,
+                                ('--format', '-f'): 1})
         if posargs.curarg_index == 1:
             return candidates.torrent_filter(args.curarg)
         elif posargs.curarg_index == 2:
@@ -83,6 +88,8 @@ class ListFilesCmdbase(mixin.get_file_columns, metaclass=CommandMeta):
         """Complete parameters (e.g. --option parameter1,parameter2)"""
         if option == '--columns':
             return candidates.column_names('files')
+        elif option == '--format':
+            return candidates.output_formats()
 
 
 class PriorityCmdbase(metaclass=CommandMeta):
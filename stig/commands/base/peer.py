@@ -16,15 +16,16 @@ from ... import objects
 from ...completion import candidates
 from .. import CmdError, CommandMeta
 from . import _mixin as mixin
-from ._common import (make_COLUMNS_doc, make_SCRIPTING_doc, make_SORT_ORDERS_doc,
-                      make_X_FILTER_spec)
+from ._common import (make_COLUMNS_doc, make_FORMAT_spec, make_SCRIPTING_doc,
+                      make_SORT_ORDERS_doc, make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
 class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
-                       mixin.get_peer_filter, metaclass=CommandMeta):
+                       mixin.get_peer_filter, mixin.get_output_format,
+                       metaclass=CommandMeta):
     name = 'peerlist'
     aliases = ('pls', 'lsp')
     provides = set()
@@ -49,6 +50,8 @@ class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
          'default_description': "current value of 'columns.peers' setting",
          'description': ('Comma-separated list of column names '
                          "(see COLUMNS section)")},
+
+        make_FORMAT_spec(more_text='records contain all peer values'),
     )
 
     from ...client.sorters import PeerSorter
@@ -62,7 +65,7 @@ class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
         'SCRIPTING': make_SCRIPTING_doc(name),
     }
 
-    async def run(self, TORRENT_FILTER, PEER_FILTER, sort, columns):
+    async def run(self, TORRENT_FILTER, PEER_FILTER, sort, columns, format):
         columns = objects.localcfg['columns.peers'] if columns is None else columns
         sort = objects.localcfg['sort.peers'] if sort is None else sort
         try:
@@ -72,6 +75,7 @@ class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
             pfilter = self.get_peer_filter(PEER_FILTER)
             sort    = self.get_peer_sorter(sort)
             columns = self.get_peer_columns(columns)
+            format  = self.get_output_format(format)
         except ValueError as e:
             raise CmdError(e)
 
@@ -84,15 +88,16 @@ class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
         log.debug('Listing %s peers of %s torrents', pfilter, tfilter)
 
         if asyncio.iscoroutinefunction(self.make_peer_list):
-            await self.make_peer_list(tfilter, pfilter, sort, columns)
+            await self.make_peer_list(tfilter, pfilter, sort, columns, format)
         else:
-            self.make_peer_list(tfilter, pfilter, sort, columns)
+            self.make_peer_list(tfilter, pfilter, sort, columns, format)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
         """Complete positional arguments"""
         posargs = args.posargs({('--columns', '-c'): 1,
-                                ('--sort', '-s'): 1})
+                                ('--sort', '-s'): 1,
+                                ('--format', '-f'): 1})
         if posargs.curarg_index == 1:
             return candidates.torrent_filter(args.curarg)
         elif posargs.curarg_index == 2:
@@ -106,3 +111,5 @@ class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
             return candidates.column_names('peers')
         elif option == '--sort':
             return candidates.sort_orders('PeerSorter')
+        elif option == '--format':
+            return candidates.output_formats()
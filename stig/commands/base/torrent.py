@@ -13,12 +13,13 @@ import asyncio
 import os
 
 from ... import objects
+from ...client.watchdir import WatchDir
 from ...completion import candidates
 from ...utils.cliparser import Arg
-from .. import CmdError, CommandMeta
+from .. import CmdError, CommandMeta, utils
 from . import _mixin as mixin
-from ._common import (make_COLUMNS_doc, make_SCRIPTING_doc, make_SORT_ORDERS_doc,
-                      make_X_FILTER_spec)
+from ._common import (make_COLUMNS_doc, make_FORMAT_spec, make_SCRIPTING_doc,
+                      make_SORT_ORDERS_doc, make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -50,24 +51,19 @@ class AddTorrentsCmdbase(metaclass=CommandMeta):
     )
 
     async def run(self, TORRENT, stopped, path, labels):
-        success = True
-        force_torrentlist_update = False
         if labels:
             labels = labels.split(',')
-        for source in TORRENT:
-            source_abs_path = self.make_path_absolute(source)
-            response = await self.make_request(objects.srvapi.torrent.add(source_abs_path,
-                                                                          stopped=stopped,
-                                                                          path=path,
-                                                                          labels=labels))
-            success = success and response.success
-            force_torrentlist_update = force_torrentlist_update or success
+        sources = [self.make_path_absolute(source) for source in TORRENT]
+        response = await self.make_request(objects.srvapi.torrent.add_many(sources,
+                                                                           stopped=stopped,
+                                                                           path=path,
+                                                                           labels=labels))
 
         # Update torrentlist AFTER all 'add' requests
-        if force_torrentlist_update and hasattr(self, 'polling_frenzy'):
+        if response.torrents and hasattr(self, 'polling_frenzy'):
             self.polling_frenzy()
 
-        if not success:
+        if not response.success:
             raise CmdError()
 
     @staticmethod
@@ -90,7 +86,82 @@ class AddTorrentsCmdbase(metaclass=CommandMeta):
             return candidates.labels(curlbl)
 
 
-class TorrentDetailsCmdbase(mixin.get_single_torrent, metaclass=CommandMeta):
+class WatchTorrentsCmdbase(metaclass=CommandMeta):
+    name = 'watch'
+    provides = set()
+    category = 'torrent'
+    description = 'Add torrent files that appear in directories'
+    usage = ('watch [<OPTIONS>] <DIRECTORY> <DIRECTORY> ...',)
+    examples = ('watch ~/torrents',
+                'watch --labels tv --path tv ~/torrents/tv',
+                'watch --once --stopped ~/torrents')
+    argspecs = (
+        {'names': ('DIRECTORY',), 'nargs': '+',
+         'description': 'Path to directory with torrent files'},
+
+        {'names': ('--stopped','-s'), 'action': 'store_true',
+         'description': 'Do not start downloading the added torrent(s)'},
+
+        {'names': ('--path','-p'),
+         'description': ('Custom download directory for added torrent(s) '
+                         'relative to "srv.path.complete" setting')},
+
+        {'names': ('--labels','-l'),
+         'description': 'Comma-separated list of labels'},
+
+        {'names': ('--once','-o'), 'action': 'store_true',
+         'description': 'Add existing torrent files and stop watching'},
+    )
+    more_sections = {
+        'DESCRIPTION': (('Files ending in ".torrent" are added when they have not changed for '
+                         '"watch.settle" seconds.  Added files are moved to the subdirectory '
+                         '"done" and files that could not be added are moved to "failed".'),
+                        '',
+                        ('New files are noticed immediately if inotify is available.  '
+                         'Otherwise, directories are scanned every "watch.interval" seconds.'),
+                        '',
+                        ('Up to "watch.batch-size" files are added at once; '
+                         'see the "bulk.*" settings for how they are sent to the daemon.')),
+    }
+
+    make_path_absolute = staticmethod(AddTorrentsCmdbase.make_path_absolute)
+
+    async def run(self, DIRECTORY, stopped, path, labels, once):
+        if labels:
+            labels = labels.split(',')
+        watchers = []
+        for directory in DIRECTORY:
+            directory = self.make_path_absolute(directory)
+            if not os.path.isdir(directory):
+                raise CmdError('Not a directory: %s' % (directory,))
+            watcher = WatchDir(objects.srvapi.torrent.add_many, directory,
+                               interval=objects.localcfg['watch.interval'],
+                               settle=objects.localcfg['watch.settle'],
+                               batch_size=objects.localcfg['watch.batch-size'],
+                               stopped=stopped, path=path, labels=labels)
+            watcher.on_response(self._handle_response, autoremove=False)
+            watchers.append(watcher)
+
+        if once:
+            results = await asyncio.gather(*(watcher.run(once=True) for watcher in watchers))
+            if not all(results):
+                raise CmdError()
+        else:
+            await self.watch(watchers)
+
+    def _handle_response(self, response):
+        utils.log_msgs(self, response)
+        if response.torrents and hasattr(self, 'polling_frenzy'):
+            self.polling_frenzy()
+
+    @classmethod
+    def completion_candidates_params(cls, option, args):
+        """Complete parameters (e.g. --option parameter1,parameter2)"""
+        return AddTorrentsCmdbase.completion_candidates_params(option, args)
+
+
+class TorrentDetailsCmdbase(mixin.get_single_torrent, mixin.get_output_format,
+                            metaclass=CommandMeta):
     name = 'details'
     aliases = ('info',)
     provides = set()
@@ -101,14 +172,19 @@ class TorrentDetailsCmdbase(mixin.get_single_torrent, metaclass=CommandMeta):
     examples = ('details id=71',)
     argspecs = (
         make_X_FILTER_spec('TORRENT', or_focused=True, nargs='?'),
+        make_FORMAT_spec(),
     )
+    more_sections = {
+        'SCRIPTING': make_SCRIPTING_doc(name),
+    }
 
-    async def run(self, TORRENT_FILTER):
+    async def run(self, TORRENT_FILTER, format):
         try:
             tfilter = self.select_torrents(TORRENT_FILTER,
                                            allow_no_filter=False,
                                            discover_torrent=True,
                                            prefer_focused=True)
+            format = self.get_output_format(format)
         except ValueError as e:
             raise CmdError(e)
         else:
@@ -118,19 +194,26 @@ class TorrentDetailsCmdbase(mixin.get_single_torrent, metaclass=CommandMeta):
             else:
                 log.debug('Showing details of torrent %r: %r', tfilter, torrent)
                 if asyncio.iscoroutinefunction(self.display_details):
-                    await self.display_details(torrent['id'])
+                    await self.display_details(torrent['id'], format)
                 else:
-                    self.display_details(torrent['id'])
+                    self.display_details(torrent['id'], format)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
         """Complete positional arguments"""
-        if args.curarg_index == 1:
+        posargs = args.posargs({('--format', '-f'): 1})
+        if posargs.curarg_index == 1:
             return candidates.torrent_filter(args.curarg)
 
+    @classmethod
+    def completion_candidates_params(cls, option, args):
+        """Complete parameters (e.g. --option parameter1,parameter2)"""
+        if option == '--format':
+            return candidates.output_formats()
+
 
 class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
-                          metaclass=CommandMeta):
+                          mixin.get_output_format, metaclass=CommandMeta):
     name = 'list'
     aliases = ('ls',)
     provides = set()
@@ -155,6 +238,8 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
          'default_description': "current value of 'columns.torrents' setting",
          'description': ('Comma-separated list of column names '
                          "(see COLUMNS section)")},
+
+        make_FORMAT_spec(more_text='records contain the values that are needed by COLUMNS'),
     )
 
     from ...client.sorters import TorrentSorter
@@ -165,7 +250,7 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
         'SCRIPTING': make_SCRIPTING_doc(name),
     }
 
-    async def run(self, TORRENT_FILTER, sort, columns):
+    async def run(self, TORRENT_FILTER, sort, columns, format):
         sort = objects.localcfg['sort.torrents'] if sort is None else sort
         columns = objects.localcfg['columns.torrents'] if columns is None else columns
         try:
@@ -174,14 +259,15 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
                                            allow_no_filter=True,
                                            discover_torrent=False)
             sort = self.get_torrent_sorter(sort)
+            format = self.get_output_format(format)
         except ValueError as e:
             raise CmdError(e)
         else:
             log.debug('Listing %s torrents sorted by %s', tfilter, sort)
             if asyncio.iscoroutinefunction(self.make_torrent_list):
-                await self.make_torrent_list(tfilter, sort, columns)
+                await self.make_torrent_list(tfilter, sort, columns, format)
             else:
-                self.make_torrent_list(tfilter, sort, columns)
+                self.make_torrent_list(tfilter, sort, columns, format)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
@@ -195,6 +281,8 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
             return candidates.sort_orders('TorrentSorter')
         elif option == '--columns':
             return candidates.column_names('torrents')
+        elif option == '--format':
+            return candidates.output_formats()
 
 
 class TorrentMagnetURICmdbase(metaclass=CommandMeta):
@@ -16,15 +16,16 @@ from ... import objects
 from ...completion import candidates
 from .. import CmdError, CommandMeta
 from . import _mixin as mixin
-from ._common import (make_COLUMNS_doc, make_SCRIPTING_doc, make_SORT_ORDERS_doc,
-                      make_X_FILTER_spec)
+from ._common import (make_COLUMNS_doc, make_FORMAT_spec, make_SCRIPTING_doc,
+                      make_SORT_ORDERS_doc, make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
 class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
-                          mixin.get_tracker_filter, metaclass=CommandMeta):
+                          mixin.get_tracker_filter, mixin.get_output_format,
+                          metaclass=CommandMeta):
     name = 'trackerlist'
     aliases = ('trkls', 'lstrk')
     provides = set()
@@ -48,6 +49,8 @@ class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
          'default_description': "current value of 'columns.trackers' setting",
          'description': ('Comma-separated list of column names '
                          "(see COLUMNS section)")},
+
+        make_FORMAT_spec(more_text='records contain all tracker values'),
     )
 
     from ...client.sorters import TrackerSorter
@@ -61,7 +64,7 @@ class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
         'SCRIPTING': make_SCRIPTING_doc(name),
     }
 
-    async def run(self, TORRENT_FILTER, TRACKER_FILTER, sort, columns):
+    async def run(self, TORRENT_FILTER, TRACKER_FILTER, sort, columns, format):
         columns = objects.localcfg['columns.trackers'] if columns is None else columns
         sort = objects.localcfg['sort.trackers'] if sort is None else sort
         try:
@@ -71,6 +74,7 @@ class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
             trkfilter = self.get_tracker_filter(TRACKER_FILTER)
             sort      = self.get_tracker_sorter(sort)
             columns   = self.get_tracker_columns(columns)
+            format    = self.get_output_format(format)
         except ValueError as e:
             raise CmdError(e)
 
@@ -83,15 +87,16 @@ class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
         log.debug('Listing %s trackers of %s torrents', trkfilter, torfilter)
 
         if asyncio.iscoroutinefunction(self.make_tracker_list):
-            await self.make_tracker_list(torfilter, trkfilter, sort, columns)
+            await self.make_tracker_list(torfilter, trkfilter, sort, columns, format)
         else:
-            self.make_tracker_list(torfilter, trkfilter, sort, columns)
+            self.make_tracker_list(torfilter, trkfilter, sort, columns, format)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
         """Complete positional arguments"""
         posargs = args.posargs({('--columns', '-c'): 1,
-                                ('--sort', '-s'): 1})
+                                ('--sort', '-s'): 1,
+                                ('--format', '-f'): 1})
         if posargs.curarg_index == 1:
             return candidates.torrent_filter(args.curarg)
         elif posargs.curarg_index == 2:
@@ -105,6 +110,8 @@ class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
             return candidates.column_names('trackers')
         elif option == '--sort':
             return candidates.sort_orders('TrackerSorter')
+        elif option == '--format':
+            return candidates.output_formats()
 
 
 class AnnounceCmdbase(metaclass=CommandMeta):
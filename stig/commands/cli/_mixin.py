@@ -12,7 +12,9 @@
 """Mixin classes for CLI commands"""
 
 import asyncio
+import sys
 
+from ... import objects
 from .. import utils
 from ._common import clear_line
 
@@ -22,7 +24,25 @@ log = make_logger(__name__)
 
 class make_request():
     async def make_request(self, request_coro, polling_frenzy=False, quiet=False):
-        """Awaits request coroutine and logs messages; returns response"""
+        """
+        Awaits request coroutine and logs messages; returns response
+
+        Progress of requests for many torrents is shown on stderr if it is a
+        terminal.
+        """
+        def show_progress(progress):
+            if progress.finished:
+                sys.stderr.write('\x1b[2K\r')
+            else:
+                sys.stderr.write('\x1b[2K\r%s: %d/%d torrents' % (
+                    progress.action, progress.done, progress.total))
+                if progress.failed:
+                    sys.stderr.write(' (%d failed)' % (progress.failed,))
+            sys.stderr.flush()
+
+        if not quiet and sys.stderr.isatty():
+            # Callback is removed automatically when we return
+            objects.srvapi.torrent.on_progress(show_progress)
         response = await request_coro
         utils.log_msgs(self, response, quiet)
         return response
@@ -64,7 +84,6 @@ class ask_yes_no():
             func_or_coro()
 
     async def _get_answer(self, question):
-        import sys
         import termios
         import tty
 
@@ -0,0 +1,121 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Print mappings (e.g. torrents) as JSON or CSV records"""
+
+import csv
+import io
+import json
+import math
+from collections import abc
+
+from ...client.utils import Count, Ratio
+from ._table import write_lines
+
+from ...logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+
+# Values that mean "unknown" or "not applicable" instead of an actual number
+_SENTINELS = ((Count, (Count.UNKNOWN,)),
+              (Ratio, (Ratio.NOT_APPLICABLE,)))
+
+def _is_sentinel(value):
+    constants = getattr(type(value), 'CONSTANTS', None)
+    if constants is not None:
+        return value in constants
+    for cls,values in _SENTINELS:
+        if isinstance(value, cls):
+            return value in values
+    return False
+
+def _convert(value):
+    # Turn `value` into something that json.dumps() understands
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    elif _is_sentinel(value):
+        return None
+    elif isinstance(value, int):
+        return int(value)
+    elif isinstance(value, float):
+        # JSON has no representation of infinity
+        return float(value) if math.isfinite(value) else None
+    elif isinstance(value, abc.Mapping):
+        return {str(k): _convert(v) for k,v in value.items()}
+    elif isinstance(value, abc.Set):
+        return sorted(_convert(v) for v in value)
+    elif isinstance(value, abc.Iterable):
+        return [_convert(v) for v in value]
+    else:
+        return str(value)
+
+def _records(items, keys):
+    for item in items:
+        yield {key: _convert(item[key]) for key in keys}
+
+def _json_lines(records):
+    # One record per line, e.g. '[{...},\n {...}]'
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    prefix = '['
+    prev = None
+    for record in records:
+        if prev is not None:
+            yield prefix + prev + ','
+            prefix = ' '
+        prev = dumps(record)
+    yield '[]' if prev is None else prefix + prev + ']'
+
+def _ndjson_lines(records):
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    for record in records:
+        yield dumps(record)
+
+def _csv_lines(records, keys):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='')
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+    def line(row):
+        writer.writerow(row)
+        string = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return string
+
+    yield line(keys)
+    for record in records:
+        yield line('' if value is None else
+                   dumps(value) if isinstance(value, (dict, list)) else value
+                   for value in record.values())
+
+def print_records(items, keys, format):
+    """
+    Print `keys` of each mapping in `items`
+
+    `format` must be "json" (JSON array with one object per line), "ndjson"
+    (one JSON object per line) or "csv" (header line with `keys` followed by
+    one line per item; lists and mappings are JSON-encoded).
+
+    Values are converted to numbers, strings, booleans, lists or mappings
+    without formatting.  Infinite numbers are `null` (JSON) or empty (CSV).
+    Lines are written while `items` is consumed.
+    """
+    keys = tuple(keys)
+    records = _records(items, keys)
+    if format == 'json':
+        lines = _json_lines(records)
+    elif format == 'ndjson':
+        lines = _ndjson_lines(records)
+    elif format == 'csv':
+        lines = _csv_lines(records, keys)
+    else:
+        raise ValueError('Unsupported format: %r' % (format,))
+    write_lines(lines)
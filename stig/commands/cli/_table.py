@@ -9,7 +9,9 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import itertools
 import re
+import sys
 import textwrap
 from shutil import get_terminal_size
 from types import SimpleNamespace
@@ -20,7 +22,16 @@ from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
-TERMSIZE = get_terminal_size(fallback=(None, None))
+# Attributes may be changed (e.g. by the server for each client)
+_termsize = get_terminal_size(fallback=(None, None))
+TERMSIZE = SimpleNamespace(columns=_termsize.columns, lines=_termsize.lines)
+
+# Number of rows that are used to find column widths; wider values in later
+# rows are cropped or wrapped
+SAMPLE_SIZE = 1000
+
+# Number of lines that are written to stdout at once
+CHUNK_SIZE = 256
 
 
 _whitespace_regex = re.compile(r'^\s*$')
@@ -31,53 +42,40 @@ def _wrapped(line, width):
     else:
         yield from textwrap.wrap(line, width=width, break_on_hyphens=False)
 
-def _get_cell_lines(cell):
+def _get_cell_lines(string, width, colspec):
     # Return string of single cell correctly cropped/padded and aligned
-    line = normalize_unicode(str(cell.get_cli_value()))
-    width = cell.width
-    if isinstance(width, int):
-        if cell.wrap == 'clip':
-            return (crop_and_align(line, width, cell.align,
-                                   has_wide_chars=cell.may_have_wide_chars),)
-        else:
-            return tuple(stralign(line, width=width)
-                         for line in _wrapped(line, width))
+    if colspec.wrap == 'clip':
+        return (crop_and_align(string, width, colspec.align,
+                               has_wide_chars=colspec.may_have_wide_chars),)
     else:
-        return (line,)
+        return tuple(stralign(line, width=width)
+                     for line in _wrapped(string, width))
 
-def _assemble_row(table, line_index, pretty=True):
+def _assemble_row(table, row):
     # Concatenate all cells in a row with delimiters
     # Return a list of lines (cells may have multiple lines)
-    row = []
-    for cell in table.rows[line_index]:
-        if pretty:
-            row.append(_get_cell_lines(cell))
-        else:
-            row.append((str(cell.get_raw_value()),))
+    cells = [_get_cell_lines(string, width, colspec)
+             for (string,_),width,colspec in zip((row[i] for i in table.colindexes),
+                                                 table.colwidths, table.colspecs)]
+    delimiter = table.delimiter
+    lines_count = max(len(cell) for cell in cells)
+    if lines_count == 1:
+        return [delimiter.join(cell[0] for cell in cells)]
 
-    lines_count = max(len(cell) for cell in row)
     lines = []
-    delimiter = table.delimiter
     for i in range(lines_count):
-        # `row` is a list of cells; each `cell` is a list of lines in an
-        # individual cell.
+        # `cells` is a list of cells; each cell is a tuple of lines
         line = []
-        for cell in row:
-            cell_lines = len(cell)
-            empty_space = ' ' * len(cell[0])
-            line.append(cell[i] if i < cell_lines else empty_space)
-        line = delimiter.join(line)
-        lines.append(line)
+        for cell in cells:
+            line.append(cell[i] if i < len(cell) else ' ' * len(cell[0]))
+        lines.append(delimiter.join(line))
     return lines
 
 def _assemble_headers(table):
     # Concatenate all column headers with delimiters
-    # This must be called after shrink_and_expand_to_fit() so we can
-    # grab the final column widths from the first row.
     headers = []
-    for colname in table.colorder:
-        width = table.colwidths[colname]
-        header_items = table.colspecs[colname].header
+    for colspec,width in zip(table.colspecs, table.colwidths):
+        header_items = colspec.header
         left  = header_items.get('left', '')
         right = header_items.get('right', '')
         space = ' ' * (width - len(left) - len(right))
@@ -85,130 +83,109 @@ def _assemble_headers(table):
         headers.append(header)
     return table.delimiter.join(headers)
 
-def _get_header_width(table, colname):
-    header = table.colspecs[colname].header
+def _get_header_width(colspec):
+    header = colspec.header
     return strwidth(' '.join((header.get('left', ''),
                               header.get('right', ''))).strip())
 
-def _get_colwidth(table, colindex):
-    # Return width of widest cell in column
-    rows = (normalize_unicode(str(row[colindex].get_cli_value()))
-            for row in table.rows)
-    return max(strwidth(row) for row in rows)
-
-def _column_has_variable_width(table, colname):
-    # Whether column has fixed or variable width
-    return not isinstance(table.colspecs[colname].width, int)
-
-def _column_could_use_more_width(table, colname):
-    # Whether any cell in a column is cropped
-    return table.colwidths[colname] < table.maxcolwidths[colname]
-
-def _column_is_shrinkable(table, colname):
-    # Whether the current width of column is larger than its minimum width
-    return table.colwidths[colname] > table.colspecs[colname].min_width
-
-def _set_colwidth(table, colindex, width):
-    # Set width of all cells in a column
-    colname = table.colorder[colindex]
-    table.colwidths[colname] = width
-    for row in table.rows:
-        row[colindex].width = width
-
-def _set_maxcolwidth(table, colindex, maxwidth):
-    # Set maximum width a column can make use of (no cell needs more horizontal
-    # space than `maxwidth`)
-    colname = table.colorder[colindex]
-    table.maxcolwidths[colname] = maxwidth
+_printable_ascii_regex = re.compile(r'[ -~]*')
+def _format_cells(items, colspecs):
+    # Yield rows; each row is a list of (string, display width) tuples
+    for item in items:
+        row = []
+        for colspec in colspecs:
+            string = normalize_unicode(str(colspec(item).get_cli_value()))
+            if _printable_ascii_regex.fullmatch(string):
+                row.append((string, len(string)))
+            else:
+                row.append((string, strwidth(string)))
+        yield row
+
+def write_lines(lines):
+    # Write lines to stdout in chunks and flush after each chunk so readers
+    # (e.g. a pager) get output as soon as possible
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    while True:
+        chunk = tuple(itertools.islice(lines, CHUNK_SIZE))
+        if not chunk:
+            break
+        write('\n'.join(chunk))
+        write('\n')
+        flush()
 
 def _get_excess_width(table):
     # Return width by which table must be narrowed to fit in max_width
-    first_line = _assemble_row(table, 0)[0]
-    return strwidth(first_line) - table.max_width
+    width = sum(table.colwidths) + table.delimiter_width * (len(table.colwidths) - 1)
+    return width - table.max_width
 
-def _remove_column(table, colindex):
+def _remove_column(table, index):
     # Delete column from internal structures
-    del table.colwidths[table.colorder[colindex]]
-    del table.colorder[colindex]
-    for row in table.rows:
-        del row[colindex]
-
-def _shrink_to_widest_value(table):
-    # Reduce width of columns where header and all values are narrower than the
-    # current width
-    for colindex,colname in enumerate(table.colorder):
-        max_value_width = max(_get_header_width(table, colname),
-                              _get_colwidth(table, colindex))
-        _set_colwidth(table, colindex, max_value_width)
-        _set_maxcolwidth(table, colindex, max_value_width)
+    for attr in ('colindexes', 'colspecs', 'colwidths', 'maxcolwidths'):
+        del getattr(table, attr)[index]
 
 def _shrink_variable_width_columns(table):
     # Reduce width of columns that haven't reached their min_size yet
+    colwidths = table.colwidths
     excess = _get_excess_width(table)
     while excess > 0:
-        candidates = [(colname,table.colwidths[colname])
-                      for colname in table.colorder
-                      if _column_is_shrinkable(table, colname)]
+        candidates = [(i,width) for i,(width,colspec) in enumerate(zip(colwidths, table.colspecs))
+                      if width > colspec.min_width]
 
         if len(candidates) >= 2:
             # Sort by width (first item is widest)
-            candidates_sorted = sorted(candidates, key=lambda col: col[1], reverse=True)
-            widest0_name, widest0_width = candidates_sorted[0]
-            widest1_name, widest1_width = candidates_sorted[1]
+            candidates.sort(key=lambda col: col[1], reverse=True)
+            widest0_index, widest0_width = candidates[0]
+            widest1_index, widest1_width = candidates[1]
             # Shrink widest column by difference to second widest column
             # (leaving them at the same width), but not by more than `excess`
             # characters.
             shrink_amount = max(1, min(excess, widest0_width - widest1_width))
         elif len(candidates) >= 1:
             # Only one column left to shrink
-            widest0_name = candidates[0][0]
+            widest0_index = candidates[0][0]
             shrink_amount = 1
         else:
             # No shrinkable columns
             break
 
-        new_width = table.colwidths[widest0_name] - shrink_amount
-        _set_colwidth(table, table.colorder.index(widest0_name), new_width)
-        excess = _get_excess_width(table)
+        colwidths[widest0_index] -= shrink_amount
+        excess -= shrink_amount
 
 def _shrink_by_removing_columns(table):
     # Remove columns until table is no longer wider than terminal
-    while _get_excess_width(table) > 0:
+    while len(table.colwidths) > 1 and _get_excess_width(table) > 0:
         _remove_column(table, 0)
 
     # We may have freed up space to give back to columns of variable width
     freed_width = -_get_excess_width(table)
-    if freed_width > 0:
-        while freed_width > 0:
-            freed_width -= 1
-            # Find non-fixed-width columns that could use more width
-            candidates = [(colname,table.colwidths[colname])
-                          for colname in table.colorder
-                          if (_column_has_variable_width(table, colname) and
-                              _column_could_use_more_width(table, colname))]
-            if not candidates:
-                # We have space left, but no column wants it
-                break
-            candidates_sorted = sorted(candidates, key=lambda col: col[1])
-            colname = candidates_sorted[0][0]
-            new_width = table.colwidths[candidates_sorted[0][0]] + 1
-            _set_colwidth(table, table.colorder.index(colname), new_width)
-
-def _fit_table_into_terminal(table):
-    # Expand all cells in each column to the width of the widest cell
-    # Keep track of each column width in table namespace
-    for colindex,colname in enumerate(table.colorder):
-        if _column_has_variable_width(table, colname):
-            colwidth = _get_colwidth(table, colindex)
-        else:
-            colwidth = table.colspecs[colname].width
-        _set_colwidth(table, colindex, colwidth)
+    colwidths = table.colwidths
+    while freed_width > 0:
+        freed_width -= 1
+        # Find non-fixed-width columns that could use more width
+        candidates = [(i,width) for i,(width,maxwidth,colspec)
+                      in enumerate(zip(colwidths, table.maxcolwidths, table.colspecs))
+                      if not isinstance(colspec.width, int) and width < maxwidth]
+        if not candidates:
+            # We have space left, but no column wants it
+            break
+        index = min(candidates, key=lambda col: col[1])[0]
+        colwidths[index] += 1
+
+def _fit_table_into_terminal(table, rows):
+    # Make each column as wide as its widest value or header
+    colwidths = [_get_header_width(colspec) for colspec in table.colspecs]
+    for row in rows:
+        for i,(_,width) in enumerate(row):
+            if width > colwidths[i]:
+                colwidths[i] = width
+    table.colwidths = colwidths
+    table.maxcolwidths = list(colwidths)
 
-    _shrink_to_widest_value(table)
     _shrink_variable_width_columns(table)
     _shrink_by_removing_columns(table)
 
-def print_table(items, order, column_specs):
+def print_table(items, order, column_specs, sample_size=None):
     """
     Print table from a two-dimensional array of column objects
 
@@ -218,37 +195,49 @@ def print_table(items, order, column_specs):
 
     `order` is a sequence of column IDs.
 
-    `items` is a sequence of arbitrary objects that are used to create cell
-    objects by passing them to the classes in `column_specs`.
+    `items` is an iterable of arbitrary objects that are used to create cell
+    objects by passing them to the classes in `column_specs`.  Rows are
+    formatted and written while `items` is consumed.
+
+    `sample_size` is the number of rows that are used to find column widths
+    (defaults to `SAMPLE_SIZE`).  Values in later rows that don't fit are
+    cropped or wrapped.
     """
     # Whether to print for a human or for a machine to read our output
     pretty_output = all(x is not None for x in (TERMSIZE.columns, TERMSIZE.lines))
 
-    table = SimpleNamespace(colspecs=column_specs,
-                            colorder=order,
-                            colwidths={}, maxcolwidths={},  # Calculated when needed
-                            delimiter='\t' if TERMSIZE.columns is None else '│',
+    colspecs = [column_specs[colname] for colname in order]
+    delimiter = '\t' if TERMSIZE.columns is None else '│'
+
+    if not pretty_output:
+        log.debug('Could not detect TTY size - assuming stdout is no TTY')
+        # Each cell must behave like an instance of a child class of
+        # ColumnBase (see stig.views.__init__.py).
+        write_lines(delimiter.join(str(colspec(item).get_raw_value()) for colspec in colspecs)
+                    for item in items)
+        return
+
+    # Format each cell only once; everything else works with the formatted
+    # strings and their display widths
+    rows = _format_cells(items, colspecs)
+    sample = list(itertools.islice(rows, SAMPLE_SIZE if sample_size is None else sample_size))
+    if not sample:
+        return
+
+    table = SimpleNamespace(colindexes=list(range(len(colspecs))),  # Index of column in rows
+                            colspecs=colspecs,
+                            colwidths=[], maxcolwidths=[],  # Calculated when needed
+                            delimiter=delimiter,
+                            delimiter_width=strwidth(delimiter),
                             max_width=TERMSIZE.columns)
+    _fit_table_into_terminal(table, sample)
+    headerstr = '\033[1;4m' + _assemble_headers(table) + '\033[0m'
 
-    # Create two-dimensional list of cells.  Each cell must behave like an
-    # instance of a child class of ColumnBase (see stig.views.__init__.py).
-    table.rows = []
-    for item in items:
-        row = []
-        for i,colname in enumerate(table.colorder):
-            row.append(table.colspecs[colname](item))
-        table.rows.append(row)
-
-    if len(table.rows) > 0:
-        if pretty_output:
-            _fit_table_into_terminal(table)
-            headerstr = '\033[1;4m' + _assemble_headers(table) + '\033[0m'
-        else:
-            log.debug('Could not detect TTY size - assuming stdout is no TTY')
-
-        for line_index in range(len(table.rows)):
+    def lines():
+        for line_index,row in enumerate(itertools.chain(sample, rows)):
             # Print column headers after every screen full
-            if pretty_output and line_index % (TERMSIZE.lines - 2) == 0:
-                print(headerstr)
-            for row in _assemble_row(table, line_index, pretty=pretty_output):
-                print(row)
+            if line_index % (TERMSIZE.lines - 2) == 0:
+                yield headerstr
+            yield from _assemble_row(table, row)
+
+    write_lines(lines())
@@ -12,6 +12,7 @@
 from ... import objects
 from ..base import config as base
 from . import _mixin as mixin
+from ._records import print_records
 from ._table import print_table
 
 
@@ -37,13 +38,16 @@ class SetCmd(base.SetCmdbase,
              mixin.only_supported_columns):
     provides = {'cli'}
 
-    def make_setting_list(self, sort, columns):
-        from ...views.setting import COLUMNS as SETTING_COLUMNS
-
-        # Remove columns that aren't supported by CLI interface (e.g. 'marked')
-        columns = self.only_supported_columns(columns, SETTING_COLUMNS)
+    def make_setting_list(self, sort, columns, format):
         settings = sort.apply(objects.cfg.as_dict.values())
-        print_table(settings, columns, SETTING_COLUMNS)
+        if format is None:
+            from ...views.setting import COLUMNS as SETTING_COLUMNS
+
+            # Remove columns that aren't supported by CLI interface (e.g. 'marked')
+            columns = self.only_supported_columns(columns, SETTING_COLUMNS)
+            print_table(settings, columns, SETTING_COLUMNS)
+        else:
+            print_records(settings, ('id', 'value', 'default', 'description', 'syntax'), format)
 
 
 class RateLimitCmd(base.RateLimitCmdbase,
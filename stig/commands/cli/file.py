@@ -15,6 +15,7 @@ from ... import objects
 from .. import CmdError
 from ..base import file as base
 from . import _mixin as mixin
+from ._records import print_records
 from ._table import TERMSIZE, print_table
 
 from ...logging import make_logger  # isort:skip
@@ -26,7 +27,7 @@ class ListFilesCmd(base.ListFilesCmdbase,
                    mixin.only_supported_columns):
     provides = {'cli'}
 
-    async def make_file_list(self, tfilter, ffilter, columns):
+    async def make_file_list(self, tfilter, ffilter, columns, format):
         response = await self.make_request(
             objects.srvapi.torrent.torrents(tfilter, keys=('name', 'files')),
             quiet=True)
@@ -35,17 +36,26 @@ class ListFilesCmd(base.ListFilesCmdbase,
         if len(torrents) < 1:
             raise CmdError()
 
-        filelist = []
-        for torrent in humansorted(torrents, key=lambda t: t['name']):
-            files, filtered_count = self._flatten_tree(torrent['files'], ffilter)
-            filelist.extend(files)
+        if format is None:
+            filelist = []
+            for torrent in humansorted(torrents, key=lambda t: t['name']):
+                files, filtered_count = self._flatten_tree(torrent['files'], ffilter)
+                filelist.extend(files)
+        else:
+            filelist = [f for torrent in humansorted(torrents, key=lambda t: t['name'])
+                        for f in torrent['files'].files
+                        if ffilter is None or ffilter.match(f)]
 
         if filelist:
-            from ...views.file import COLUMNS as FILE_COLUMNS
+            if format is None:
+                from ...views.file import COLUMNS as FILE_COLUMNS
 
-            # Remove columns that aren't supported by CLI interface (e.g. 'marked')
-            columns = self.only_supported_columns(columns, FILE_COLUMNS)
-            print_table(filelist, columns, FILE_COLUMNS)
+                # Remove columns that aren't supported by CLI interface (e.g. 'marked')
+                columns = self.only_supported_columns(columns, FILE_COLUMNS)
+                print_table(filelist, columns, FILE_COLUMNS)
+            else:
+                from ...client import TorrentFile
+                print_records(filelist, TorrentFile.TYPES, format)
         else:
             if str(tfilter) != 'all':
                 raise CmdError('No matching files in %s torrents: %s' % (tfilter, ffilter))
@@ -15,6 +15,7 @@ from ... import objects
 from .. import CmdError
 from ..base import peer as base
 from . import _mixin as mixin
+from ._records import print_records
 from ._table import print_table
 
 from ...logging import make_logger  # isort:skip
@@ -25,7 +26,7 @@ class ListPeersCmd(base.ListPeersCmdbase,
                    mixin.make_request, mixin.select_torrents):
     provides = {'cli'}
 
-    async def make_peer_list(self, tfilter, pfilter, sort, columns):
+    async def make_peer_list(self, tfilter, pfilter, sort, columns, format):
         response = await self.make_request(
             objects.srvapi.torrent.torrents(tfilter, keys=('name', 'peers')),
             quiet=True)
@@ -46,15 +47,19 @@ class ListPeersCmd(base.ListPeersCmdbase,
             peerlist.extend(filter_peers(torrent['peers']))
 
         # Pre-lookup peers' IPs
-        if 'host' in columns and objects.localcfg['reverse-dns']:
+        if format is None and 'host' in columns and objects.localcfg['reverse-dns']:
             from ...client import rdns
-            rdns.query(*(p['ip'] for p in peerlist))
+            await rdns.resolve(*{p['ip'] for p in peerlist})
 
         sort.apply(peerlist, inplace=True)
 
         if peerlist:
-            from ...views.peer import COLUMNS as PEER_COLUMNS
-            print_table(peerlist, columns, PEER_COLUMNS)
+            if format is None:
+                from ...views.peer import COLUMNS as PEER_COLUMNS
+                print_table(peerlist, columns, PEER_COLUMNS)
+            else:
+                from ...client import TorrentPeer
+                print_records(peerlist, TorrentPeer.TYPES, format)
         else:
             def filter_is_relevant(f):
                 return f and str(f) != 'all'
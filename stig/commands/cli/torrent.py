@@ -9,11 +9,14 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import asyncio
+
 from ... import objects
 from ...completion import candidates
 from .. import CmdError
 from ..base import torrent as base
 from . import _mixin as mixin
+from ._records import print_records
 from ._table import TERMSIZE, print_table
 
 from ...logging import make_logger  # isort:skip
@@ -33,16 +36,34 @@ class AddTorrentsCmd(base.AddTorrentsCmdbase,
                                   glob=r'*.torrent')
 
 
+class WatchTorrentsCmd(base.WatchTorrentsCmdbase):
+    provides = {'cli'}
+
+    async def watch(self, watchers):
+        # Run until interrupted
+        for watcher in watchers:
+            self.info('Watching %s' % (watcher.directory,))
+        await asyncio.gather(*(watcher.run() for watcher in watchers))
+
+    @classmethod
+    def completion_candidates_posargs(cls, args):
+        """Complete positional arguments"""
+        return candidates.fs_path(args.curarg.before_cursor,
+                                  base='.',
+                                  directories_only=True)
+
+
 class TorrentDetailsCmd(base.TorrentDetailsCmdbase,
                         mixin.make_request, mixin.select_torrents):
     provides = {'cli'}
 
-    async def display_details(self, torrent_id):
+    async def display_details(self, torrent_id, format):
         from ...views.details import SECTIONS
-        needed_keys = set(('name',))
+        needed_keys = ['id', 'name']
         for _section in SECTIONS:
             for _item in _section['items']:
-                needed_keys.update(_item.needed_keys)
+                needed_keys.extend(key for key in _item.needed_keys
+                                   if key not in needed_keys)
 
         response = await self.make_request(
             objects.srvapi.torrent.torrents((torrent_id,), keys=needed_keys),
@@ -52,7 +73,9 @@ class TorrentDetailsCmd(base.TorrentDetailsCmdbase,
         else:
             torrent = response.torrents[0]
 
-        if TERMSIZE.columns is None:
+        if format is not None:
+            print_records((torrent,), needed_keys, format)
+        elif TERMSIZE.columns is None:
             self._machine_readable(torrent)
         else:
             self._human_readable(torrent)
@@ -83,7 +106,7 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
                       mixin.only_supported_columns):
     provides = {'cli'}
 
-    async def make_torrent_list(self, tfilter, sort, columns):
+    async def make_torrent_list(self, tfilter, sort, columns, format):
         from ...views.torrent import COLUMNS as TORRENT_COLUMNS
 
         # Remove columns that aren't supported by CLI interface (e.g. 'marked')
@@ -103,11 +126,18 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
             quiet=True)
         torrents = sort.apply(response.torrents)
 
-        # Show table of found torrents
-        if torrents:
+        # Show found torrents
+        if not torrents:
+            raise CmdError()
+        elif format is None:
             print_table(torrents, columns, TORRENT_COLUMNS)
         else:
-            raise CmdError()
+            # Records contain the values that are needed by the columns
+            record_keys = ['id']
+            for colname in columns:
+                record_keys.extend(key for key in TORRENT_COLUMNS[colname].needed_keys
+                                   if key not in record_keys)
+            print_records(torrents, record_keys, format)
 
 
 class TorrentMagnetURICmd(base.TorrentMagnetURICmdbase,
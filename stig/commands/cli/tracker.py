@@ -15,6 +15,7 @@ from ... import objects
 from .. import CmdError
 from ..base import tracker as base
 from . import _mixin as mixin
+from ._records import print_records
 from ._table import print_table
 
 from ...logging import make_logger  # isort:skip
@@ -25,7 +26,7 @@ class ListTrackersCmd(base.ListTrackersCmdbase,
                       mixin.make_request, mixin.select_torrents):
     provides = {'cli'}
 
-    async def make_tracker_list(self, torfilter, trkfilter, sort, columns):
+    async def make_tracker_list(self, torfilter, trkfilter, sort, columns, format):
         response = await self.make_request(
             objects.srvapi.torrent.torrents(torfilter, keys=('name', 'trackers')),
             quiet=True)
@@ -48,8 +49,12 @@ class ListTrackersCmd(base.ListTrackersCmdbase,
         sort.apply(trklist, inplace=True)
 
         if trklist:
-            from ...views.tracker import COLUMNS as TRACKER_COLUMNS
-            print_table(trklist, columns, TRACKER_COLUMNS)
+            if format is None:
+                from ...views.tracker import COLUMNS as TRACKER_COLUMNS
+                print_table(trklist, columns, TRACKER_COLUMNS)
+            else:
+                from ...client import TorrentTracker
+                print_records(trklist, TorrentTracker.TYPES, format)
         else:
             def filter_is_relevant(f):
                 return f and str(f) != 'all'
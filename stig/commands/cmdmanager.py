@@ -11,12 +11,13 @@
 
 import asyncio
 import shlex
-from collections import abc
+from collections import abc, deque
 from contextlib import contextmanager
 from importlib import import_module
 from inspect import getmembers
 
-from . import OPS_AND, OPS_OR, OPS_SEQ, _CommandBase, utils
+from ..client.priority import Priority, request_priority
+from . import OPS_AND, OPS_OR, OPS_PAR, OPS_SEQ, _CommandBase, utils
 from .cmdbase import CommandMeta
 from .cmderror import CmdError, CmdNotFoundError
 
@@ -25,14 +26,24 @@ log = make_logger(__name__)
 
 
 class CommandManager():
-    def __init__(self, pre_run_hook=None, info_handler=None, error_handler=None):
+    def __init__(self, pre_run_hook=None, info_handler=None, error_handler=None, concurrency=10):
         self._info_handler = info_handler
         self._error_handler = error_handler
         self.pre_run_hook = pre_run_hook
+        self.concurrency = concurrency
         self._cmds = {}
         self._active_interface = None
         self._ignored_calls = []
 
+    @property
+    def concurrency(self):
+        """Maximum number of commands that are combined with OPS_PAR and run at the same time"""
+        return self._concurrency
+
+    @concurrency.setter
+    def concurrency(self, concurrency):
+        self._concurrency = max(1, int(concurrency))
+
     @property
     def info_handler(self):
         return self._info_handler
@@ -202,20 +213,28 @@ class CommandManager():
         log.debug('Running command chain synchronously: %r', commands)
         if not commands:
             return True  # No commands - no error
-        for process in self._yield_from_cmdchain(commands, **kwargs):
+        processes = self._yield_from_cmdchain(commands, **kwargs)
+        while True:
+            try:
+                process = next(processes)
+            except StopIteration as e:
+                return e.value
             if not process.finished:
                 process.wait_sync()
-        return self._handle_final_process(process)
 
     async def run_async(self, commands, **kwargs):
         """Same as `run_sync` but in asynchronous contexts"""
         log.debug('Running command chain asynchronously: %r', commands)
         if not commands:
             return True  # No commands - no error
-        for process in self._yield_from_cmdchain(commands, **kwargs):
+        processes = self._yield_from_cmdchain(commands, **kwargs)
+        while True:
+            try:
+                process = next(processes)
+            except StopIteration as e:
+                return e.value
             if not process.finished:
                 await process.wait_async()
-        return self._handle_final_process(process)
 
     def run_ignored_calls_sync(self, cmdname=None):
         """
@@ -254,26 +273,71 @@ class CommandManager():
         return asyncio.ensure_future(self.run_async(commands, **kwargs))
 
     def _yield_from_cmdchain(self, commands, **kwargs):
+        # Yield command instances that must be finished before the next
+        # iteration and return whether the command chain succeeded
         try:
             cmdchain = self.split_cmdchain(commands)
         except ValueError as e:
-            yield self._dummy_process(cmdname=None, exception=CmdError(e))
-        else:
-            prev_process_success = True
-            for item in cmdchain:
-                if item in OPS_AND and not prev_process_success:
-                    log.debug('Found operator %s and previous command failed (%r) - aborting', item, prev_process_success)
-                    break
-                elif item in OPS_OR and prev_process_success:
-                    log.debug('Found operator %s and previous command succeeded (%r) - aborting', item, prev_process_success)
-                    break
-                elif utils.is_op(item):
-                    continue
-                else:
-                    process = self._create_process(item, **kwargs)
-                    yield process
-                    assert process.finished, 'Not finished: %r' % process
-                    prev_process_success = process.success
+            process = self._dummy_process(cmdname=None, exception=CmdError(e))
+            yield process
+            return self._handle_final_process(process)
+
+        success = True
+        for op, cmdlines in self._split_cmdgroups(cmdchain):
+            if op in OPS_AND and not success:
+                log.debug('Found operator %s and previous command failed (%r) - aborting', op, success)
+                break
+            elif op in OPS_OR and success:
+                log.debug('Found operator %s and previous command succeeded (%r) - aborting', op, success)
+                break
+            else:
+                success = yield from self._yield_from_cmdgroup(cmdlines, **kwargs)
+        return success
+
+    @staticmethod
+    def _split_cmdgroups(cmdchain):
+        # Yield (operator, command lines) tuples; command lines that are
+        # combined with OPS_PAR are in the same group
+        op = None
+        cmdlines = []
+        prev_item = None
+        for item in cmdchain:
+            if item in OPS_PAR:
+                pass
+            elif utils.is_op(item):
+                yield op, cmdlines
+                op, cmdlines = item, []
+            elif cmdlines and prev_item not in OPS_PAR:
+                # Command lines without operator between them run in sequence
+                yield op, cmdlines
+                op, cmdlines = OPS_SEQ[0], [item]
+            else:
+                cmdlines.append(item)
+            prev_item = item
+        yield op, cmdlines
+
+    def _yield_from_cmdgroup(self, cmdlines, **kwargs):
+        # Start up to `concurrency` commands before yielding the first one
+        running = deque()
+        success = True
+
+        def next_process():
+            nonlocal success
+            process = running.popleft()
+            yield process
+            assert process.finished, 'Not finished: %r' % process
+            success = self._handle_final_process(process) and success
+
+        for cmdline in cmdlines:
+            if len(running) >= self._concurrency:
+                yield from next_process()
+            # Requests made by commands are more important than polling
+            # requests; the command's task inherits the priority
+            with request_priority(Priority.INTERACTIVE):
+                running.append(self._create_process(cmdline, **kwargs))
+        while running:
+            yield from next_process()
+        return success
 
     def split_cmdchain(self, commands):
         """
@@ -285,7 +349,7 @@ class CommandManager():
         arguments.  Sub-sequences must be separated by single operators.
 
         Command operators are characters specified by the variables OPS_AND,
-        OPS_OR and OPS_SEQ.  In a string, they must be enclosed by spaces
+        OPS_OR, OPS_SEQ and OPS_PAR.  In a string, they must be enclosed by spaces
         (e.g. " & ").
 
         Example:
@@ -319,6 +383,11 @@ class CommandManager():
                         cmdchain.append(cmd)
                     cmdchain.append(OPS_AND[0])
                     cmd = []
+                elif arg in OPS_PAR:
+                    if cmd:
+                        cmdchain.append(cmd)
+                    cmdchain.append(OPS_PAR[0])
+                    cmd = []
                 else:
                     cmd.append(arg)
             if cmd:
@@ -48,7 +48,7 @@ class SetCmd(base.SetCmdbase,
              mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_setting_list(self, sort, columns):
+    def make_setting_list(self, sort, columns, format):
         from ...tui.views import SettingListWidget
         self.create_list_widget(SettingListWidget, theme_name='settinglist',
                                 sort=sort, columns=columns)
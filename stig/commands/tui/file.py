@@ -19,7 +19,7 @@ class ListFilesCmd(base.ListFilesCmdbase,
                    mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_file_list(self, tfilter, ffilter, columns):
+    def make_file_list(self, tfilter, ffilter, columns, format):
         from ...tui.views import FileListWidget
         self.create_list_widget(FileListWidget, theme_name='filelist',
                                 tfilter=tfilter, ffilter=ffilter,
@@ -15,6 +15,7 @@ import os
 from ... import objects
 from ...completion import candidates
 from ...utils.cliparser import Arg
+from .. import CmdError, CommandMeta
 from ..base import torrent as base
 from . import _mixin as mixin
 from ._common import make_tab_title_widget
@@ -46,11 +47,77 @@ class AddTorrentsCmd(base.AddTorrentsCmdbase,
                                   glob=r'*.torrent')
 
 
+class WatchTorrentsCmd(base.WatchTorrentsCmdbase,
+                       mixin.polling_frenzy):
+    provides = {'tui'}
+
+    # Map absolute directory paths to WatchDir instances that run in the background
+    watchers = {}
+
+    make_path_absolute = staticmethod(AddTorrentsCmd.make_path_absolute)
+
+    async def watch(self, watchers):
+        for watcher in watchers:
+            # Options may have changed
+            old_watcher = self.watchers.pop(watcher.directory, None)
+            if old_watcher is not None:
+                await old_watcher.stop()
+            watcher.on_stopped(self._forget_watcher, autoremove=False)
+            watcher.start()
+            self.watchers[watcher.directory] = watcher
+            self.info('Watching %s' % (watcher.directory,))
+
+    @classmethod
+    def _forget_watcher(cls, watcher):
+        # Watcher stopped by itself (e.g. because its directory was removed)
+        if cls.watchers.get(watcher.directory) is watcher:
+            del cls.watchers[watcher.directory]
+
+    @classmethod
+    def completion_candidates_posargs(cls, args):
+        """Complete positional arguments"""
+        return candidates.fs_path(args.curarg.before_cursor,
+                                  base=os.environ.get('HOME', '.'),
+                                  directories_only=True)
+
+
+class UnwatchTorrentsCmd(metaclass=CommandMeta):
+    name = 'unwatch'
+    provides = {'tui'}
+    category = 'torrent'
+    description = 'Stop watching directories for torrent files'
+    usage = ('unwatch',
+             'unwatch <DIRECTORY> <DIRECTORY> ...')
+    examples = ('unwatch ~/torrents',)
+    argspecs = (
+        {'names': ('DIRECTORY',), 'nargs': '*',
+         'description': 'Path to watched directory (defaults to all watched directories)'},
+    )
+
+    async def run(self, DIRECTORY):
+        watchers = WatchTorrentsCmd.watchers
+        if DIRECTORY:
+            directories = [WatchTorrentsCmd.make_path_absolute(directory) for directory in DIRECTORY]
+        else:
+            directories = list(watchers)
+        for directory in directories:
+            watcher = watchers.pop(directory, None)
+            if watcher is None:
+                raise CmdError('Not watched: %s' % (directory,))
+            await watcher.stop()
+            self.info('Stopped watching %s' % (directory,))
+
+    @classmethod
+    def completion_candidates_posargs(cls, args):
+        """Complete positional arguments"""
+        return candidates.Candidates(WatchTorrentsCmd.watchers, label='Watched Directories')
+
+
 class TorrentDetailsCmd(base.TorrentDetailsCmdbase,
                         mixin.select_torrents, mixin.make_request):
     provides = {'tui'}
 
-    async def display_details(self, torrent_id):
+    async def display_details(self, torrent_id, format):
         make_titlew = functools.partial(make_tab_title_widget,
                                         attr_unfocused='tabs.torrentdetails.unfocused',
                                         attr_focused='tabs.torrentdetails.focused')
@@ -80,7 +147,7 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
                       mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_torrent_list(self, tfilter, sort, columns):
+    def make_torrent_list(self, tfilter, sort, columns, format):
         from ...tui.views import TorrentListWidget
         self.create_list_widget(TorrentListWidget, theme_name='torrentlist',
                                 tfilter=tfilter, sort=sort, columns=columns,
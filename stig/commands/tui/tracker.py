@@ -19,7 +19,7 @@ class ListTrackersCmd(base.ListTrackersCmdbase,
                       mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_tracker_list(self, torfilter, trkfilter, sort, columns):
+    def make_tracker_list(self, torfilter, trkfilter, sort, columns, format):
         from ...tui.views import TrackerListWidget
         self.create_list_widget(TrackerListWidget, theme_name='trackerlist',
                                 torfilter=torfilter, trkfilter=trkfilter,
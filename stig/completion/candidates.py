@@ -151,6 +151,12 @@ def column_names(list_type):
                       label=_utils.columns_labels[list_type])
 
 
+def output_formats():
+    """Arguments for the '--format' option of list commands"""
+    from ..commands.base._common import OUTPUT_FORMATS
+    return Candidates(OUTPUT_FORMATS, label='Output Format')
+
+
 def tab_titles():
     """Titles (strings) of TUI tabs"""
     from ..tui.tuiobjects import tabs
@@ -222,7 +222,7 @@ class HelpManager():
 
     @property
     def topic_commandsmanual(self):
-        from .commands import OPS_AND, OPS_OR, OPS_SEQ
+        from .commands import OPS_AND, OPS_OR, OPS_PAR, OPS_SEQ
         lines = [
             'COMMANDS',
             '\tCommands can be called:',
@@ -240,6 +240,8 @@ class HelpManager():
             "\t\t%s \t- \tRun the next command if the previous command succeeded." % '/'.join(OPS_AND),
             "\t\t%s \t- \tRun the next command if the previous command failed." % '/'.join(OPS_OR),
             "\t\t%s \t- \tRun the next command in any case." % '/'.join(OPS_SEQ),
+            ("\t\t%s \t- \tRun the next command at the same time as the previous command.  "
+             "Commands combined this way succeed if all of them succeed." % '/'.join(OPS_PAR)),
             "",
             "\tCommand operators must be enclosed by spaces.",
             "",
@@ -248,6 +250,10 @@ class HelpManager():
              "However, 'ls foo | ls bar' would list 'bar' torrents only if there "
              "are no 'foo' torrents."),
             '',
+            ("\tFor example, 'start foo , stop bar & ls' would start 'foo' torrents "
+             "and stop 'bar' torrents simultaneously and list all torrents if both "
+             "commands succeeded."),
+            '',
             'GUESSING THE USER INTERFACE (CLI/TUI)',
             ("\tIf commands are given as command line arguments and neither "
              "'--tui' nor '--notui' are provided, {__appname__} tries to guess "
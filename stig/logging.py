@@ -9,6 +9,7 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import contextlib
 import logging
 import sys
 
@@ -78,6 +79,27 @@ def redirect_level(level, stream=sys.stderr):
     root_logger.addHandler(lvlhandler)
 
 
+@contextlib.contextmanager
+def redirect_output(stdout, stderr):
+    """
+    Temporarily replace `sys.stdout` and `sys.stderr`
+
+    Log handlers that write to `sys.stdout` or `sys.stderr` write to `stdout` or
+    `stderr` instead.
+    """
+    streams = {id(sys.stdout): stdout, id(sys.stderr): stderr}
+    handlers = [(h, h.stream) for h in logging.getLogger().handlers
+                if isinstance(h, logging.StreamHandler) and id(h.stream) in streams]
+    for handler,stream in handlers:
+        handler.setStream(streams[id(stream)])
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            yield
+    finally:
+        for handler,stream in handlers:
+            handler.setStream(stream)
+
+
 def start_profiling(func, filepath, statistical=True):
     import pprofile
     if statistical:
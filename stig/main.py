@@ -53,7 +53,7 @@ def run():
     # Decide if we run as a TUI or CLI
     if cliargs['tui']:
         cmdmgr.active_interface = 'tui'
-    elif cliargs['notui']:
+    elif cliargs['notui'] or cliargs['server'] or cliargs['batch']:
         cmdmgr.active_interface = 'cli'
     else:
         try:
@@ -86,7 +86,30 @@ def run():
     exit_code = 0
 
     # Run commands either in CLI or TUI mode
-    if cmdmgr.active_interface == 'cli':
+    if cliargs['server']:
+        from . import server
+        if not run_commands():
+            exit_code = 1
+        else:
+            try:
+                server.serve(cliargs['socket'] or server.DEFAULT_SOCKET)
+            except (RuntimeError, OSError) as e:
+                log.error(e)
+                exit_code = 1
+
+    elif cliargs['batch']:
+        import signal
+
+        from . import batch
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+        try:
+            if not run_commands() or not batch.run_sync(cmdmgr, sys.stdin, jobs=cliargs['jobs']):
+                exit_code = 1
+        except KeyboardInterrupt:
+            log.debug('Caught SIGINT')
+
+    elif cmdmgr.active_interface == 'cli':
         # Exit when pipe is closed (e.g. `stig help | head -1`)
         import signal
         signal.signal(signal.SIGPIPE, signal.SIG_DFL)
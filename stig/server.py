@@ -0,0 +1,320 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""
+Run CLI commands in a long-running process
+
+`stig --server` keeps the connection to the daemon and all caches and listens
+on a Unix socket.  Other `stig` invocations send their arguments to that socket
+and print what the server sends back instead of starting from scratch.
+
+Client and server exchange JSON objects, one per line.  The client sends one
+request with the keys "argv", "cwd", "columns" and "lines".  The server
+answers with any number of {"fd": 1 or 2, "data": "..."} objects followed by
+{"exit": <exit code>} or with {"fallback": true} if the client must run the
+command itself (e.g. because it wants the TUI).
+
+This module is imported by every `stig` invocation and must not import
+anything expensive at module level.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+
+from . import __appname__
+from .logging import redirect_output
+
+from .logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+
+def _get_default_socket_path():
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, '%s.socket' % (__appname__,))
+    else:
+        return os.path.join(tempfile.gettempdir(), '%s-%d.socket' % (__appname__, os.getuid()))
+
+DEFAULT_SOCKET = _get_default_socket_path()
+
+# CLI options that change how the process is set up; the server can't honor them
+_LOCAL_OPTIONS = ('tui', 'rcfile', 'norcfile', 'debug', 'debug_file', 'profile_file', 'server',
+                  'batch')
+
+# Commands that run until interrupted; they would block all other clients
+_LOCAL_COMMANDS = ('watch',)
+
+
+def _get_socket_path(argv):
+    # Remove leading "--socket FILE" or "--socket=FILE" from `argv`
+    if argv and argv[0] == '--socket' and len(argv) >= 2:
+        return argv[1], argv[2:]
+    elif argv and argv[0].startswith('--socket='):
+        return argv[0][len('--socket='):], argv[1:]
+    return DEFAULT_SOCKET, argv
+
+
+def _is_own_socket(path):
+    # Only talk to a socket that was created by us and that nobody else can
+    # connect to; anyone could have created a socket in a shared directory
+    import stat
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode):
+        log.debug('Not a socket: %s', path)
+        return False
+    elif st.st_uid != os.getuid():
+        log.debug('Socket is owned by UID %d: %s', st.st_uid, path)
+        return False
+    elif st.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        log.debug('Socket is accessible by other users: %s', path)
+        return False
+    return True
+
+
+def forward(argv):
+    """
+    Run command line `argv` in a server process
+
+    Return the exit code of the commands or `None` if no server is running, if
+    the socket isn't exclusively ours or if the server refused to run `argv`.
+    """
+    import socket
+    path, argv = _get_socket_path(list(argv))
+    if not argv or not _is_own_socket(path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+
+    from shutil import get_terminal_size
+    termsize = get_terminal_size(fallback=(None, None))
+    request = {'argv': argv, 'cwd': os.getcwd(),
+               'columns': termsize.columns, 'lines': termsize.lines}
+
+    # Exit when pipe is closed (e.g. `stig ls | head -1`)
+    import signal
+    signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+    with sock, sock.makefile('r', encoding='utf-8') as responses:
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        streams = {1: sys.stdout, 2: sys.stderr}
+        for line in responses:
+            response = json.loads(line)
+            if 'data' in response:
+                stream = streams[response['fd']]
+                stream.write(response['data'])
+                stream.flush()
+            elif 'exit' in response:
+                return response['exit']
+            elif response.get('fallback'):
+                return None
+
+    print('Lost connection to server: %s' % (path,), file=sys.stderr)
+    return 1
+
+
+class _Output():
+    """Writable text stream that sends everything to a client"""
+
+    encoding = 'utf-8'
+
+    def __init__(self, writer, fd, bufsize=65536):
+        self._writer = writer
+        self._fd = fd
+        self._bufsize = bufsize
+        self._buffer = []
+        self._buffered = 0
+
+    def write(self, string):
+        self._buffer.append(string)
+        self._buffered += len(string)
+        if self._buffered >= self._bufsize:
+            self.flush()
+        return len(string)
+
+    def flush(self):
+        if self._buffer:
+            data = ''.join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            self._writer.write(json.dumps({'fd': self._fd, 'data': data}).encode('utf-8') + b'\n')
+
+    def isatty(self):
+        return False
+
+
+class Server():
+    """
+    Run command lines from clients connected to a Unix socket
+
+    Commands run one after another because they share the process's stdout,
+    stderr, working directory and terminal size.
+
+    path: Path of the Unix socket
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        import asyncio
+        self.path = path
+        self._lock = asyncio.Lock()
+        self._server = None
+
+    async def start(self):
+        """Remove stale socket and start listening"""
+        import asyncio
+        import socket
+        if os.path.exists(self.path):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                log.debug('Removing stale socket: %s', self.path)
+                os.unlink(self.path)
+            else:
+                raise RuntimeError('Server is already running: %s' % (self.path,))
+            finally:
+                sock.close()
+
+        # Only the owner may connect
+        old_umask = os.umask(0o077)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+        finally:
+            os.umask(old_umask)
+        log.debug('Listening on %s', self.path)
+
+    async def stop(self):
+        """Stop listening and remove socket"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    async def _handle_client(self, reader, writer):
+        import asyncio
+        try:
+            request = json.loads(await reader.readline())
+
+            # Clients don't send anything after their request, so EOF means
+            # they are gone (e.g. Ctrl-C) and nobody wants the commands' output
+            run_task = asyncio.ensure_future(self._run_exclusively(request, writer))
+            eof_task = asyncio.ensure_future(reader.read())
+            await asyncio.wait((run_task, eof_task), return_when=asyncio.FIRST_COMPLETED)
+            if not run_task.done():
+                log.debug('Client disconnected, cancelling: %r', request['argv'])
+                run_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await run_task
+                return
+            eof_task.cancel()
+            response = run_task.result()
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            await writer.drain()
+        except (ValueError, KeyError, ConnectionError) as e:
+            log.debug('Invalid request or lost client: %r', e)
+        finally:
+            writer.close()
+
+    async def _run_exclusively(self, request, writer):
+        async with self._lock:
+            return await self._run(request, writer)
+
+    async def _run(self, request, writer):
+        from . import cliopts
+        from .commands import CmdError
+        from .commands.guess_ui import UIGuessError, guess_ui
+        from .objects import cmdmgr
+
+        argv = request['argv']
+        try:
+            cliargs, clicmds = cliopts.parse(argv)
+            if any(cliargs[name] for name in _LOCAL_OPTIONS) or \
+               _has_local_command(clicmds, cmdmgr) or \
+               guess_ui(clicmds, cmdmgr) != 'cli':
+                return {'fallback': True}
+        except (SystemExit, UIGuessError, CmdError):
+            # Let the client report errors
+            return {'fallback': True}
+
+        log.debug('Running for client: %r', argv)
+        stdout = _Output(writer, 1)
+        stderr = _Output(writer, 2)
+        with redirect_output(stdout, stderr), \
+             _terminal_size(request['columns'], request['lines']), \
+             _working_directory(request['cwd']):
+            try:
+                success = await cmdmgr.run_async(clicmds)
+            except Exception as e:
+                log.exception(e)
+                success = False
+            stdout.flush()
+            stderr.flush()
+        return {'exit': 0 if success is not False else 1}
+
+
+def _has_local_command(clicmds, cmdmgr):
+    from .commands import is_op
+    for cmdline in cmdmgr.split_cmdchain(clicmds):
+        if not is_op(cmdline):
+            cmdcls = cmdmgr.get_cmdcls(cmdline[0], interface='cli')
+            if cmdcls is not None and cmdcls.name in _LOCAL_COMMANDS:
+                return True
+    return False
+
+@contextlib.contextmanager
+def _terminal_size(columns, lines):
+    from .commands.cli._table import TERMSIZE
+    orig = (TERMSIZE.columns, TERMSIZE.lines)
+    TERMSIZE.columns, TERMSIZE.lines = columns, lines
+    try:
+        yield
+    finally:
+        TERMSIZE.columns, TERMSIZE.lines = orig
+
+@contextlib.contextmanager
+def _working_directory(path):
+    orig = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(orig)
+
+
+def serve(path=DEFAULT_SOCKET):
+    """Run server until SIGINT or SIGTERM"""
+    import asyncio
+    import signal
+    loop = asyncio.get_event_loop()
+    server = Server(path)
+    loop.run_until_complete(server.start())
+
+    stopped = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+    try:
+        loop.run_until_complete(stopped.wait())
+    finally:
+        loop.run_until_complete(server.stop())
@@ -123,6 +123,13 @@ def init_defaults(localcfg):
                  setter=lambda v: setattr(objects.srvapi.rpc, 'timeout', v),
                  default=10,
                  description='Number of seconds before connecting to Transmission RPC interface fails')
+    localcfg.add('connect.preempt',
+                 Bool.partial(),
+                 getter=lambda: objects.srvapi.rpc.preempt,
+                 setter=lambda v: setattr(objects.srvapi.rpc, 'preempt', v),
+                 default='off',
+                 description=('Whether commands cancel any ongoing background request '
+                              '(e.g. torrent list updates) instead of waiting for it'))
     localcfg.add('connect.tls',
                  Bool.partial(),
                  getter=lambda: objects.srvapi.rpc.tls,
@@ -142,6 +149,48 @@ def init_defaults(localcfg):
                  default='',
                  description='SOCKS5, SOCKS4 or HTTP proxy URL to tunnel RPC communication through')
 
+    localcfg.add('bulk.chunk-size',
+                 Int.partial(min=0, prefix='none'),
+                 getter=lambda: objects.srvapi.torrent.chunk_size,
+                 setter=lambda v: setattr(objects.srvapi.torrent, 'chunk_size', v),
+                 default=1000,
+                 description=('Maximum number of torrents per request when starting, stopping, '
+                              'removing, etc many torrents (0 for no limit)'))
+    localcfg.add('bulk.concurrency',
+                 Int.partial(min=1, prefix='none'),
+                 getter=lambda: objects.srvapi.torrent.concurrency,
+                 setter=lambda v: setattr(objects.srvapi.torrent, 'concurrency', v),
+                 default=10,
+                 description='Maximum number of requests that are queued at the same time for many torrents')
+    localcfg.add('bulk.retries',
+                 Int.partial(min=0, prefix='none'),
+                 getter=lambda: objects.srvapi.torrent.retries,
+                 setter=lambda v: setattr(objects.srvapi.torrent, 'retries', v),
+                 default=2,
+                 description='How often to repeat requests for many torrents after a timeout or connection error')
+    localcfg.add('bulk.retry-delay',
+                 Float.partial(min=0),
+                 getter=lambda: objects.srvapi.torrent.retry_delay,
+                 setter=lambda v: setattr(objects.srvapi.torrent, 'retry_delay', v),
+                 default=1,
+                 description=('Seconds to wait before repeating a failed request for many torrents '
+                              '(doubled for each further repetition)'))
+
+    localcfg.add('watch.interval',
+                 Float.partial(min=0.1),
+                 default=10,
+                 description=('Interval in seconds between scans of watched directories '
+                              '(changes are noticed immediately if inotify is available)'))
+    localcfg.add('watch.settle',
+                 Float.partial(min=0),
+                 default=2,
+                 description=('Number of seconds a torrent file in a watched directory '
+                              'must stay unchanged before it is added'))
+    localcfg.add('watch.batch-size',
+                 Int.partial(min=1, prefix='none'),
+                 default=100,
+                 description='Maximum number of torrent files from a watched directory that are added at once')
+
     localcfg.add('columns.torrents',
                  Tuple.partial(options=torrent.COLUMNS, aliases=torrent.ALIASES),
                  default=('marked', 'size', 'downloaded', 'uploaded', 'ratio',
@@ -203,6 +252,11 @@ def init_defaults(localcfg):
                  Int.partial(min=0),
                  default=10000,
                  description='Maximum number of lines to keep in history files')
+    localcfg.add('tui.files.collapse',
+                 Int.partial(min=0),
+                 default=1000,
+                 description=('Initially collapse directories with more files than this '
+                              'in file lists (0 to expand all directories)'))
     localcfg.add('tui.free-space.low',
                  Bytes.partial(min=0),
                  default='10GB',
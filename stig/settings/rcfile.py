@@ -19,21 +19,17 @@ log = make_logger(__name__)
 
 
 def _unescape_linebreaks(lines):
-    unescaped = []
-    append_next = False
+    # Join lines that end with "\" with the next line; this is a generator so
+    # it can be used on streams (see batch.py)
+    continued = ''
     for line in lines:
-        if append_next:
-            unescaped[-1] += line
+        if line[-1:] == '\\':
+            continued += line[:-1]
         else:
-            unescaped.append(line)
-
-        if unescaped[-1][-1] == '\\':
-            unescaped[-1] = unescaped[-1][:-1]
-            append_next = True
-        else:
-            append_next = False
-
-    return unescaped
+            yield continued + line
+            continued = ''
+    if continued:
+        yield continued
 
 
 class RcFileError(Exception):
@@ -59,4 +55,4 @@ def read(filepath=DEFAULT_RCFILE):
     except PermissionError:
         raise RcFileError('No read permission for rc file: {}'.format(string.tildify(filepath)))
 
-    return _unescape_linebreaks(cmdstrs)
+    return list(_unescape_linebreaks(cmdstrs))
@@ -12,6 +12,7 @@
 import os
 from functools import partial
 
+from ..client import rdns
 from ..objects import localcfg, srvapi
 from . import tuiobjects
 from .views.file import TUICOLUMNS as FILE_COLUMNS
@@ -62,6 +63,12 @@ localcfg.on_change(_refresh_lists, name='unitprefix.size')
 localcfg.on_change(_refresh_lists, name='reverse-dns')
 
 
+def _set_files_collapse_threshold(settings, name, value):
+    FileListWidget.collapse_threshold = int(value)
+localcfg.on_change(_set_files_collapse_threshold, name='tui.files.collapse', autoremove=False)
+_set_files_collapse_threshold(localcfg, name='tui.files.collapse', value=localcfg['tui.files.collapse'])
+
+
 def _set_poll_interval(settings, name, value):
     srvapi.interval = value
 localcfg.on_change(_set_poll_interval, name='tui.poll')
@@ -109,3 +116,9 @@ _set_tui_marked_char('set_unmarked_char', localcfg, name='tui.marked.off', value
 def _update_quickhelp(keymap):
     tuiobjects.topbar.help.update()
 tuiobjects.keymap.on_bind_unbind(_update_quickhelp)
+
+
+def _redraw_resolved_hostnames():
+    # Host cells are updated by rdns callbacks outside of any list update
+    tuiobjects.urwidloop.draw_screen()
+rdns.resolver.on_resolved(_redraw_resolved_hostnames)
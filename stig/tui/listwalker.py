@@ -0,0 +1,195 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+from collections import OrderedDict
+
+import urwid
+
+from ..logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+
+class VirtualListWalker(urwid.ListWalker):
+    """
+    List walker that only creates widgets for items that are displayed
+
+    Items are identified by hashable IDs.  Only the IDs are stored in display
+    order.  Widgets are created when urwid asks for them (e.g. for rendering the
+    visible part of a ListBox) and are re-used for other items when they are
+    no longer needed.
+
+    make_widget: Callable that gets an item ID and returns a new widget
+    update_widget: Callable that gets a widget and an item ID and makes the
+                   widget display that item
+    cache_size: Maximum number of widgets to keep
+    """
+
+    def __init__(self, make_widget, update_widget, cache_size=100):
+        self._make_widget = make_widget
+        self._update_widget = update_widget
+        self._cache_size = max(1, int(cache_size))
+        self._ids = []
+        self._positions = {}
+        self._widgets = OrderedDict()  # Item ID -> widget in least recently used order
+        self._unused = []              # Widgets that can be given to any item
+        self.focus = 0
+        self._stats = {'created': 0, 'recycled': 0}
+
+    @property
+    def ids(self):
+        """Item IDs in display order"""
+        return tuple(self._ids)
+
+    def set_ids(self, ids):
+        """
+        Replace listed items
+
+        ids: Sequence of item IDs in display order
+
+        Widgets of items that are not in `ids` are kept for re-use.
+        """
+        ids = list(ids)
+        if ids == self._ids:
+            return
+        self._ids = ids
+        self._positions = {id: pos for pos,id in enumerate(ids)}
+
+        positions = self._positions
+        widgets = self._widgets
+        for id in tuple(widgets):
+            if id not in positions:
+                self._unused.append(widgets.pop(id))
+
+        if self.focus >= len(ids):
+            self.focus = max(0, len(ids) - 1)
+        self._modified()
+
+    @property
+    def focus_id(self):
+        """ID of the focused item or `None` if there are no items"""
+        if self._ids:
+            return self._ids[self.focus]
+
+    def position_of(self, id):
+        """Return position of item with ID `id` or `None` if it is not listed"""
+        return self._positions.get(id)
+
+    def widgets(self):
+        """Yield (item ID, widget) tuples of all items that currently have a widget"""
+        yield from tuple(self._widgets.items())
+
+    def cached_widget(self, id):
+        """Return the widget of item `id` or `None` if it doesn't have one"""
+        return self._widgets.get(id)
+
+    def clear(self):
+        """Remove all items and forget all widgets"""
+        self._ids = []
+        self._positions = {}
+        self._widgets.clear()
+        self._unused.clear()
+        self.focus = 0
+        self._modified()
+
+    @property
+    def cache_size(self):
+        """Maximum number of widgets to keep"""
+        return self._cache_size
+
+    @cache_size.setter
+    def cache_size(self, cache_size):
+        self._cache_size = max(1, int(cache_size))
+        widgets = self._widgets
+        while len(widgets) > self._cache_size:
+            _, widget = widgets.popitem(last=False)
+            self._unused.append(widget)
+
+    @property
+    def stats(self):
+        """
+        Dictionary with the keys "created", "recycled" and "cached"
+
+        created: Number of widgets created
+        recycled: Number of times a widget was re-used for a different item
+        cached: Number of items that currently have a widget
+        """
+        return {**self._stats, 'cached': len(self._widgets)}
+
+    def _get_widget(self, id):
+        widgets = self._widgets
+        widget = widgets.get(id)
+        if widget is not None:
+            widgets.move_to_end(id)
+            return widget
+
+        if self._unused:
+            widget = self._unused.pop()
+        elif len(widgets) >= self._cache_size:
+            _, widget = widgets.popitem(last=False)
+        if widget is None:
+            widget = self._make_widget(id)
+            self._stats['created'] += 1
+        else:
+            self._update_widget(widget, id)
+            self._stats['recycled'] += 1
+        widgets[id] = widget
+        return widget
+
+    def __getitem__(self, position):
+        if not isinstance(position, int) or not 0 <= position < len(self._ids):
+            raise IndexError(position)
+        return self._get_widget(self._ids[position])
+
+    def __len__(self):
+        return len(self._ids)
+
+    def set_focus(self, position):
+        if not 0 <= position < len(self._ids):
+            raise IndexError('No widget at position %r' % (position,))
+        self.focus = position
+        self._modified()
+
+    def next_position(self, position):
+        if position >= len(self._ids) - 1:
+            raise IndexError(position)
+        return position + 1
+
+    def prev_position(self, position):
+        if position <= 0:
+            raise IndexError(position)
+        return position - 1
+
+    def positions(self, reverse=False):
+        if reverse:
+            return range(len(self._ids) - 1, -1, -1)
+        return range(len(self._ids))
+
+    def __repr__(self):
+        return '<%s items=%d, %s>' % (
+            type(self).__name__, len(self._ids),
+            ', '.join('%s=%s' % (k, v) for k, v in self.stats.items()))
+
+
+class VirtualListBox(urwid.ListBox):
+    """ListBox that doesn't create widgets for all items above the visible ones"""
+
+    def get_first_visible_pos(self, size, focus=False):
+        # urwid walks through all previous positions to count them, but
+        # VirtualListWalker positions are indexes
+        if not isinstance(self.body, VirtualListWalker):
+            return super().get_first_visible_pos(size, focus)
+        elif not self.body:
+            return 0
+        _, top, _ = self.calculate_visible(size, focus)
+        if top.fill:
+            return top.fill[-1].position
+        else:
+            return self.focus_position
@@ -399,3 +399,20 @@ class MarkedItemsWidget(urwid.WidgetWrap):
 
         if new_text != self._text.text:
             self._text.set_text(new_text)
+
+
+class BulkProgressWidget(urwid.WidgetWrap):
+    def __init__(self):
+        self._text = urwid.Text(('bottombar', EMPTY_TEXT))
+        super().__init__(self._text)
+        objects.srvapi.torrent.on_progress(self._update_progress)
+
+    @redraw_screen
+    def _update_progress(self, progress):
+        if progress.finished:
+            self._text.set_text(('bottombar', EMPTY_TEXT))
+        else:
+            text = [('bottombar', '%s: %d/%d' % (progress.action, progress.done, progress.total))]
+            if progress.failed:
+                text.append(('bottombar.important', ' %d failed' % (progress.failed,)))
+            self._text.set_text(text)
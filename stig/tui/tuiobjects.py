@@ -14,18 +14,20 @@ Application-wide instances for the TUI
 """
 
 import asyncio
+import inspect
 
 import urwid
 
 from .. import objects
+from ..client.priority import Priority, request_priority
 from ..settings.defaults import DEFAULT_KEYMAP
 from . import theme, urwidpatches  # noqa
 from .group import Group
 from .keymap import KeyMap
 from .logger import LogWidget
 from .miscwidgets import (AvailableDiskSpaceWidget, BandwidthStatusWidget,
-                          ConnectionStatusWidget, KeyChainsWidget, MarkedItemsWidget,
-                          QuickHelpWidget, TorrentCountersWidget)
+                          BulkProgressWidget, ConnectionStatusWidget, KeyChainsWidget,
+                          MarkedItemsWidget, QuickHelpWidget, TorrentCountersWidget)
 from .tabs import TabBar, Tabs
 
 from ..logging import make_logger  # isort:skip
@@ -56,7 +58,7 @@ def _create_cli_widget():
     from ..completion import candidates
     from .completer import Completer
 
-    def get_candidates(args):
+    async def get_candidates(args):
         log.debug('Getting candidates for %r', args)
         if args.curarg_index == 0:
             log.debug('Completing command: %r', args[0])
@@ -65,7 +67,12 @@ def _create_cli_widget():
             cmdcls = objects.cmdmgr.get_cmdcls(args[0])
             if cmdcls is not None:
                 log.debug('  Completing argument for %r', cmdcls.__name__)
-                return cmdcls.completion_candidates(args)
+                # Don't make the user wait for polling requests
+                with request_priority(Priority.INTERACTIVE):
+                    cands = cmdcls.completion_candidates(args)
+                    while inspect.isawaitable(cands):
+                        cands = await cands
+                return cands
 
     import os
     history_file = os.path.join(objects.localcfg['tui.cli.history-dir'].full_path, 'commands')
@@ -98,6 +105,7 @@ bottombar.add(name='counters', widget=TorrentCountersWidget(), options='pack')
 bottombar.add(name='_spacer1', widget=urwid.AttrMap(_greedy_spacer(), 'bottombar'))
 bottombar.add(name='diskspace', widget=AvailableDiskSpaceWidget(), options='pack')
 bottombar.add(name='_spacer2', widget=urwid.AttrMap(_greedy_spacer(), 'bottombar'))
+bottombar.add(name='progress', widget=BulkProgressWidget(), options='pack')
 bottombar.add(name='marked', widget=MarkedItemsWidget(), options='pack')
 bottombar.add(name='_spacer3', widget=urwid.AttrMap(_greedy_spacer(), 'bottombar'))
 bottombar.add(name='bandwidth', widget=BandwidthStatusWidget(), options='pack')
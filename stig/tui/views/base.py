@@ -10,14 +10,21 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 import collections
+import itertools
+import logging
 
 import urwid
 
 from ..main import redraw_screen
 from urwid import ScrollBar
+from ...views import ColumnBase
+from ..listwalker import VirtualListBox, VirtualListWalker
 from ..table import ColumnHeaderWidget, Table
 from ..tuiobjects import bottombar
 
+from ...logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
 
 class Style():
     """Map standard attributes to those defined in a urwid palette
@@ -74,30 +81,92 @@ class Style():
         return '.'.join(x for x in (strings) if x)
 
 
+def _cache_value(value):
+    # Lists that are updated in place (e.g. trackers or peers) are the same
+    # object before and after a change, but their revision changes
+    revision = getattr(value, 'revision', None)
+    if revision is None:
+        return value
+    return (id(value), revision)
+
+
 class CellWidgetBase(urwid.WidgetWrap):
-    """Base class for cells in items in Torrent/File/Peer/... lists"""
+    """
+    Base class for cells in items in Torrent/File/Peer/... lists
+
+    If a cell has a `needed_keys` attribute, the values of these keys are
+    remembered and `update` does nothing if they didn't change.  Set
+    `cache_values` to False if the displayed value also depends on something
+    else (e.g. the current time).
+    """
 
     style = collections.defaultdict(lambda: 'default')
     header = urwid.AttrMap(ColumnHeaderWidget(left='', right=''), 'header')
     width = ('weight', 100)
     align = 'right'
+    cache_values = True
+
+    # Column name -> number of updates that were skipped/done (only counted
+    # when debugging)
+    _cache_stats = collections.defaultdict(lambda: {'hits': 0, 'misses': 0})
 
     def __init__(self):
         self.value = None
+        self._cache_key = None
+        self._mode = None
         self.text = urwid.Text('', wrap=self.wrap, align=self.align)
         self.attrmap = urwid.AttrMap(self.text, self.style.attrs('unfocused'))
         return super().__init__(self.attrmap)
 
     def update(self, data):
         self.data = data
-        new_value = self.get_value()
-        new_text = str(new_value)
+        cache_key = self._get_cache_key(data)
+        if cache_key is not None and cache_key == self._cache_key:
+            if log.isEnabledFor(logging.DEBUG):
+                self._cache_stats[self._stats_name()]['hits'] += 1
+            return
+        if log.isEnabledFor(logging.DEBUG):
+            self._cache_stats[self._stats_name()]['misses'] += 1
+        self._cache_key = cache_key
+
+        self.value = self.get_value()
+        new_text = str(self.value)
         if self.text.text != new_text:
-            self.value = new_value
             self.text.set_text(new_text)
-            attr = self.style.attrs(self.get_mode(), focused=False)
+        new_mode = self.get_mode()
+        if new_mode != self._mode:
+            self._mode = new_mode
+            attr = self.style.attrs(new_mode, focused=False)
             self.attrmap.set_attr_map({None: attr})
 
+    def _get_cache_key(self, data):
+        needed_keys = getattr(self, 'needed_keys', None)
+        if self.cache_values and needed_keys:
+            try:
+                # The generation changes when cached values are cleared
+                # (e.g. because the unit of bandwidth values changed)
+                return (ColumnBase.cache_generation,
+                        tuple(_cache_value(data[key]) for key in needed_keys))
+            except KeyError:
+                pass
+
+    @classmethod
+    def _stats_name(cls):
+        return '%s.%s' % (cls.__module__.rsplit('.', 1)[-1], cls.__name__)
+
+    @classmethod
+    def cache_stats(cls):
+        """
+        Map column names to dictionaries with the keys "hits" and "misses"
+
+        hits: Number of updates that were skipped because no value changed
+        misses: Number of updates that changed the displayed value
+
+        Updates are only counted if debugging messages are enabled for this
+        module.
+        """
+        return {name: dict(stats) for name,stats in cls._cache_stats.items()}
+
     def get_mode(self):
         return None
 
@@ -109,6 +178,26 @@ class CellWidgetBase(urwid.WidgetWrap):
             cls.header.base_widget.right = str(right)
 
 
+class ItemProxy():
+    """
+    Stand-in for an item widget that doesn't exist because it isn't displayed
+
+    Properties of `ItemClass` that only use `data` (e.g. `id` or `torrent_id`)
+    are available.
+    """
+
+    def __init__(self, ItemClass, data, is_marked):
+        self._ItemClass = ItemClass
+        self.data = data
+        self.is_marked = is_marked
+
+    def __getattr__(self, name):
+        attr = getattr(self._ItemClass, name, None)
+        if isinstance(attr, property):
+            return attr.fget(self)
+        raise AttributeError('%r has no attribute %r' % (type(self).__name__, name))
+
+
 class ItemWidgetBase(urwid.WidgetWrap):
     """Base class for items in Torrent/File/Peer/... lists"""
 
@@ -167,7 +256,13 @@ class ItemWidgetBase(urwid.WidgetWrap):
 
 
 class ListWidgetBase(urwid.WidgetWrap):
-    """Base class for Torrent/File/Peer/... lists"""
+    """
+    Base class for Torrent/File/Peer/... lists
+
+    Item widgets are only created for items that are displayed (see
+    `VirtualListWalker`).  Everything else (e.g. marking, filtering, sorting)
+    is done with item IDs and the data provided by derived classes.
+    """
 
     # Derived classes must set these class attributes
     tuicolumns      = NotImplemented
@@ -186,10 +281,10 @@ class ListWidgetBase(urwid.WidgetWrap):
             self._ListItemClass = self.ListItemClass
 
         self._data_dict = None
-        self._marked = set()
-
-        self._existing_widgets = set()
-        self._hidden_widgets = set()
+        self._items = {}     # Item ID -> data of all items, including hidden ones
+        self._marked = set()  # Item IDs
+        self._row_ids = itertools.count()
+        self._walker_state = None  # Objects that were used to fill the walker
 
         self._sort = sort
         self._sort_orig = sort
@@ -200,11 +295,9 @@ class ListWidgetBase(urwid.WidgetWrap):
         self._table = Table(**self.tuicolumns)
         self._table.columns = columns or ()
 
-        if self.focusable_items:
-            walker = urwid.SimpleFocusListWalker([])
-        else:
-            walker = urwid.SimpleListWalker([])
-        self._listbox = keymap.wrap(urwid.ListBox, context=self.keymap_context + 'list')(walker)
+        self._walker = VirtualListWalker(make_widget=self._make_item_widget,
+                                         update_widget=self._update_item_widget)
+        self._listbox = keymap.wrap(VirtualListBox, context=self.keymap_context + 'list')(self._walker)
 
         listbox_sb = urwid.AttrMap(
             ScrollBar(urwid.AttrMap(self._listbox, self.palette_name)),
@@ -227,24 +320,22 @@ class ListWidgetBase(urwid.WidgetWrap):
         super()._invalidate()
 
     def render(self, size, focus=False):
-        # Remember focused item widget in case items get added or removed
-        focusedw = self.focused_widget
+        # Remember focused item in case items get added, removed or re-sorted
+        focused_id = self._walker.focus_id
 
         if self._data_dict is not None:
-            self._update_existing_widgets(self._data_dict)
+            self._update_items(self._data_dict)
             self._data_dict = None
 
-        self._hide_or_unhide_widgets()
-        self._sort_widgets()
+        # Keep widgets for the visible rows and one screen above and below
+        self._walker.cache_size = max(1, size[-1]) * 3
+        self._update_walker()
 
         # Ensure focus doesn't change when items get added or removed
-        if focusedw is not None and self.focused_widget is not None and \
-           focusedw.id != self.focused_widget.id:
-            focused_id = focusedw.id
-            for i,w in enumerate(self._listbox.body):
-                if w.id == focused_id:
-                    self._listbox.focus_position = i
-                    break
+        if focused_id is not None:
+            position = self._walker.position_of(focused_id)
+            if position is not None and position != self._walker.focus:
+                self._listbox.focus_position = position
 
         # Update number of marked items in this list
         bottombar.marked.update(len(self._marked))
@@ -253,81 +344,81 @@ class ListWidgetBase(urwid.WidgetWrap):
         # example when the CLI is open
         return super().render(size, focus=True)
 
-    def _update_existing_widgets(self, data_dict):
-        existing_widgets = self._existing_widgets
-        dead_widgets = []
+    def _make_item_widget(self, id):
+        row_id = next(self._row_ids)
+        self._table.register(row_id)
+        widget = self._ListItemClass(self._items[id], self._table.get_row(row_id))
+        widget.is_marked = id in self._marked
+        return widget
+
+    def _update_item_widget(self, widget, id):
+        widget.update(self._items[id])
+        widget.is_marked = id in self._marked
+
+    def _get_item_widget(self, id):
+        # Return widget for item `id` or a stand-in if it isn't displayed
+        widget = self._walker.cached_widget(id)
+        if widget is None:
+            widget = ItemProxy(self.ListItemClass, self._items[id], id in self._marked)
+        return widget
+
+    def _update_items(self, data_dict):
+        self._items = data_dict
+        # Forget marks of items that no longer exist
+        self._marked.intersection_update(data_dict)
+
+        # Items without a widget get their data when a widget is needed
+        for id,w in self._walker.widgets():
+            data = data_dict.get(id)
+            if data is not None:
+                w.update(data)
+
+    def _update_walker(self):
+        # Filtering and sorting is only needed if we got new items or if the
+        # sort order or filter changed (e.g. not when the user is scrolling)
+        state = (self._items, self._sort, self.secondary_filter)
+        prev_state = self._walker_state
+        if prev_state is not None and all(a is b for a,b in zip(state, prev_state)):
+            return
+        self._walker_state = state
+
+        items = self._items
+        hidden_ids = set(self._limit_items(items))
+        ids = [id for id in items if id not in hidden_ids]
 
-        for w in existing_widgets:  # w = *ItemWidget instance
-            id = w.id
-            try:
-                # Update existing *ItemWidget instances with new data
-                w.update(data_dict[id])
-                del data_dict[id]
-            except KeyError:
-                # Item no longer exists in data_dict anymore
-                dead_widgets.append(w)
-
-        # Remove dead *ItemWidget instances
-        walker = self._listbox.body
-        marked = self._marked
-        for w in dead_widgets:
-            if w in walker:
-                walker.remove(w)
-            existing_widgets.remove(w)
-            marked.discard(w)  # self._marked may have a reference too
-
-        # Any items that haven't been used to update an existing *ItemWidget instance are new
-        if data_dict:
-            table = self._table
-            ListItemClass = self._ListItemClass
-            for data_id,data in data_dict.items():
-                table.register(data_id)
-                row = table.get_row(data_id)
-                existing_widgets.add(ListItemClass(data, row))
-
-    def _sort_widgets(self):
-        walker = self._listbox.body
         if self._sort is not None:
             try:
-                self._sort.apply(walker,
-                                 item_getter=lambda w: w.data,
-                                 inplace=True)
+                self._sort.apply(ids, item_getter=items.__getitem__, inplace=True)
             except KeyError:
                 # This happens when adding a new sort order that needs
                 # previously unneeded keys (e.g. "started" needs "time-started",
                 # which is normally not used).  The new request is correctly
                 # registered in client.trequestpool, but when the async RPC
                 # request is made, the asyncio loop yields control to the TUI,
-                # which redraws (i.e. sorts) the list with the old widget.data.
-                # (I couldn't figure out why this redraw happens.)  Ignoring the
+                # which redraws (i.e. sorts) the list with the old data.  (I
+                # couldn't figure out why this redraw happens.)  Ignoring the
                 # KeyError fixes this because as soon as the RPC response gets
                 # through, a new redraw is issued and the new sort exists.
-                pass
+                self._walker_state = None
 
-    def _hide_or_unhide_widgets(self):
-        walker = self._listbox.body
-        existing_widgets = self._existing_widgets
-        hidden_ids = tuple(w.id for w in self._limit_items(existing_widgets))
-        for w in existing_widgets:
-            widget_is_visible = w in walker
-            hide_widget = w.id in hidden_ids
-            if hide_widget and widget_is_visible:
-                walker.remove(w)
-                self._hidden_widgets.add(w)
-            elif not hide_widget and not widget_is_visible:
-                walker.append(w)
+        self._walker.set_ids(ids)
 
         if self.title_updater is not None:
             self.title_updater(self.title, ' [%d]' % self.count)
 
-    def _limit_items(self, existing_widgets):
-        """Iterate over filtered widgets"""
+    def _limit_items(self, items):
+        """
+        Iterate over IDs of hidden items
+
+        items: Mapping of item IDs to data
+        """
         return ()
 
     def clear(self):
         """Remove all list items"""
         self._table.clear()
-        self._listbox.body[:] = ()
+        self._items = {}
+        self._walker.clear()
         self._listbox._invalidate()
         self._marked.clear()
 
@@ -360,13 +451,13 @@ class ListWidgetBase(urwid.WidgetWrap):
     def count(self):
         """Number of listed items"""
         # If this method was called before rendering, the contents of the
-        # listbox widget are inaccurate and we have to use self._data_dict.  But
-        # if we're called after rendering, self._data_dict is reset to None and
-        # we have to count items in the listbox.
+        # walker are inaccurate and we have to use self._data_dict.  But if
+        # we're called after rendering, self._data_dict is reset to None and we
+        # have to count items in the walker.
         if self._data_dict is not None:
             return len(self._data_dict)
         else:
-            return len(self._listbox.body)
+            return len(self._walker)
 
     DEFAULT_TITLE = 'No title'
 
@@ -408,14 +499,12 @@ class ListWidgetBase(urwid.WidgetWrap):
 
     @property
     def marked(self):
-        """Generator that yields ItemWidgetBase descendants"""
+        """Generator that yields ItemWidgetBase descendants or ItemProxy instances"""
         secondary_filter = self.secondary_filter
-        if secondary_filter is None:
-            yield from self._marked
-        else:
-            for widget in self._marked:
-                if secondary_filter.match(widget.data):
-                    yield widget
+        items = self._items
+        for id in tuple(self._marked):
+            if secondary_filter is None or secondary_filter.match(items[id]):
+                yield self._get_item_widget(id)
 
     @property
     def marked_count(self):
@@ -426,19 +515,21 @@ class ListWidgetBase(urwid.WidgetWrap):
         if toggle and self.focused_widget is not None:
             mark = not self.focused_widget.is_marked
 
-        for widget in self._select_items_for_marking(all):
-            widget.is_marked = mark
+        for id in self._select_items_for_marking(all):
             if mark:
-                self._marked.add(widget)
+                self._marked.add(id)
             else:
-                self._marked.discard(widget)
+                self._marked.discard(id)
+            widget = self._walker.cached_widget(id)
+            if widget is not None:
+                widget.is_marked = mark
 
     def _select_items_for_marking(self, all):
         if self.focused_widget is not None:
             if all:
-                yield from self._listbox.body
+                yield from self._walker.ids
             else:
-                yield self.focused_widget
+                yield self.focused_widget.id
 
     def refresh_marks(self):
         """
@@ -446,7 +537,7 @@ class ListWidgetBase(urwid.WidgetWrap):
 
         This shouldn't be needed unless the marked character was changed.
         """
-        for widget in self._listbox.body:
+        for _,widget in self._walker.widgets():
             widget.is_marked = widget.is_marked
 
 
@@ -462,9 +553,9 @@ class ListWidgetBase(urwid.WidgetWrap):
 
     @property
     def items(self):
-        """Yield non-hidden widgets from list"""
-        for item in self._listbox.body:
-            yield item
+        """Yield non-hidden widgets or ItemProxy instances from list"""
+        for id in self._walker.ids:
+            yield self._get_item_widget(id)
 
     @property
     def focused_widget(self):
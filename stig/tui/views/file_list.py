@@ -11,12 +11,11 @@
 
 import builtins
 from collections import abc
-from functools import lru_cache
 
 import urwid
 import urwidtrees
 from natsort import humansorted
-from urwidtrees.decoration import ArrowTree
+from urwidtrees.decoration import ArrowTree, CollapseMixin
 
 from ...client import FileFilter
 from ...views.file import TorrentFileDirectory
@@ -28,17 +27,138 @@ from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
-class FileTreeDecorator(ArrowTree):
+class _FileNode():
+    """Torrent file or directory in a _FileForest"""
+
+    __slots__ = ('data', 'name', 'tree', 'filtered_count', 'children')
+
+    def __init__(self, data, name=None, tree=None, filtered_count=0):
+        self.data = data                      # TorrentFile or TorrentFileDirectory
+        self.name = name                      # Directory name
+        self.tree = tree                      # TorrentFileTree of directory
+        self.filtered_count = filtered_count  # Number of filtered files in directory
+        self.children = None                  # List of _FileNodes when needed
+
+
+class _FileForest(urwidtrees.Tree):
+    """
+    Tree of files and directories of multiple torrents
+
+    Positions are tuples of indexes (see urwidtrees.SimpleTree).  The children
+    of a directory are only created and sorted when they are needed, e.g. when
+    the directory is expanded and scrolled into view.
+    """
+
+    def __init__(self, torrents, file_is_filtered):
+        self._file_is_filtered = file_is_filtered
+        self._filecount = None
+        self._roots = []
+        for t in humansorted(torrents, key=lambda t: t['name']):
+            filetree = t['files']
+            if len(filetree) > 0:
+                rootnodename = next(iter(filetree))
+                content = filetree[rootnodename]
+                if content.nodetype == 'leaf':
+                    # Single-file torrent
+                    if not file_is_filtered(content):
+                        self._roots.append(_FileNode(content))
+                else:
+                    # Torrent with directory structure
+                    # If we don't ignore the topmost node, the torrent itself is
+                    # displayed as a directory.
+                    self._roots.append(self._make_dirnode(rootnodename, content))
+        self.trees = {t['id']: t['files'] for t in torrents}
+        self.root = (0,) if self._roots else None
+
+    def _make_dirnode(self, name, tree):
+        filtered_count = sum(1 for v in tree.values()
+                             if v.nodetype == 'leaf' and self._file_is_filtered(v))
+        return _FileNode(TorrentFileDirectory(name, tree=tree, filtered_count=filtered_count),
+                         name=name, tree=tree, filtered_count=filtered_count)
+
+    def _children(self, node):
+        if node.children is None:
+            children = []
+            if node.tree is not None:
+                for k,v in humansorted(node.tree.items()):
+                    if v.nodetype == 'leaf':
+                        if not self._file_is_filtered(v):
+                            children.append(_FileNode(v))
+                    else:
+                        children.append(self._make_dirnode(k, v))
+            node.children = children
+        return node.children
+
+    def _siblings(self, pos):
+        if len(pos) == 1:
+            return self._roots
+        else:
+            return self._children(self.node(pos[:-1]))
+
+    def node(self, pos):
+        """Return _FileNode at `pos` or raise IndexError"""
+        node = self._roots[pos[0]]
+        for i in pos[1:]:
+            node = self._children(node)[i]
+        return node
+
+    def refresh(self, pos):
+        """Return up-to-date TorrentFile or TorrentFileDirectory at `pos`"""
+        node = self.node(pos)
+        if node.tree is not None:
+            node.data = TorrentFileDirectory(node.name, tree=node.tree,
+                                             filtered_count=node.filtered_count)
+        return node.data
+
+    @property
+    def filecount(self):
+        """Number of listed files"""
+        if self._filecount is None:
+            count = 0
+            for node in self._roots:
+                if node.tree is None:
+                    count += 1
+                else:
+                    count += sum(1 for f in node.tree.files if not self._file_is_filtered(f))
+            self._filecount = count
+        return self._filecount
+
+    def __getitem__(self, pos):
+        return self.node(pos).data
+
+    def parent_position(self, pos):
+        return pos[:-1] or None
+
+    def first_child_position(self, pos):
+        if self._children(self.node(pos)):
+            return pos + (0,)
+
+    def last_child_position(self, pos):
+        children = self._children(self.node(pos))
+        if children:
+            return pos + (len(children) - 1,)
+
+    def next_sibling_position(self, pos):
+        if pos[-1] + 1 < len(self._siblings(pos)):
+            return pos[:-1] + (pos[-1] + 1,)
+
+    def prev_sibling_position(self, pos):
+        if pos[-1] > 0:
+            return pos[:-1] + (pos[-1] - 1,)
+
+
+class FileTreeDecorator(CollapseMixin, ArrowTree):
     """urwidtrees decorator for TorrentFiles and TorrentFileTrees"""
 
-    def __init__(self, torrents, keymap, table, ffilter):
+    def __init__(self, torrents, keymap, table, ffilter, collapse_threshold=0):
         self._filewidgetcls = keymap.wrap(FileItemWidget, context='file')
         self._table = table
         self._ffilter = ffilter
-        self._widgets = {}
-        self._filtered_counts = {}
-        forest = self._create_file_forest(torrents)
-        super().__init__(forest, indent=2)
+        self._collapse_threshold = collapse_threshold
+        self._widgets = {}  # Map positions to widgets
+        self._forest = _FileForest(torrents, self._file_is_filtered)
+        ArrowTree.__init__(self, self._forest, indent=2)
+        CollapseMixin.__init__(self, is_collapsed=self._is_initially_collapsed)
 
     def _file_is_filtered(self, tfile):
         if self._ffilter is None:
@@ -50,68 +170,46 @@ class FileTreeDecorator(ArrowTree):
             # ffilter is a FileFilter instance
             return not self._ffilter.match(tfile)
 
-    def _create_file_forest(self, torrents):
-        # Create a list of nested trees in SimpleTree format.  But the leaves
-        # are mappings instead of widgets.  Each mapping contains the
-        # information that the `decorate` method needs to create a widget.
+    def _is_initially_collapsed(self, pos):
+        # Torrents are always expanded
+        if self._collapse_threshold > 0 and len(pos) > 1:
+            tree = self._forest.node(pos).tree
+            return tree is not None and tree.file_count > self._collapse_threshold
+        return False
+
+    def _construct_arrow_tip(self, pos):
+        if self.is_collapsed(pos):
+            tip = urwid.AttrMap(urwid.Text('+'), self._arrow_tip_att or self._arrow_att)
+            return 1, tip
+        return super()._construct_arrow_tip(pos)
+
+    def set_position_collapsed(self, pos, is_collapsed):
+        super().set_position_collapsed(pos, is_collapsed)
+        # The arrow tip shows whether `pos` is collapsed
+        old_widget = self._widgets.pop(pos, None)
+        if old_widget is not None:
+            self.decorate(pos, old_widget.data).is_marked = old_widget.is_marked
 
-        def create_tree(node, content):
-            if content.nodetype == 'leaf':
-                # Process single file
-                if not self._file_is_filtered(content):
-                    return (content, None)
-                else:
-                    return None
-
-            elif content.nodetype == 'parent':
-                # Recurse into directory entries (files and subdirectories)
-                tree = []
-                filtered_count = 0
-                content_sorted = humansorted(content.items())
-                for k,v in content_sorted:
-                    if v.nodetype == 'leaf':
-                        if not self._file_is_filtered(v):
-                            tree.append((v, None))
-                            nonlocal fcount
-                            fcount += 1
-                        else:
-                            filtered_count += 1
-                    elif v.nodetype == 'parent':
-                        dirnode = TorrentFileDirectory(name=k, tree=v)
-                        tree.append(create_tree(dirnode, v))
-
-                self._filtered_counts[node['id']] = filtered_count
-                node['name'] = TorrentFileDirectory.create_directory_name(node['name'], filtered_count)
-                return (node, tree or None)
-
-        fcount = 0
-        forest = []  # Multiple trees as siblings
-        for t in humansorted(torrents, key=lambda t: t['name']):
-            filetree = t['files']
-            filecount = len(tuple(filetree.files))
-            if filecount > 0:
-                nodetree = None
-                rootnodename = next(iter(filetree.keys()))
-                if len(tuple(filetree.directories)) == 0:
-                    # Single-file torrent
-                    if not self._file_is_filtered(filetree[rootnodename]):
-                        nodetree = (filetree[rootnodename], None)
-                else:
-                    # Torrent with directory structure
-                    # If we don't ignore the topmost node, the torrent itself is
-                    # displayed as a directory.
-                    content = filetree[rootnodename]
-                    rootnode = TorrentFileDirectory(rootnodename, tree=content)
-                    nodetree = create_tree(rootnode, content)
+    @property
+    def forest(self):
+        """Undecorated tree that includes the children of collapsed directories"""
+        return self._forest
 
-                if nodetree is not None:
-                    forest.append(nodetree)
+    @property
+    def trees(self):
+        """Map torrent IDs to the TorrentFileTrees this tree was created from"""
+        return self._forest.trees
 
-        self.filecount = fcount
-        return forest
+    @property
+    def filecount(self):
+        return self._forest.filecount
 
-    @lru_cache(maxsize=1024)
     def decorate(self, pos, data, is_first=True):
+        # Widgets are only created for positions that are displayed
+        file_widget = self._widgets.get(pos)
+        if file_widget is not None:
+            return file_widget
+
         # We can use the tree position as table ID
         self._table.register(pos)
         row = self._table.get_row(pos)
@@ -128,31 +226,18 @@ class FileTreeDecorator(ArrowTree):
         # Wrap the whole row in a FileItemWidget with keymapping.  This also
         # applies all the other values besides the name (size, progress, etc).
         file_widget = self._filewidgetcls(data, row)
-        self._widgets[data['id']] = file_widget
+        self._widgets[pos] = file_widget
         return file_widget
 
-    def update(self, torrents):
-        widgets = self._widgets
-        for t in torrents:
-            # Update file nodes
-            for f in t['files'].files:
-                node_id = f['id']
-                # File might be filtered
-                if node_id in widgets:
-                    widgets[node_id].update(f)
-
-            # Update directory nodes
-            for name,content in t['files'].directories:
-                node_id = content.id
-                if node_id in widgets:
-                    filtered_count = self._filtered_counts[node_id]
-                    data = TorrentFileDirectory(name, tree=content,
-                                                filtered_count=filtered_count)
-                    widgets[node_id].update(data)
+    def update(self):
+        """Update existing file and directory widgets"""
+        forest = self._forest
+        for pos,widget in self._widgets.items():
+            widget.update(forest.refresh(pos))
 
     @property
     def widgets(self):
-        """Yield all file and directory widgets in this tree"""
+        """Yield all existing file and directory widgets in this tree"""
         yield from self._widgets.values()
 
 
@@ -184,6 +269,9 @@ class FileListWidget(ListWidgetBase):
     palette_name    = 'filelist'
     focusable_items = True
 
+    # Directories with more files are initially collapsed (0 means never)
+    collapse_threshold = 0
+
     def __init__(self, srvapi, keymap, tfilter, ffilter, columns=None, title=None):
         super().__init__(srvapi, keymap, columns=columns, title=title)
         self._tfilter = tfilter
@@ -224,13 +312,35 @@ class FileListWidget(ListWidgetBase):
         elif sffilter is not None:
             ffilter = ffilter & sffilter
 
-        self._filetree = FileTreeDecorator(self._torrents, self._keymap, self._table, ffilter)
+        self._filetree = FileTreeDecorator(self._torrents, self._keymap, self._table, ffilter,
+                                           collapse_threshold=self.collapse_threshold)
         self._listbox.body = urwidtrees.widgets.TreeListWalker(self._filetree)
 
     def _update_listitems(self, torrents=()):
         if torrents:
-            self._filetree.update(torrents)
-            self._torrents = torrents
+            trees = self._filetree.trees
+            if len(trees) != len(torrents) or \
+               any(trees.get(t['id']) is not t['files'] for t in torrents):
+                # Listed torrents changed or a torrent's files were renamed
+                self._init_listitems(torrents)
+                self._initialized = True
+            else:
+                self._filetree.update()
+                self._torrents = torrents
+
+    def keypress(self, size, key):
+        key = super().keypress(size, key)
+        focused = self.focused_widget
+        if key in ('right', 'left') and focused is not None and focused.nodetype == 'parent':
+            pos = self._listbox.focus_position
+            if not self._filetree.forest.is_leaf(pos):
+                if key == 'right':
+                    self._filetree.expand(pos)
+                else:
+                    self._filetree.collapse(pos)
+                self._listbox.body.clear_cache()
+                return None
+        return key
 
     @property
     def secondary_filter(self):
@@ -314,7 +424,8 @@ class FileListWidget(ListWidgetBase):
 
     def all_children(self, pos):
         """Yield (position, widget) tuples of all sub-nodes (leaves and parents)"""
-        ft = self._filetree
+        # Include children of collapsed directories
+        ft = self._filetree.forest
         lb = self._listbox
 
         def recurse(subpos):
@@ -334,6 +445,18 @@ class FileListWidget(ListWidgetBase):
 
         yield from recurse(pos)
 
+    @property
+    def marked(self):
+        # Unlike other lists, all file widgets exist and self._marked contains
+        # widgets instead of IDs
+        secondary_filter = self.secondary_filter
+        if secondary_filter is None:
+            yield from self._marked
+        else:
+            for widget in self._marked:
+                if secondary_filter.match(widget.data):
+                    yield widget
+
     def _set_mark(self, mark, toggle=False, all=False):
         if toggle:
             focused = self.focused_widget
@@ -360,9 +483,10 @@ class FileListWidget(ListWidgetBase):
 
         if all:
             # Top ancestor node positions are (0,), (1,), (3,) etc
-            for pos in self._filetree.positions():
-                if len(pos) == 1:
-                    mark_leaves(pos, mark)
+            pos = self._filetree.root
+            while pos is not None:
+                mark_leaves(pos, mark)
+                pos = self._filetree.next_sibling_position(pos)
         else:
             mark_leaves(self._listbox.focus_position, mark)
         assert builtins.all(m.nodetype == 'leaf' for m in self._marked)
@@ -375,10 +499,10 @@ class FileListWidget(ListWidgetBase):
 
         def all_children_marked(pos):
             marked = True
-            childpos = self._filetree.first_child_position(pos)
+            childpos = self._filetree.forest.first_child_position(pos)
             while childpos is not None:
                 marked = marked and get_widget(childpos).is_marked
-                childpos = self._filetree.next_sibling_position(childpos)
+                childpos = self._filetree.forest.next_sibling_position(childpos)
             return marked
 
         parpos = self._filetree.parent_position(self._listbox.focus_position)
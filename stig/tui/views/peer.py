@@ -47,15 +47,17 @@ class Host(_COLUMNS['host'], CellWidgetBase):
                            style.attrs('header'))
 
     def update(self, data):
-        if not self.text.text:
-            # Set raw IP address initially
-            super().update(data)
+        # Set raw IP address until the hostname is known
+        super().update(data)
 
         # Set hostname via callback
         from ...objects import localcfg
         if localcfg['reverse-dns']:
+            ip = data['ip']
+
             def set_hostname(hostname):
-                if self.text.text != hostname:
+                # This row may display a different peer by now
+                if self.data['ip'] == ip and self.text.text != hostname:
                     self.text.set_text(hostname)
             from ...client import rdns
             rdns.query(data['ip'], callback=set_hostname)
@@ -10,6 +10,7 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 from ...client import PeerFilter
+from ...client.aggregate import Aggregator
 from .base import ItemWidgetBase, ListWidgetBase
 from .peer import TUICOLUMNS
 from .utils import stringify_torrent_filter
@@ -39,15 +40,7 @@ class PeerListWidget(ListWidgetBase):
         self._tfilter = tfilter
         self._pfilter = pfilter
         self._secondary_filter = None
-
-        # Create peer filter generator
-        if pfilter is not None:
-            def filter_peers(peers):
-                yield from pfilter.apply(peers)
-        else:
-            def filter_peers(peers):
-                yield from peers
-        self._maybe_filter_peers = filter_peers
+        self._peers = Aggregator('peers')
 
         self._poller = self._srvapi.create_poller(
             self._srvapi.torrent.torrents, tfilter, keys=('peers', 'name', 'id')
@@ -64,16 +57,19 @@ class PeerListWidget(ListWidgetBase):
                 if self._pfilter:
                     self._title_name += ' %s' % self._pfilter
 
-            # Create list items our base widget can handle
-            def peers_combined(torrents):
-                for t in torrents:
-                    yield from self._maybe_filter_peers(t['peers'])
-            self._data_dict = {p['id']:p for p in peers_combined(response.torrents)}
+            # Peers are updated in place, so we only need to look at torrents
+            # that gained or lost peers.  Filtering happens in _limit_items().
+            self._peers.update(response.torrents)
+            self._data_dict = self._peers.items
+            # Values (e.g. rates) change in place, so the peers must be
+            # filtered and sorted again even if the dictionary is the same
+            self._walker_state = None
         self._invalidate()
 
     def clear(self):
-        for w in self._listbox.body:
-            w.data.clearcache()
+        for p in self._items.values():
+            p.clearcache()
+        self._peers.clear()
         super().clear()
 
     def refresh(self):
@@ -100,7 +96,7 @@ class PeerListWidget(ListWidgetBase):
             self._secondary_filter = PeerFilter(peer_filter)
         self._invalidate()
 
-    def _limit_items(self, peer_widgets):
+    def _limit_items(self, peers):
         # Combine primary and secondary peer filters
         pfilter = self._pfilter
         spfilter = self._secondary_filter
@@ -110,6 +106,6 @@ class PeerListWidget(ListWidgetBase):
             pfilter = pfilter & spfilter
 
         if pfilter is not None:
-            for pw in peer_widgets:
-                if not pfilter.match(pw.data):
-                    yield pw
+            for pid,p in peers.items():
+                if not pfilter.match(p):
+                    yield pid
@@ -203,9 +203,9 @@ class SettingListWidget(ListWidgetBase):
             self._secondary_filter = SettingFilter(setting_filter)
         self._invalidate()
 
-    def _limit_items(self, setting_widgets):
+    def _limit_items(self, settings):
         sfilter = self._secondary_filter
         if sfilter is not None:
-            for sw in setting_widgets:
-                if not sfilter.match(sw.data):
-                    yield sw
+            for name,setting in settings.items():
+                if not sfilter.match(setting):
+                    yield name
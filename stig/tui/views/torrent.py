@@ -191,6 +191,8 @@ class Downloaded(_COLUMNS['downloaded'], CellWidgetBase):
                   extras=('header',), modes=('highlighted',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['downloaded'].header),
                            style.attrs('header'))
+    # get_mode() also needs '%downloaded'
+    needed_keys = _COLUMNS['downloaded'].needed_keys + ('%downloaded',)
 
     def get_mode(self):
         t = self.data
@@ -356,6 +358,7 @@ class Created(_COLUMNS['created'], CellWidgetBase):
     style = Style(prefix='torrentlist.created', focusable=True, extras=('header',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['created'].header),
                            style.attrs('header'))
+    cache_values = False  # Timestamps are displayed relative to now
 
 TUICOLUMNS['created'] = Created
 
@@ -363,6 +366,7 @@ class Added(_COLUMNS['added'], CellWidgetBase):
     style = Style(prefix='torrentlist.added', focusable=True, extras=('header',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['added'].header),
                            style.attrs('header'))
+    cache_values = False  # Timestamps are displayed relative to now
 
 TUICOLUMNS['added'] = Added
 
@@ -370,6 +374,7 @@ class Started(_COLUMNS['started'], CellWidgetBase):
     style = Style(prefix='torrentlist.started', focusable=True, extras=('header',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['started'].header),
                            style.attrs('header'))
+    cache_values = False  # Timestamps are displayed relative to now
 
 TUICOLUMNS['started'] = Started
 
@@ -377,6 +382,7 @@ class Active(_COLUMNS['activity'], CellWidgetBase):
     style = Style(prefix='torrentlist.activity', focusable=True, extras=('header',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['activity'].header),
                            style.attrs('header'))
+    cache_values = False  # Timestamps are displayed relative to now
 
 TUICOLUMNS['activity'] = Active
 
@@ -385,6 +391,7 @@ class Completed(_COLUMNS['completed'], CellWidgetBase):
                   extras=('header',), modes=('highlighted',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['completed'].header),
                            style.attrs('header'))
+    cache_values = False  # Timestamps are displayed relative to now
 
     def get_mode(self):
         return 'highlighted' if self.value.in_future else ''
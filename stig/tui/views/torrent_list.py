@@ -92,8 +92,8 @@ class TorrentListWidget(ListWidgetBase):
         self._invalidate()
 
     def clear(self):
-        for w in self._listbox.body:
-            w.data.clearcache()
+        for t in self._items.values():
+            t.clearcache()
         super().clear()
 
     def refresh(self):
@@ -129,9 +129,9 @@ class TorrentListWidget(ListWidgetBase):
         log.debug('Filtering %r torrents', self._secondary_filter)
         self._register_request()
 
-    def _limit_items(self, torrent_widgets):
+    def _limit_items(self, torrents):
         f = self._secondary_filter
         if f is not None:
-            for tw in torrent_widgets:
-                if not f.match(tw.data):
-                    yield tw
+            for tid,t in torrents.items():
+                if not f.match(t):
+                    yield tid
@@ -10,6 +10,7 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 from ...client import TrackerFilter
+from ...client.aggregate import Aggregator
 from .base import ItemWidgetBase, ListWidgetBase
 from .tracker import TUICOLUMNS
 from .utils import stringify_torrent_filter
@@ -46,15 +47,7 @@ class TrackerListWidget(ListWidgetBase):
         self._torfilter = torfilter
         self._trkfilter = trkfilter
         self._secondary_filter = None
-
-        # Create tracker filter generator
-        if trkfilter is not None:
-            def filter_trackers(trackers):
-                yield from trkfilter.apply(trackers)
-        else:
-            def filter_trackers(trackers):
-                yield from trackers
-        self._maybe_filter_trackers = filter_trackers
+        self._trackers = Aggregator('trackers')
 
         self._poller = self._srvapi.create_poller(
             self._srvapi.torrent.torrents, torfilter, keys=('trackers', 'name', 'id')
@@ -71,13 +64,20 @@ class TrackerListWidget(ListWidgetBase):
                 if self._trkfilter:
                     self._title_name += ' %s' % self._trkfilter
 
-            # Create list items our base widget can handle
-            def trackers_combined(torrents):
-                for t in torrents:
-                    yield from self._maybe_filter_trackers(t['trackers'])
-            self._data_dict = {trk['id']:trk for trk in trackers_combined(response.torrents)}
+            # Trackers are updated in place, so we only need to look at
+            # torrents that gained or lost trackers.  Filtering happens in
+            # _limit_items().
+            self._trackers.update(response.torrents)
+            self._data_dict = self._trackers.items
+            # Values (e.g. seeders) change in place, so the trackers must be
+            # filtered and sorted again even if the dictionary is the same
+            self._walker_state = None
         self._invalidate()
 
+    def clear(self):
+        self._trackers.clear()
+        super().clear()
+
     def refresh(self):
         self._poller.poll()
 
@@ -110,7 +110,7 @@ class TrackerListWidget(ListWidgetBase):
             self._secondary_filter = TrackerFilter(tracker_filter)
         self._invalidate()
 
-    def _limit_items(self, tracker_widgets):
+    def _limit_items(self, trackers):
         # Combine primary and secondary tracker filters
         trkfilter = self._trkfilter
         strkfilter = self._secondary_filter
@@ -120,9 +120,9 @@ class TrackerListWidget(ListWidgetBase):
             trkfilter = trkfilter & strkfilter
 
         if trkfilter is not None:
-            for tw in tracker_widgets:
-                if not trkfilter.match(tw.data):
-                    log.debug('%r does not match %r', trkfilter, tw.data['domain'])
-                    yield tw
+            for tid,trk in trackers.items():
+                if not trkfilter.match(trk):
+                    log.debug('%r does not match %r', trkfilter, trk['domain'])
+                    yield tid
                 else:
-                    log.debug('%r does match %r', trkfilter, tw.data['domain'])
+                    log.debug('%r does match %r', trkfilter, trk['domain'])
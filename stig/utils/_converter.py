@@ -37,6 +37,19 @@ class DataSizeConverter():
         `unit` property or by passing the `unit` argument), it is assumed to be
         what the `unit` property of this object is set to.
         """
+        num_cls = num.__class__
+        if num_cls is int or (num_cls is float and num == num and abs(num) != float('inf')):
+            # Fast path for plain numbers (e.g. from JSON)
+            unit_given = self._short.get(unit, unit) or self._unit
+            if unit_given != self._unit:
+                if unit_given == 'B':
+                    num = round(num) * 8
+                elif unit_given == 'b':
+                    num = round(num) / 8
+                else:
+                    raise ValueError("Unit must be 'b' (bit) or 'B' (byte), not %r" % unit_given)
+            return Int._from_number(num, self._unit, self._prefix, False)
+
         if not isinstance(num, (Int, Float)):
             # Parse unit; fall back to given or our own unit
             num = Int(num, unit=unit or self._unit, prefix=self._prefix)
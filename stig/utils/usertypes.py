@@ -486,6 +486,7 @@ class _NumberBase(UsertypeMixin):
     _prefixes_dct = {prefix.lower():size
                      for prefix,size in chain.from_iterable(zip(_prefixes_binary,
                                                                 _prefixes_metric))}
+    _prefixes_by_name = {'binary': _prefixes_binary, 'metric': _prefixes_metric, 'none': ()}
     _regex = re.compile(r'^\s*([-+]?(?:\d+\.\d+|\d+|\.\d+|inf)) ?(' +
                         r'|'.join(p[0] for p in chain.from_iterable(
                             zip(_prefixes_binary, _prefixes_metric))) +
@@ -509,6 +510,15 @@ class _NumberBase(UsertypeMixin):
                 convert_to=defaults['convert_to'], prefix=defaults['prefix'],
                 hide_unit=defaults['hide_unit'], min=defaults['min'],
                 max=defaults['max'], autolimit=defaults['autolimit']):
+        value_cls = value.__class__
+        if (value_cls is int or value_cls is float) and convert_to is None \
+           and min is None and max is None:
+            # Fast path for plain numbers (e.g. from JSON) that don't need any
+            # parsing, conversion or validation
+            return cls._from_number(value, unit,
+                                    'metric' if prefix is None else prefix,
+                                    False if hide_unit is None else hide_unit)
+
         if isinstance(value, cls):
             # Use value's arguments as defaults
             defaults = value._args
@@ -571,23 +581,24 @@ class _NumberBase(UsertypeMixin):
             else:
                 raise ValueError('Too big (maximum is %s)' % max)
 
+        return cls._from_number(value, unit, prefix, hide_unit, min, max, autolimit)
+
+    @classmethod
+    def _from_number(cls, value, unit, prefix, hide_unit, min=None, max=None, autolimit=None):
+        # Create instance from int or float without parsing or validating it
+        if value.__class__ is float and issubclass(cls, int):
+            try:
+                value = round(value)
+            except OverflowError:
+                raise ValueError('Not a %s' % cls.typename)
         try:
             self = super().__new__(cls, value)
         except TypeError:
             raise ValueError('Not a %s' % cls.typename)
 
-        if hide_unit:
-            self._str = lambda: self.without_unit
-        else:
-            self._str = lambda: self.with_unit
-
-        if prefix == 'binary':
-            self._prefixes = self._prefixes_binary
-        elif prefix == 'metric':
-            self._prefixes = self._prefixes_metric
-        elif prefix == 'none':
-            self._prefixes = ()
-        else:
+        try:
+            self._prefixes = cls._prefixes_by_name[prefix]
+        except KeyError:
             raise ValueError("prefix must be 'binary' or 'metric'")
 
         # Remember arguments so we can copy them if this instance is passed to the same class
@@ -601,7 +612,7 @@ class _NumberBase(UsertypeMixin):
         return '<NUMBER>[%s]' % '|'.join(prefixes)
 
     def __str__(self):
-        return self._str()
+        return self.without_unit if self._args['hide_unit'] else self.with_unit
 
     @property
     def with_unit(self):
@@ -663,7 +674,10 @@ class _NumberBase(UsertypeMixin):
             result_cls = Float
 
         # Create new instance with copied properties
-        return result_cls(result, **self._args)
+        args = self._args
+        if args['min'] is None and args['max'] is None and result.__class__ in (int, float):
+            return result_cls._from_number(result, args['unit'], args['prefix'], args['hide_unit'])
+        return result_cls(result, **args)
 
     def __add__(self, other):          return self._do_math('__add__', other)
     def __sub__(self, other):          return self._do_math('__sub__', other)
@@ -78,9 +78,14 @@ class ColumnBase():
                 #               citem['value'])
         return value
 
+    # Incremented every time the cache is cleared so that anyone who keeps
+    # values around knows when they are outdated
+    cache_generation = 0
+
     @classmethod
     def clearcache(cls):
         cls._cache.clear()
+        ColumnBase.cache_generation += 1
 
     def get_value(self):
         # Return pretty, user-readable value
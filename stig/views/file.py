@@ -113,39 +113,29 @@ class TorrentFileDirectory(dict):
     nodetype = 'parent'
 
     def __init__(self, name, tree, filtered_count=0):
-        tfiles = tuple(tree.files)
+        first_file = tree.first_file
         self.update({
             'id'              : tree.id,
-            'tid'             : tfiles[0]['tid'],
+            'tid'             : first_file['tid'],
             'name'            : self.create_directory_name(name, filtered_count),
             'path-absolute'   : os.path.join(tree.location, tree.path),
             'path-relative'   : tree.path,
             'location'        : tree.location,
-            'size-total'      : self._sum_size(tfiles, 'size-total'),
-            'size-downloaded' : self._sum_size(tfiles, 'size-downloaded'),
+            'size-total'      : self._convert_size(tree.size_total, first_file['size-total']),
+            'size-downloaded' : self._convert_size(tree.size_downloaded, first_file['size-downloaded']),
             'is-wanted'       : True,
-            'priority'        : self._sum_priority(tfiles),
+            'priority'        : tree.priority,
         })
-        perc_dl_cls = type(tfiles[0]['%downloaded'])
+        perc_dl_cls = type(first_file['%downloaded'])
         try:
             self['%downloaded'] = perc_dl_cls(self['size-downloaded'] / self['size-total'] * 100)
         except ZeroDivisionError:
             self['%downloaded'] = perc_dl_cls(0)
 
     @staticmethod
-    def _sum_size(tfiles, key):
-        sizes = tuple(tfile[key] for tfile in tfiles)
+    def _convert_size(size, example):
         # Preserve the original type (Float)
-        first_size = sizes[0]
-        start_value = type(first_size)(0, unit=first_size.unit, prefix=first_size.prefix)
-        return sum(sizes, start_value)
-
-    @staticmethod
-    def _sum_priority(tfiles):
-        if len(set(tfile['priority'] for tfile in tfiles)) == 1:
-            return tfiles[0]['priority']
-        else:
-            return ''
+        return type(example)(size, unit=example.unit, prefix=example.prefix)
 
     @staticmethod
     def create_directory_name(name, filtered_count):
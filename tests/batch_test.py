@@ -0,0 +1,112 @@
+import asyncio
+import contextlib
+import io
+import sys
+import unittest
+
+from stig import batch
+
+
+class Test_read_cmdlines(unittest.TestCase):
+    def test_empty_lines_and_comments_are_skipped(self):
+        lines = ['ls\n', '\n', '   \n', '# comment\n', '  # indented comment\n', 'lsf foo\n']
+        self.assertEqual(list(batch._read_cmdlines(lines)), ['ls', 'lsf foo'])
+
+    def test_whitespace_is_stripped(self):
+        self.assertEqual(list(batch._read_cmdlines(['  ls foo  \n'])), ['ls foo'])
+
+    def test_continued_lines_are_joined(self):
+        lines = ['ls \\\n', '  foo \\\n', 'bar\n', 'lsf\n']
+        self.assertEqual(list(batch._read_cmdlines(lines)), ['ls foo bar', 'lsf'])
+
+    def test_comments_between_continued_lines_are_skipped(self):
+        lines = ['ls \\\n', '# comment\n', 'foo\n']
+        self.assertEqual(list(batch._read_cmdlines(lines)), ['ls foo'])
+
+    def test_continued_last_line(self):
+        self.assertEqual(list(batch._read_cmdlines(['ls\n', 'lsf foo \\\n'])), ['ls', 'lsf foo '])
+
+    def test_lines_are_read_lazily(self):
+        read = []
+
+        def lines():
+            for line in ('ls\n', 'lsf\n'):
+                read.append(line)
+                yield line
+        cmdlines = batch._read_cmdlines(lines())
+        self.assertEqual(next(cmdlines), 'ls')
+        self.assertEqual(read, ['ls\n'])
+
+
+class FakeCmdManager():
+    """
+    Run command lines like "<result> <name> [<delay>]"
+
+    Write "<name>:start" before and "<name>:end" after sleeping for <delay>
+    seconds to stdout (or stderr if result is "fail") and return True for
+    "ok", False for "fail" and None for "ignore".  Raise for "raise".
+    """
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def run_async(self, cmdline):
+        result, name, *delay = cmdline.split()
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            stream = sys.stderr if result == 'fail' else sys.stdout
+            stream.write('%s:start\n' % (name,))
+            await asyncio.sleep(float(delay[0]) if delay else 0)
+            stream.write('%s:end\n' % (name,))
+            if result == 'raise':
+                raise RuntimeError('Oops')
+            return {'ok': True, 'fail': False, 'ignore': None}[result]
+        finally:
+            self.running -= 1
+
+
+class Test_run(unittest.TestCase):
+    def setUp(self):
+        self.cmdmgr = FakeCmdManager()
+
+    def run_batch(self, lines, jobs=1):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            success = batch.run_sync(self.cmdmgr, lines, jobs=jobs)
+        return success, stdout.getvalue().splitlines(), stderr.getvalue().splitlines()
+
+    def test_output_is_followed_by_footer(self):
+        success, stdout, stderr = self.run_batch(['ok a', 'ok b'])
+        self.assertEqual(success, True)
+        self.assertEqual(stdout, ['a:start', 'a:end', '<<< 0 ok a',
+                                  'b:start', 'b:end', '<<< 0 ok b'])
+        self.assertEqual(stderr, [])
+
+    def test_exit_codes(self):
+        success, stdout, stderr = self.run_batch(['ok a', 'fail b', 'ignore c', 'raise d'])
+        self.assertEqual(success, False)
+        self.assertEqual([line for line in stdout if line.startswith(batch.FOOTER)],
+                         ['<<< 0 ok a', '<<< 1 fail b', '<<< 0 ignore c', '<<< 1 raise d'])
+        self.assertEqual(stderr, ['b:start', 'b:end'])
+
+    def test_only_successful_or_ignored_commands(self):
+        self.assertEqual(self.run_batch(['ok a', 'ignore b'])[0], True)
+
+    def test_output_is_in_input_order_with_parallel_jobs(self):
+        lines = ['ok a 0.06', 'fail b 0.02', 'ok c 0', 'ok d 0.04', 'ok e 0']
+        success, stdout, stderr = self.run_batch(lines, jobs=3)
+        self.assertEqual(success, False)
+        self.assertEqual(stdout, ['a:start', 'a:end', '<<< 0 ok a 0.06',
+                                  '<<< 1 fail b 0.02',
+                                  'c:start', 'c:end', '<<< 0 ok c 0',
+                                  'd:start', 'd:end', '<<< 0 ok d 0.04',
+                                  'e:start', 'e:end', '<<< 0 ok e 0'])
+        self.assertEqual(stderr, ['b:start', 'b:end'])
+        self.assertEqual(self.cmdmgr.max_running, 3)
+
+    def test_number_of_parallel_jobs_is_limited(self):
+        self.run_batch(['ok %d 0.01' % i for i in range(10)], jobs=2)
+        self.assertEqual(self.cmdmgr.max_running, 2)
@@ -0,0 +1,50 @@
+import unittest
+
+from stig.client.aggregate import Aggregator
+
+
+class FakeItemList(list):
+    revision = 0
+
+
+def make_torrent(tid, *ips):
+    peers = FakeItemList({'id': (tid, ip), 'ip': ip} for ip in ips)
+    return {'id': tid, 'peers': peers}
+
+
+class TestAggregator(unittest.TestCase):
+    def test_items_of_all_torrents(self):
+        agg = Aggregator('peers')
+        t1, t2 = make_torrent(1, 'a', 'b'), make_torrent(2, 'a')
+        self.assertTrue(agg.update((t1, t2)))
+        self.assertEqual(set(agg.items), {(1, 'a'), (1, 'b'), (2, 'a')})
+        self.assertIs(agg.items[(2, 'a')], t2['peers'][0])
+        self.assertEqual(len(agg), 3)
+
+    def test_unchanged_lists_are_skipped(self):
+        agg = Aggregator('peers')
+        t1 = make_torrent(1, 'a', 'b')
+        agg.update((t1,))
+        # Items with the same revision are not looked at
+        t1['peers'].append({'id': (1, 'c'), 'ip': 'c'})
+        self.assertFalse(agg.update((t1,)))
+        self.assertEqual(set(agg.items), {(1, 'a'), (1, 'b')})
+        t1['peers'].revision += 1
+        self.assertTrue(agg.update((t1,)))
+        self.assertEqual(set(agg.items), {(1, 'a'), (1, 'b'), (1, 'c')})
+
+    def test_new_list_replaces_items(self):
+        agg = Aggregator('peers')
+        agg.update((make_torrent(1, 'a', 'b'),))
+        t1 = make_torrent(1, 'b', 'c')
+        self.assertTrue(agg.update((t1,)))
+        self.assertEqual(set(agg.items), {(1, 'b'), (1, 'c')})
+        self.assertIs(agg.items[(1, 'b')], t1['peers'][0])
+
+    def test_removed_torrents(self):
+        agg = Aggregator('peers')
+        t1, t2 = make_torrent(1, 'a'), make_torrent(2, 'a', 'b')
+        agg.update((t1, t2))
+        self.assertTrue(agg.update((t1,)))
+        self.assertEqual(set(agg.items), {(1, 'a')})
+        self.assertFalse(agg.update((t1,)))
@@ -1,13 +1,20 @@
+import copy
 import os.path
+from base64 import b64decode
+from unittest.mock import patch
 
 import asynctest
 import resources_aiotransmission as rsrc
+from aiohttp import web
 
-from stig.client import MAX_TORRENT_FILE_SIZE
+from stig.client import (MAX_TORRENT_FILE_SIZE, ConnectionError, Progress, RPCError,
+                         TimeoutError)
 from stig.client.aiotransmission.api_torrent import TorrentAPI
 from stig.client.aiotransmission.rpc import TransmissionRPC
 from stig.client.aiotransmission.torrent import Torrent
+from stig.client.bencode import info_hash
 from stig.client.filters.torrent import TorrentFilter
+from stig.client.utils import Response
 
 assert os.path.exists(rsrc.TORRENTFILE)
 assert not os.path.exists(rsrc.TORRENTFILE_NOEXIST)
@@ -85,6 +92,118 @@ class TestAddingTorrents(TorrentAPITestCase):
         self.assertEqual(response.msgs, ('Added %s' % rsrc.TORRENTHASH,))
         self.assertEqual(response.errors, ())
 
+    def mock_add_many(self, existing=()):
+        self.api.torrents = asynctest.CoroutineMock(
+            return_value=Response(success=True, torrents=existing))
+
+        async def torrent_add(torrent, args, labels):
+            return Response(success=True, torrent=Torrent({'id': 1, 'name': torrent}),
+                            msgs=('Added %s' % (torrent,),))
+        self.api._torrent_add = asynctest.CoroutineMock(side_effect=torrent_add)
+
+    async def test_add_many_skips_duplicate_torrents(self):
+        self.mock_add_many()
+        response = await self.api.add_many((rsrc.TORRENTFILE, rsrc.TORRENTFILE, rsrc.TORRENTHASH))
+        self.assertEqual(response.success, False)
+        self.assertEqual(sorted(t['name'] for t in response.torrents),
+                         sorted((rsrc.TORRENTFILE, rsrc.TORRENTHASH)))
+        self.assertEqual(response.errors, ('Torrent already exists: %s' % (rsrc.TORRENTFILE,),))
+        self.assertEqual(self.api._torrent_add.call_count, 2)
+
+    async def test_add_many_skips_existing_torrents(self):
+        with open(rsrc.TORRENTFILE, 'rb') as f:
+            torrent_hash = info_hash(f.read())
+        self.mock_add_many(existing=({'hash': torrent_hash.upper(), 'name': 'Known Torrent'},))
+        response = await self.api.add_many((rsrc.TORRENTFILE, rsrc.TORRENTHASH),
+                                           stopped=True, labels=['foo'])
+        self.assertEqual(response.success, False)
+        self.assertEqual(response.torrents, (Torrent({'id': 1, 'name': rsrc.TORRENTHASH}),))
+        self.assertEqual(response.msgs, ('Added %s' % (rsrc.TORRENTHASH,),))
+        self.assertEqual(response.errors, ('Torrent already exists: Known Torrent',))
+        self.api._torrent_add.assert_called_once_with(
+            rsrc.TORRENTHASH, {'paused': True, 'labels': ['foo'], 'hash': rsrc.TORRENTHASH,
+                               'filename': 'magnet:?xt=urn:btih:' + rsrc.TORRENTHASH}, ['foo'])
+
+    async def test_add_many_with_many_torrents_gets_current_hashes(self):
+        self.mock_add_many()
+        self.api._tcache.update(({'id': 1, 'name': 'Foo'},))
+        await self.api.add_many((rsrc.TORRENTFILE, rsrc.TORRENTHASH))
+        self.api.torrents.assert_called_once_with(keys=('hash', 'name'))
+        self.assertEqual(self.api._torrent_add.call_count, 2)
+
+    async def test_add_many_with_single_torrent_and_empty_cache(self):
+        self.mock_add_many()
+        response = await self.api.add_many((rsrc.TORRENTHASH,))
+        self.assertEqual(response.success, True)
+        self.api.torrents.assert_not_called()
+        self.assertEqual(self.api._torrent_add.call_count, 1)
+
+    def run_daemon_with_torrents(self, *torrents):
+        # Let fake daemon add, remove and list torrents like a real one
+        torrents = {t['id']: t for t in torrents}
+        self.added = []
+
+        async def handle(request):
+            rqdata = await request.json()
+            method, args = rqdata['method'], rqdata.get('arguments', {})
+            if method == 'session-get':
+                return web.json_response(rsrc.SESSION_GET_RESPONSE)
+            elif method == 'torrent-get':
+                return web.json_response(rsrc.response_torrents(*torrents.values()))
+            elif method == 'torrent-remove':
+                for tid in args['ids']:
+                    del torrents[tid]
+                return web.json_response(rsrc.response_success({}))
+            elif method == 'torrent-add':
+                torrent_hash = info_hash(b64decode(args['metainfo']))
+                for t in torrents.values():
+                    if t['hashString'] == torrent_hash:
+                        return web.json_response(rsrc.response_success({'torrent-duplicate': t}))
+                t = {'id': max(torrents, default=0) + 1, 'name': 'Added', 'hashString': torrent_hash}
+                torrents[t['id']] = t
+                self.added.append(t['id'])
+                return web.json_response(rsrc.response_success({'torrent-added': t}))
+            raise RuntimeError('Unexpected request: %r' % (rqdata,))
+        self.daemon.response = handle
+
+    async def test_add_many_after_removing_cached_torrent(self):
+        with open(rsrc.TORRENTFILE, 'rb') as f:
+            torrent_hash = info_hash(f.read())
+        self.run_daemon_with_torrents({'id': 1, 'name': 'Foo', 'hashString': torrent_hash})
+        response = await self.api.torrents(keys=('hash', 'name'))
+        self.assertEqual(len(response.torrents), 1)
+
+        response = await self.api.add_many((rsrc.TORRENTFILE,))
+        self.assertEqual(response.success, False)
+        self.assertEqual(response.errors, ('Torrent already exists: Foo',))
+
+        response = await self.api.remove((1,))
+        self.assertEqual(response.success, True)
+        self.assertEqual(len(self.api._tcache), 0)
+
+        response = await self.api.add_many((rsrc.TORRENTFILE,))
+        self.assertEqual(response.success, True)
+        self.assertEqual(self.added, [1])
+
+    async def test_add_many_with_many_torrents_after_removing_cached_torrent(self):
+        with open(rsrc.TORRENTFILE, 'rb') as f:
+            torrent_hash = info_hash(f.read())
+        self.run_daemon_with_torrents({'id': 1, 'name': 'Foo', 'hashString': torrent_hash})
+        await self.api.torrents(keys=('hash', 'name'))
+        await self.api.remove((1,))
+        response = await self.api.add_many((rsrc.TORRENTFILE, rsrc.TORRENTFILE))
+        self.assertEqual(response.success, False)
+        self.assertEqual(response.errors, ('Torrent already exists: %s' % (rsrc.TORRENTFILE,),))
+        self.assertEqual(self.added, [1])
+
+    async def test_add_many_with_unreachable_daemon(self):
+        await self.daemon.stop()
+        response = await self.api.add_many((rsrc.TORRENTHASH,))
+        self.assertEqual(response.success, False)
+        self.assertEqual(response.results, ())
+        self.assertEqual(len(response.errors), 1)
+        self.assertIn('Failed to connect', response.errors[0])
+
 
 class TestGettingTorrents(TorrentAPITestCase):
     async def test_get_all_torrents(self):
@@ -256,6 +375,94 @@ class TestManipulatingTorrents(TorrentAPITestCase):
         self.assertEqual(response.errors, ('miss: #2, Bar',))
 
 
+    async def test_chunks(self):
+        calls = []
+        progress = []
+
+        async def mock_method(ids, **kwargs):
+            calls.append((ids, kwargs))
+
+        def on_progress(p):
+            progress.append(p)
+
+        self.api.chunk_size = 2
+        self.api.on_progress(on_progress)
+        response = await self.api._torrent_action(method=mock_method, method_args={'foo': 'bar'})
+        self.assertEqual(calls, [((1, 2), {'foo': 'bar'}), ((3,), {'foo': 'bar'})])
+        self.assertEqual(response.success, True)
+        self.assertEqual(tuple(t['id'] for t in response.torrents), (1, 2, 3))
+        self.assertEqual(progress, [Progress(action='mock-method', done=2, failed=0, total=3),
+                                    Progress(action='mock-method', done=3, failed=0, total=3)])
+        self.assertTrue(progress[-1].finished)
+
+    async def test_no_progress_for_single_chunk(self):
+        progress = []
+
+        def on_progress(p):
+            progress.append(p)
+
+        self.api.on_progress(on_progress)
+        await self.api._torrent_action(method=self.mock_method)
+        self.assertEqual(self.mock_method_args, (1, 2, 3))
+        self.assertEqual(progress, [])
+
+    async def test_failed_chunk_is_retried(self):
+        attempts = []
+
+        async def mock_method(ids, **kwargs):
+            attempts.append(ids)
+            if ids == (3,):
+                raise ConnectionError('http://localhost:123')
+
+        self.api.chunk_size = 2
+        self.api.retries = 1
+        self.api.retry_delay = 0
+        response = await self.api._torrent_action(method=mock_method)
+        self.assertEqual(attempts, [(1, 2), (3,), (3,)])
+        self.assertEqual(response.success, True)
+        self.assertEqual(tuple(t['id'] for t in response.torrents), (1, 2))
+        self.assertEqual(response.errors,
+                         ('Chunk 2 of 2 (1 torrent): Failed to connect: http://localhost:123',))
+
+    async def test_delay_between_retries_is_doubled(self):
+        delays = []
+
+        async def mock_method(ids, **kwargs):
+            raise TimeoutError(1, 'http://localhost:123')
+
+        async def mock_sleep(delay):
+            delays.append(delay)
+
+        self.api.retries = 3
+        self.api.retry_delay = 0.5
+        with patch('asyncio.sleep', mock_sleep):
+            response = await self.api._torrent_action(method=mock_method)
+        self.assertEqual(delays, [0.5, 1, 2])
+        self.assertEqual(response.success, False)
+
+    async def test_non_idempotent_request_is_not_retried(self):
+        attempts = []
+
+        async def mock_method(ids, **kwargs):
+            attempts.append(ids)
+            raise TimeoutError(1, 'http://localhost:123')
+
+        self.api.retries = 2
+        self.api.retry_delay = 0
+        response = await self.api._torrent_action(method=mock_method, idempotent=False)
+        self.assertEqual(attempts, [(1, 2, 3)])
+        self.assertEqual(response.success, False)
+
+    async def test_all_chunks_failed(self):
+        async def mock_method(ids, **kwargs):
+            raise RPCError('Nope')
+
+        self.api.chunk_size = 2
+        response = await self.api._torrent_action(method=mock_method)
+        self.assertEqual(response.success, False)
+        self.assertEqual(response.torrents, ())
+        self.assertEqual(len(response.errors), 2)
+
 class TestTorrentBandwidthLimit(TorrentAPITestCase):
     def assert_request(self, expected_request):
         # Because order doesn't matter, replace lists with sets to make requests comparable
@@ -348,3 +555,141 @@ class TestTorrentBandwidthLimit(TorrentAPITestCase):
         )
         await self.api.adjust_limit_rate_up(TorrentFilter('id=1|id=2'), -50e3)
         self.daemon.requests == ()  # Assert no requests were sent
+
+    async def test_one_request_for_each_new_limit(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'name': 'Foo', 'uploadLimit': 100, 'uploadLimited': True},
+            {'id': 2, 'name': 'Bar', 'uploadLimit': 200, 'uploadLimited': True},
+            {'id': 3, 'name': 'Baz', 'uploadLimit': 100, 'uploadLimited': True},
+        )
+        self.daemon.requests.clear()
+        await self.api.adjust_limit_rate_up(TorrentFilter('all'), 50e3)
+        self.assertEqual([req['method'] for req in self.daemon.requests],
+                         ['torrent-get', 'torrent-get', 'torrent-set', 'torrent-set', 'torrent-get'])
+
+
+class TestTorrentLabels(TorrentAPITestCase):
+    async def test_one_request_for_each_label_set(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'name': 'Foo', 'labels': ['a']},
+            {'id': 2, 'name': 'Bar', 'labels': []},
+            {'id': 3, 'name': 'Baz', 'labels': ['a']},
+        )
+        self.daemon.requests.clear()
+        response = await self.api.labels_add((1, 2, 3), ('b',))
+        self.assertEqual([req['method'] for req in self.daemon.requests],
+                         ['torrent-get', 'torrent-set', 'torrent-set', 'torrent-get'])
+        set_requests = sorted((sorted(req['arguments']['ids']), sorted(req['arguments']['labels']))
+                              for req in self.daemon.requests if req['method'] == 'torrent-set')
+        self.assertEqual(set_requests, [([1, 3], ['a', 'b']), ([2], ['b'])])
+        self.assertEqual(response.success, True)
+        self.assertEqual(sorted(response.msgs), ['Bar: Adding labels: b', 'Baz: Adding labels: b',
+                                                 'Foo: Adding labels: b'])
+
+
+class TestRequestingFiles(asynctest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.fake_torrents = {1: {'id': 1, 'name': 'Torrent1', 'downloadDir': '/foo',
+                                  'files': [{'name': 'Torrent1', 'length': 100, 'bytesCompleted': 0}],
+                                  'fileStats': [{'bytesCompleted': 0, 'priority': 0, 'wanted': True}]}}
+
+        async def torrent_get(fields, ids=None):
+            self.requests.append(tuple(sorted(fields)))
+            return [{f: copy.deepcopy(t[f]) for f in fields}
+                    for tid,t in self.fake_torrents.items()
+                    if ids is None or tid in ids]
+
+        rpc = asynctest.Mock(torrent_get=torrent_get)
+        self.api = TorrentAPI(rpc)
+
+    async def test_files_are_requested_once(self):
+        response = await self.api.torrents(keys=('files',))
+        tree = response.torrents[0]['files']
+        self.assertEqual(tree['Torrent1']['size-downloaded'], 0)
+        self.assertEqual(self.requests, [('downloadDir', 'fileStats', 'id'), ('files', 'id')])
+
+        self.requests.clear()
+        self.fake_torrents[1]['fileStats'][0]['bytesCompleted'] = 50
+        response = await self.api.torrents(keys=('files',))
+        self.assertIs(response.torrents[0]['files'], tree)
+        self.assertEqual(tree['Torrent1']['size-downloaded'], 50)
+        self.assertEqual(self.requests, [('downloadDir', 'fileStats', 'id')])
+
+    async def test_files_are_requested_when_metadata_arrives(self):
+        self.fake_torrents[1]['files'] = []
+        self.fake_torrents[1]['fileStats'] = []
+        await self.api.torrents(keys=('files',))
+        self.requests.clear()
+        await self.api.torrents(keys=('files',))
+        self.assertEqual(self.requests, [('downloadDir', 'fileStats', 'id')])
+
+        self.requests.clear()
+        self.fake_torrents[1]['files'] = [{'name': 'Torrent1', 'length': 100, 'bytesCompleted': 0}]
+        self.fake_torrents[1]['fileStats'] = [{'bytesCompleted': 0, 'priority': 0, 'wanted': True}]
+        response = await self.api.torrents(keys=('files',))
+        self.assertEqual(self.requests, [('downloadDir', 'fileStats', 'id'), ('files', 'id')])
+        self.assertEqual(response.torrents[0]['files']['Torrent1']['size-total'], 100)
+
+
+class TestThrottlingTrackerStats(asynctest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.fake_torrents = {1: {'id': 1, 'name': 'Torrent1', 'status': 0, 'percentDone': 1,
+                                  'metadataPercentComplete': 1, 'rateDownload': 0,
+                                  'rateUpload': 0, 'peersConnected': 0, 'isPrivate': True,
+                                  'trackerStats': [{'id': 0, 'hasAnnounced': True,
+                                                    'lastAnnounceSucceeded': True}]}}
+
+        async def torrent_get(fields, ids=None):
+            self.requests.append('trackerStats' in fields)
+            return [{f: copy.deepcopy(t[f]) for f in fields}
+                    for tid,t in self.fake_torrents.items()
+                    if ids is None or tid in ids]
+
+        self.api = TorrentAPI(asynctest.Mock(torrent_get=torrent_get))
+
+    async def test_trackerStats_is_requested_with_empty_cache(self):
+        response = await self.api.torrents(keys=('status',))
+        self.assertEqual(response.torrents[0]['status'], ('stopped', 'idle'))
+        self.assertEqual(self.requests, [True])
+
+    async def test_trackerStats_is_requested_when_outdated(self):
+        self.fake_torrents[2] = dict(copy.deepcopy(self.fake_torrents[1]), id=2)
+        await self.api.torrents(keys=('status',))
+        self.requests.clear()
+        del self.api._tcache._times[(1, 'trackerStats')]
+        response = await self.api.torrents(keys=('status',))
+        self.assertEqual(response.torrents[0]['status'], ('stopped', 'idle'))
+        self.assertEqual(self.requests, [False, True])
+
+        self.requests.clear()
+        await self.api.torrents(keys=('status',))
+        self.assertEqual(self.requests, [False])
+
+        self.requests.clear()
+        self.api.tracker_stats_max_age = 0
+        await self.api.torrents(keys=('status',))
+        self.assertEqual(self.requests, [False, True])
+
+    def test_trackerStats_expire_at_different_times(self):
+        from stig.client.aiotransmission.api_torrent import _TorrentCache
+        cache = _TorrentCache()
+        with asynctest.patch('time.monotonic', return_value=1000):
+            cache.update([{'id': tid, 'trackerStats': []} for tid in range(1, 101)])
+        expired = []
+        for now in (1010, 1015, 1020, 1025, 1031):
+            with asynctest.patch('time.monotonic', return_value=now):
+                expired.append(sum(cache.is_outdated({'id': tid}, 'trackerStats', max_age=30)
+                                   for tid in range(1, 101)))
+        # Expiry is spread evenly between max_age/2 and max_age
+        self.assertEqual(expired[:2], [0, 0])
+        self.assertTrue(20 <= expired[2] <= 45, expired)
+        self.assertTrue(55 <= expired[3] <= 80, expired)
+        self.assertEqual(expired[4], 100)
+
+    async def test_trackerStats_is_always_requested_for_trackers(self):
+        for _ in range(2):
+            self.requests.clear()
+            await self.api.torrents(keys=('status', 'trackers'))
+            self.assertEqual(self.requests, [True])
@@ -73,6 +73,27 @@ class TestTorrent(unittest.TestCase):
         self.assertEqual(set(t), {'id', 'name', 'rate-down', 'hash',
                                   'time-created', '%verified'})
 
+    def test_revision(self):
+        t = torrent.Torrent({'id': 1, 'name': 'foo', 'rateDownload': 100})
+        rev = t.revision
+        t.update({'id': 1, 'rateDownload': 100})
+        self.assertEqual(t.revision, rev)
+        t.update({'id': 1, 'rateDownload': 200})
+        self.assertNotEqual(t.revision, rev)
+        self.assertNotEqual(torrent.Torrent({'id': 1}).revision, t.revision)
+
+    def test_repeated_values_are_shared(self):
+        import json
+        raw = json.dumps({'downloadDir': '/some/where', 'status': 0, 'labels': ['foo'],
+                          'trackerStats': [{'announce': 'http://tracker.example'}]})
+        t1 = torrent.Torrent({'id': 1, **json.loads(raw)})
+        t2 = torrent.Torrent({'id': 2, **json.loads(raw)})
+        self.assertIs(t1._raw['downloadDir'], t2._raw['downloadDir'])
+        self.assertIs(t1._raw['labels'][0], t2._raw['labels'][0])
+        self.assertIs(t1._raw['trackerStats'][0]['announce'], t2._raw['trackerStats'][0]['announce'])
+        self.assertIs(t1['path'], t2['path'])
+        self.assertIs(t1['status'], t2['status'])
+
 class TestTorrentFileTree(unittest.TestCase):
     def test_update(self):
         raw = {'id': 1, 'name': 'Fake torrent', 'downloadDir': '/a/path',
@@ -100,3 +121,105 @@ class TestTorrentFileTree(unittest.TestCase):
         self.assertEqual(ft['Fake torrent']['file1']['size-downloaded'], 500)
         self.assertEqual(ft['Fake torrent']['subdir']['file2']['%downloaded'], 10)
         self.assertEqual(ft['Fake torrent']['subdir']['file2']['size-downloaded'], 200)
+
+    def test_directory_sums(self):
+        raw = {'id': 1, 'name': 'T', 'downloadDir': '/a/path',
+               'fileStats': [{'bytesCompleted': 10, 'priority': 0, 'wanted': True},
+                             {'bytesCompleted': 20, 'priority': 0, 'wanted': True},
+                             {'bytesCompleted': 30, 'priority': 1, 'wanted': True}],
+               'files': [{'bytesCompleted': 10, 'length': 100, 'name': 'T/a/f1'},
+                         {'bytesCompleted': 20, 'length': 200, 'name': 'T/a/b/f2'},
+                         {'bytesCompleted': 30, 'length': 300, 'name': 'T/f3'}]}
+        ft = torrent.TorrentFileTree.create(raw)
+        root, a, b = ft['T'], ft['T']['a'], ft['T']['a']['b']
+        self.assertEqual(sorted(root), ['a', 'f3'])
+        self.assertEqual([name for name,_ in ft.directories], ['T', 'a', 'b'])
+        self.assertEqual(b.path, 'T/a/b')
+        self.assertEqual(str(b['f2']['path-absolute']), '/a/path/T/a/b/f2')
+        self.assertEqual((root.file_count, a.file_count, b.file_count), (3, 2, 1))
+        self.assertEqual((root.size_total, a.size_total, b.size_total), (600, 300, 200))
+        self.assertEqual((root.size_downloaded, a.size_downloaded, b.size_downloaded), (60, 30, 20))
+        self.assertEqual((root.priority, a.priority, b.priority), ('', 'normal', 'normal'))
+        self.assertEqual((root.first_file['name'], a.first_file['name'], b.first_file['name']),
+                         ('f1', 'f1', 'f2'))
+
+        raw['fileStats'][1] = {'bytesCompleted': 120, 'priority': 0, 'wanted': False}
+        self.assertTrue(ft.update({'fileStats': raw['fileStats']}))
+        self.assertEqual((root.size_downloaded, a.size_downloaded, b.size_downloaded), (160, 130, 120))
+        self.assertEqual((root.priority, a.priority, b.priority), ('', '', 'off'))
+        self.assertEqual(b['f2']['size-downloaded'], 120)
+        self.assertEqual(b['f2']['priority'], 'off')
+
+        self.assertFalse(ft.update({'fileStats': raw['fileStats'][:2]}))
+
+
+def _raw_peer(address, progress, rate=0):
+    return {'address': address, 'port': 51413, 'clientName': 'Fake client',
+            'progress': progress, 'rateToPeer': 0, 'rateToClient': rate}
+
+
+def _raw_tracker(id, announce, seeders=0):
+    return {'id': id, 'tier': 0, 'announce': announce, 'scrape': announce + '/scrape',
+            'announceState': 1, 'scrapeState': 1, 'hasAnnounced': False, 'hasScraped': False,
+            'lastAnnounceResult': '', 'lastScrapeResult': '',
+            'lastAnnounceTime': 0, 'lastScrapeTime': 0, 'nextAnnounceTime': 0, 'nextScrapeTime': 0,
+            'downloadCount': 0, 'leecherCount': 0, 'seederCount': seeders}
+
+
+class TestPeerList(unittest.TestCase):
+    def test_peers_are_updated_in_place(self):
+        t = torrent.Torrent({'id': 1, 'name': 'T', 'totalSize': 1000,
+                             'peers': [_raw_peer('1.2.3.4', 0.1), _raw_peer('5.6.7.8', 0.5)]})
+        peers = t['peers']
+        p1, p2 = peers
+        self.assertEqual(p1['%downloaded'], 10)
+
+        t.update({'id': 1, 'name': 'T', 'totalSize': 1000,
+                  'peers': [_raw_peer('1.2.3.4', 0.2, rate=100), _raw_peer('9.9.9.9', 0)]})
+        self.assertIs(t['peers'], peers)
+        self.assertIs(peers[0], p1)
+        self.assertEqual(p1['%downloaded'], 20)
+        self.assertEqual(p1['downloaded'], 200)
+        self.assertEqual(p1['rate-down'], 100)
+        self.assertEqual([p['ip'] for p in peers], ['1.2.3.4', '9.9.9.9'])
+        self.assertIsNot(peers[1], p2)
+
+    def test_revision_changes_when_peers_come_and_go(self):
+        raw = {'id': 1, 'name': 'T', 'totalSize': 1000, 'peers': [_raw_peer('1.2.3.4', 0.1)]}
+        peers = torrent.PeerList(raw)
+        rev = peers.revision
+        peers.update({**raw, 'peers': [_raw_peer('1.2.3.4', 0.2)]})
+        self.assertEqual(peers.revision, rev)
+        peers.update({**raw, 'peers': [_raw_peer('1.2.3.4', 0.2), _raw_peer('5.6.7.8', 0)]})
+        self.assertNotEqual(peers.revision, rev)
+
+    def test_incomplete_fields_create_new_list(self):
+        t = torrent.Torrent({'id': 1, 'name': 'T', 'totalSize': 1000,
+                             'peers': [_raw_peer('1.2.3.4', 0.1)]})
+        peers = t['peers']
+        t.update({'id': 1, 'name': 'T2'})
+        self.assertIsNot(t['peers'], peers)
+        self.assertEqual(t['peers'][0]['tname'], 'T2')
+
+
+class TestTrackerList(unittest.TestCase):
+    def test_trackers_are_updated_in_place(self):
+        t = torrent.Torrent({'id': 1, 'name': 'T',
+                             'trackerStats': [_raw_tracker(0, 'http://a.example'),
+                                              _raw_tracker(1, 'http://b.example')]})
+        trackers = t['trackers']
+        trk_a, trk_b = trackers
+        self.assertEqual(trk_b['count-seeds'], 0)
+
+        t.update({'id': 1, 'name': 'T',
+                  'trackerStats': [_raw_tracker(0, 'http://a.example'),
+                                   _raw_tracker(1, 'http://b.example', seeders=5)]})
+        self.assertIs(t['trackers'], trackers)
+        self.assertEqual(list(trackers), [trk_a, trk_b])
+        self.assertIs(trackers[1], trk_b)
+        self.assertEqual(trk_b['count-seeds'], 5)
+
+        t.update({'id': 1, 'name': 'T',
+                  'trackerStats': [_raw_tracker(1, 'http://b.example', seeders=5)]})
+        self.assertEqual(len(trackers), 1)
+        self.assertIs(trackers[0], trk_b)
@@ -26,9 +26,24 @@ class TestFreeSpaceAPI(asynctest.ClockedTestCase):
         self.update_cb = Mock(spec=lambda self: None, __qualname__='mock_callback')
         self.freespace.on_update(self.update_cb)
 
-    async def test_hooks_into_settings_updates(self):
+    async def test_hooks_into_settings_updates_and_responses(self):
         self.assertEqual(self.mock_settings.on_update.call_args_list,
                          [call(self.freespace._gather_info_wrapper)])
+        self.assertEqual(self.mock_settings.on_response.call_args_list,
+                         [call(self.freespace._gather_info_wrapper, unchanged=True)])
+
+    async def test_settings_without_responses(self):
+        settings = Mock(spec=('on_update',))
+        type(self.freespace)(self.path_getters, None, settings)
+        self.assertEqual(settings.on_update.call_count, 1)
+
+    async def test_info_is_gathered_once_for_both_hooks(self):
+        self.get_free_space.side_effect = (123, 456)
+        self.freespace._gather_info_wrapper(self.mock_settings)
+        self.freespace._gather_info_wrapper({'some': 'response'})
+        await self.freespace._gather_task
+        self.assertEqual(self.get_free_space.call_count, 2)
+        self.assertEqual(self.update_cb.call_args_list, [call(self.freespace)])
 
     async def test_info_is_updated(self):
         self.get_free_space.side_effect = (123, 456)
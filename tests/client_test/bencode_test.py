@@ -0,0 +1,25 @@
+import hashlib
+import unittest
+
+from stig.client.bencode import info_hash
+
+
+class TestInfoHash(unittest.TestCase):
+    def test_info_hash(self):
+        info = b'd6:lengthi123e4:name3:foo6:piecesl2:ab2:cdee'
+        data = b'd8:announce14:http://foo/bar7:comment0:4:info' + info + b'3:zzzi-1ee'
+        self.assertEqual(info_hash(data), hashlib.sha1(info).hexdigest())
+
+    def test_info_is_last_key(self):
+        info = b'd4:name3:fooe'
+        self.assertEqual(info_hash(b'd4:info' + info + b'e'), hashlib.sha1(info).hexdigest())
+
+    def test_nested_lists_and_dictionaries(self):
+        info = b'd5:filesld6:lengthi1e4:pathl1:a1:beed6:lengthi2e4:pathl1:ceeee'
+        data = b'd13:announce-listll1:ael1:bee4:info' + info + b'e'
+        self.assertEqual(info_hash(data), hashlib.sha1(info).hexdigest())
+
+    def test_invalid_data(self):
+        for data in (b'', b'le', b'i1e', b'd3:fooi1ee', b'd3:foo', b'd3:fooxe', b'd4:info99:abce'):
+            with self.assertRaises(ValueError, msg=repr(data)):
+                info_hash(data)
@@ -217,3 +217,38 @@ class TestRequestPoller(asynctest.ClockedTestCase):
         await self.advance(0)
         self.assertEqual(self.mock_request_calls, 3)
         await rp.stop()
+
+    async def test_fingerprint_skips_unchanged_responses(self):
+        responses = iter((1, 1, 2, 2, 2, 3))
+
+        async def mock_request():
+            return next(responses)
+
+        rp = self.make_poller(mock_request, fingerprint=lambda r: r)
+        changed = []
+        rp.on_response(changed.append, autoremove=False)
+        every = []
+        rp.on_response(every.append, autoremove=False, unchanged=True)
+        await rp.start()
+        await self.advance(0)
+        await self.advance(rp.interval * 5)
+        self.assertEqual(changed, [1, 2, 3])
+        self.assertEqual(every, [1, 1, 2, 2, 2, 3])
+        self.assertEqual(rp.stats, {'responses': 3, 'skipped': 3})
+        await rp.stop()
+
+    async def test_fingerprint_is_forgotten_on_manual_poll(self):
+        async def mock_request():
+            return 'same'
+
+        rp = self.make_poller(mock_request, fingerprint=lambda r: r)
+        responses = []
+        rp.on_response(responses.append, autoremove=False)
+        await rp.start()
+        await self.advance(0)
+        await self.advance(rp.interval)
+        self.assertEqual(responses, ['same'])
+        rp.poll()
+        await self.advance(0)
+        self.assertEqual(responses, ['same', 'same'])
+        await rp.stop()
@@ -0,0 +1,94 @@
+import asyncio
+from unittest.mock import patch
+
+import asynctest
+
+from stig.client.priority import (Priority, PriorityLock, RequestContext, _DefaultVar,
+                                  current_request_context, request_priority)
+
+
+class TestRequestPriority(asynctest.TestCase):
+    def test_default_priority(self):
+        self.assertEqual(current_request_context().priority, Priority.NORMAL)
+        self.assertEqual(current_request_context().preempt, None)
+
+    def test_priority_is_reset(self):
+        with request_priority(Priority.BACKGROUND, preempt=print):
+            self.assertEqual(current_request_context().priority, Priority.BACKGROUND)
+            self.assertEqual(current_request_context().preempt, print)
+            with request_priority(Priority.INTERACTIVE):
+                self.assertEqual(current_request_context().priority, Priority.INTERACTIVE)
+            self.assertEqual(current_request_context().priority, Priority.BACKGROUND)
+        self.assertEqual(current_request_context().priority, Priority.NORMAL)
+
+    def test_priority_without_contextvars(self):
+        default = RequestContext(priority=Priority.NORMAL, preempt=None)
+        with patch('stig.client.priority._request_context', _DefaultVar('request_context', default)):
+            with request_priority(Priority.INTERACTIVE):
+                self.assertEqual(current_request_context(), default)
+            self.assertEqual(current_request_context(), default)
+
+    async def test_tasks_inherit_priority(self):
+        async def get_priority():
+            return current_request_context().priority
+        with request_priority(Priority.INTERACTIVE):
+            task = asyncio.ensure_future(get_priority())
+        self.assertEqual(await task, Priority.INTERACTIVE)
+
+
+class TestPriorityLock(asynctest.TestCase):
+    async def test_waiters_get_lock_by_priority(self):
+        lock = PriorityLock()
+        order = []
+
+        async def request(name, priority):
+            with request_priority(priority):
+                async with lock:
+                    order.append(name)
+                    await asyncio.sleep(0)
+
+        await lock.acquire()
+        tasks = [asyncio.ensure_future(request('bg1', Priority.BACKGROUND)),
+                 asyncio.ensure_future(request('normal', Priority.NORMAL)),
+                 asyncio.ensure_future(request('bg2', Priority.BACKGROUND)),
+                 asyncio.ensure_future(request('interactive', Priority.INTERACTIVE))]
+        await asyncio.sleep(0)
+        self.assertEqual(order, [])
+        lock.release()
+        await asyncio.gather(*tasks)
+        self.assertEqual(order, ['interactive', 'normal', 'bg1', 'bg2'])
+        self.assertFalse(lock.locked())
+
+    async def test_cancelled_waiter_is_skipped(self):
+        lock = PriorityLock()
+        await lock.acquire()
+        task = asyncio.ensure_future(lock.acquire())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.sleep(0)
+        lock.release()
+        self.assertFalse(lock.locked())
+
+    async def test_preempting_background_request(self):
+        preempted = []
+
+        async def background_request(lock):
+            with request_priority(Priority.BACKGROUND, preempt=lambda: preempted.append(True)):
+                async with lock:
+                    await asyncio.sleep(0)
+                    await asyncio.sleep(0)
+
+        async def interactive_request(lock):
+            with request_priority(Priority.INTERACTIVE):
+                async with lock:
+                    pass
+
+        for preempt in (False, True):
+            preempted.clear()
+            lock = PriorityLock(preempt=preempt)
+            bg_task = asyncio.ensure_future(background_request(lock))
+            await asyncio.sleep(0)
+            self.assertTrue(lock.locked())
+            await interactive_request(lock)
+            await bg_task
+            self.assertEqual(preempted, [True] if preempt else [])
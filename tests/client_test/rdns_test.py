@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+import asynctest
+
+from stig.client.rdns import Resolver
+
+
+class TestResolver(asynctest.TestCase):
+    def setUp(self):
+        self.lookups = []
+        self.release = threading.Event()
+        self.release.set()
+
+        def lookup(ip):
+            self.lookups.append(ip)
+            self.release.wait(timeout=5)
+            return None if ip.startswith('10.') else 'host-%s' % ip
+        patcher = patch('stig.client.rdns._lookup', lookup)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.now = 1000
+        patcher = patch('stig.client.rdns.time', Mock(monotonic=lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_concurrent_lookups_are_made_once(self):
+        r = Resolver()
+        self.release.clear()
+        tasks = [asyncio.ensure_future(r.resolve('1.2.3.4')) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        self.assertEqual(r.stats, {'cached': 0, 'pending': 1})
+        self.release.set()
+        self.assertEqual(await asyncio.gather(*tasks), ['host-1.2.3.4'] * 5)
+        self.assertEqual(self.lookups, ['1.2.3.4'])
+        self.assertEqual(r.stats, {'cached': 1, 'pending': 0})
+        self.assertEqual(r.cached('1.2.3.4'), 'host-1.2.3.4')
+
+    async def test_failed_lookups_expire_sooner(self):
+        r = Resolver(ttl=100, negative_ttl=10)
+        self.assertEqual(await r.resolve('10.0.0.1'), '10.0.0.1')
+        self.assertEqual(await r.resolve('1.2.3.4'), 'host-1.2.3.4')
+        self.assertEqual(r.cached('10.0.0.1'), '10.0.0.1')
+        self.now += 20
+        self.assertEqual(r.cached('10.0.0.1'), None)
+        self.assertEqual(r.cached('1.2.3.4'), 'host-1.2.3.4')
+        self.now += 100
+        self.assertEqual(r.cached('1.2.3.4'), None)
+
+    async def test_max_size(self):
+        r = Resolver(max_size=2)
+        for ip in ('1.1.1.1', '2.2.2.2', '3.3.3.3'):
+            await r.resolve(ip)
+        self.assertEqual(r.cached('1.1.1.1'), None)
+        self.assertEqual(r.stats['cached'], 2)
+
+    async def test_callbacks_are_batched(self):
+        r = Resolver(batch_delay=0.01)
+        hostnames, batches = [], []
+        r.on_resolved(lambda: batches.append(list(hostnames)))
+        r.query('1.1.1.1', '2.2.2.2', '10.0.0.1', callback=hostnames.append)
+        await asyncio.sleep(0.2)
+        self.assertEqual(sorted(hostnames), ['10.0.0.1', 'host-1.1.1.1', 'host-2.2.2.2'])
+        self.assertEqual(len(batches), 1)
+
+        # Cached hostnames are reported immediately
+        r.query('1.1.1.1', callback=hostnames.append)
+        self.assertEqual(hostnames[-1], 'host-1.1.1.1')
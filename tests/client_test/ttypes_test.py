@@ -1,5 +1,6 @@
 import random
 import unittest
+from unittest.mock import patch
 
 from stig.client import ttypes
 
@@ -60,3 +61,89 @@ class TestTorrentFilePriority(unittest.TestCase):
 
         for _ in range(10):
             self.assertEqual(sorted(shuffle(prios)), prios)
+
+
+class TestTorrentFile(unittest.TestCase):
+    def make_file(self, **kwargs):
+        args = dict(tid=1, id=2, name='foo', path='bar', location='/baz',
+                    size_total=100, size_downloaded=50, is_wanted=True, priority='normal')
+        args.update(kwargs)
+        return ttypes.TorrentFile(**args)
+
+    def test_priority_is_off_after_file_is_unwanted(self):
+        tfile = self.make_file()
+        self.assertEqual(tfile['priority'], 'normal')
+        tfile.update({'is-wanted': False})
+        self.assertEqual(tfile['priority'], 'off')
+        tfile.update({'is-wanted': True})
+        self.assertEqual(tfile['priority'], 'normal')
+
+    def test_percent_downloaded_is_updated(self):
+        tfile = self.make_file()
+        self.assertEqual(tfile['%downloaded'], 50)
+        tfile.update({'size-downloaded': 75})
+        self.assertEqual(tfile['%downloaded'], 75)
+
+
+class TestPeerRateEstimator(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000
+        patcher = patch('time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def estimate(self, estimator, progress, seconds_later=10, peer_id='peer'):
+        self.now += seconds_later
+        rate, eta = estimator.estimate(peer_id, progress, 1000)
+        if rate:
+            return round(rate, 3), round(eta, 3)
+        return rate, eta
+
+    def test_rate_needs_two_changes(self):
+        est = ttypes.PeerRateEstimator()
+        self.assertEqual(self.estimate(est, 0.1), (0, ttypes.utils.Timedelta.UNKNOWN))
+        self.assertEqual(self.estimate(est, 0.1), (0, ttypes.utils.Timedelta.UNKNOWN))
+        self.assertEqual(self.estimate(est, 0.2), (0, ttypes.utils.Timedelta.UNKNOWN))
+        self.assertEqual(self.estimate(est, 0.3), (10, 70))
+        self.assertEqual(self.estimate(est, 0.3), (10, 70))
+
+    def test_rate_is_averaged(self):
+        est = ttypes.PeerRateEstimator(time_constant=10)
+        self.estimate(est, 0.1)
+        self.estimate(est, 0.2)
+        self.estimate(est, 0.3)
+        rate, eta = self.estimate(est, 0.5)
+        self.assertGreater(rate, 10)
+        self.assertLess(rate, 20)
+        self.assertAlmostEqual(eta, 500 / rate, places=2)
+
+    def test_decreasing_progress_resets_rate(self):
+        est = ttypes.PeerRateEstimator()
+        for progress in (0.1, 0.2, 0.3):
+            self.estimate(est, progress)
+        self.assertEqual(self.estimate(est, 0.2), (0, ttypes.utils.Timedelta.UNKNOWN))
+        self.assertEqual(self.estimate(est, 0.4), (20, 30))
+
+    def test_complete_peers_are_forgotten(self):
+        est = ttypes.PeerRateEstimator()
+        self.estimate(est, 0.5)
+        self.assertEqual(self.estimate(est, 1), (0, ttypes.utils.Timedelta.NOT_APPLICABLE))
+        self.assertEqual(est.stats['size'], 0)
+
+    def test_max_size(self):
+        est = ttypes.PeerRateEstimator(max_size=3)
+        for i in range(5):
+            self.estimate(est, 0.5, peer_id=i)
+        self.estimate(est, 0.5, peer_id=2)
+        self.estimate(est, 0.5, peer_id=5)
+        self.assertEqual(tuple(est._peers), (4, 2, 5))
+        self.assertEqual(est.stats, {'size': 3, 'evicted': 3, 'expired': 0})
+
+    def test_prune(self):
+        est = ttypes.PeerRateEstimator(max_age=99)
+        for i in range(5):
+            self.estimate(est, 0.5, peer_id=i, seconds_later=30)
+        self.estimate(est, 0.5, peer_id=0)
+        est.prune()
+        self.assertEqual(tuple(est._peers), (2, 3, 4, 0))
+        self.assertEqual(est.stats, {'size': 4, 'evicted': 0, 'expired': 1})
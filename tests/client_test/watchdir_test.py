@@ -0,0 +1,145 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import asynctest
+
+from stig.client.utils import Response
+from stig.client.watchdir import WatchDir
+
+
+class TestWatchDir(asynctest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+        self.add_calls = []
+        self.failing = set()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    async def mock_add(self, filepaths, **kwargs):
+        self.add_calls.append((filepaths, kwargs))
+        results = tuple(Response(success=os.path.basename(fp) not in self.failing)
+                        for fp in filepaths)
+        return Response(success=all(r.success for r in results),
+                        torrents=(), results=results)
+
+    def make_file(self, name, content=b'd4:infod4:name3:fooee'):
+        path = os.path.join(self.dir, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def listdir(self, *subdirs):
+        path = os.path.join(self.dir, *subdirs)
+        if os.path.isdir(path):
+            return sorted(name for name in os.listdir(path)
+                          if os.path.isfile(os.path.join(path, name)))
+        return []
+
+    async def test_added_files_are_moved(self):
+        for name in ('a.torrent', 'b.torrent', 'notes.txt', '.c.torrent'):
+            self.make_file(name)
+        self.failing.add('b.torrent')
+        watcher = WatchDir(self.mock_add, self.dir, settle=0, stopped=True, labels=['foo'])
+        self.assertEqual(await watcher.run(once=True), False)
+        self.assertEqual(self.add_calls, [([os.path.join(self.dir, 'a.torrent'),
+                                            os.path.join(self.dir, 'b.torrent')],
+                                           {'stopped': True, 'labels': ['foo']})])
+        self.assertEqual(self.listdir(), ['.c.torrent', 'notes.txt'])
+        self.assertEqual(self.listdir('done'), ['a.torrent'])
+        self.assertEqual(self.listdir('failed'), ['b.torrent'])
+
+    async def test_batch_size(self):
+        for i in range(5):
+            self.make_file('%d.torrent' % i)
+        watcher = WatchDir(self.mock_add, self.dir, settle=0, batch_size=2)
+        self.assertEqual(await watcher.run(once=True), True)
+        self.assertEqual([len(filepaths) for filepaths, _ in self.add_calls], [2, 2, 1])
+        self.assertEqual(self.listdir('done'), ['%d.torrent' % i for i in range(5)])
+
+    async def test_files_are_kept_if_nothing_was_added(self):
+        self.make_file('a.torrent')
+
+        async def add(filepaths):
+            return Response(success=False, torrents=(), results=(), errors=('Daemon is gone',))
+        watcher = WatchDir(add, self.dir, settle=0)
+        self.assertEqual(await watcher.run(once=True), False)
+        self.assertEqual(self.listdir(), ['a.torrent'])
+
+    async def test_response_is_reported(self):
+        self.make_file('a.torrent')
+        responses = []
+        watcher = WatchDir(self.mock_add, self.dir, settle=0)
+        watcher.on_response(responses.append, autoremove=False)
+        await watcher.run(once=True)
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(responses[0].success, True)
+
+    def test_unsettled_files_are_not_ready(self):
+        watcher = WatchDir(self.mock_add, self.dir, settle=5)
+        path = self.make_file('a.torrent')
+        empty_path = self.make_file('empty.torrent', content=b'')
+        with patch('time.monotonic', return_value=100):
+            self.assertEqual(watcher._find_ready_files(), [])
+        with patch('time.monotonic', return_value=104):
+            self.assertEqual(watcher._find_ready_files(), [])
+        # File is still being written
+        self.make_file('a.torrent', content=b'd4:infod4:name3:foo4:more3:baree')
+        os.utime(path, ns=(1, 1))
+        with patch('time.monotonic', return_value=106):
+            self.assertEqual(watcher._find_ready_files(), [])
+        with patch('time.monotonic', return_value=111):
+            self.assertEqual(watcher._find_ready_files(), [path])
+        self.assertEqual(list(watcher._pending), [empty_path])
+
+    async def test_new_files_are_noticed_with_inotify(self):
+        await self.assert_new_files_are_noticed()
+
+    @patch('stig.client.watchdir._inotify_fd', return_value=None)
+    async def test_new_files_are_noticed_without_inotify(self, _):
+        await self.assert_new_files_are_noticed()
+
+    async def assert_new_files_are_noticed(self):
+        watcher = WatchDir(self.mock_add, self.dir, interval=0.05, settle=0.05)
+        watcher.start()
+        self.assertEqual(watcher.running, True)
+        await asyncio.sleep(0.1)
+        self.make_file('a.torrent')
+        for _ in range(100):
+            if self.listdir('done'):
+                break
+            await asyncio.sleep(0.02)
+        await watcher.stop()
+        self.assertEqual(watcher.running, False)
+        self.assertEqual(self.listdir('done'), ['a.torrent'])
+
+    async def test_removed_directory_stops_watching(self):
+        subdir = os.path.join(self.dir, 'sub')
+        os.mkdir(subdir)
+        stopped = []
+        watcher = WatchDir(self.mock_add, subdir, interval=0.05, settle=0.05)
+        watcher.on_stopped(stopped.append, autoremove=False)
+        watcher.start()
+        await asyncio.sleep(0.1)
+        shutil.rmtree(subdir)
+        for _ in range(100):
+            if not watcher.running:
+                break
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0)  # Let done callback run
+        self.assertEqual(watcher.running, False)
+        self.assertEqual(stopped, [watcher])
+
+    async def test_stop_is_not_reported_as_stopped(self):
+        stopped = []
+        watcher = WatchDir(self.mock_add, self.dir, interval=0.05)
+        watcher.on_stopped(stopped.append, autoremove=False)
+        watcher.start()
+        await asyncio.sleep(0.1)
+        await watcher.stop()
+        await asyncio.sleep(0)
+        self.assertEqual(stopped, [])
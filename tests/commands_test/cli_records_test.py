@@ -0,0 +1,73 @@
+import contextlib
+import io
+import json
+import unittest
+
+from stig.client.utils import (Count, Percent, Ratio, SizeInBytes, Status, Timedelta,
+                               Timestamp)
+from stig.commands.cli._records import print_records
+
+ITEMS = ({'id': 1, 'name': 'foo', 'size': SizeInBytes(1000), '%done': Percent(12.5),
+          'status': Status((Status.STOPPED,)), 'labels': {'b', 'a'}, 'ratio': float('inf')},
+         {'id': 2, 'name': 'bar, "baz"', 'size': SizeInBytes(2e6), '%done': Percent(100),
+          'status': Status((Status.IDLE,)), 'labels': set(), 'ratio': 1.5})
+KEYS = ('id', 'name', 'size', '%done', 'status', 'labels', 'ratio')
+
+
+def print_records_output(items, format, keys=KEYS):
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        print_records(items, keys, format)
+    return buf.getvalue()
+
+
+class TestPrintRecords(unittest.TestCase):
+    def test_json(self):
+        output = print_records_output(ITEMS, 'json')
+        self.assertEqual(output.count('\n'), 2)
+        self.assertEqual(json.loads(output), [
+            {'id': 1, 'name': 'foo', 'size': 1000, '%done': 12.5,
+             'status': ['stopped'], 'labels': ['a', 'b'], 'ratio': None},
+            {'id': 2, 'name': 'bar, "baz"', 'size': 2000000, '%done': 100,
+             'status': ['idle'], 'labels': [], 'ratio': 1.5},
+        ])
+
+    def test_json_without_items(self):
+        self.assertEqual(print_records_output((), 'json'), '[]\n')
+
+    def test_ndjson(self):
+        lines = print_records_output(ITEMS, 'ndjson', keys=('id', 'size')).split('\n')
+        self.assertEqual(lines, ['{"id": 1, "size": 1000}', '{"id": 2, "size": 2000000}', ''])
+
+    def test_csv(self):
+        lines = print_records_output(ITEMS, 'csv').split('\n')
+        self.assertEqual(lines, ['id,name,size,%done,status,labels,ratio',
+                                 '1,foo,1000,12.5,"[""stopped""]","[""a"", ""b""]",',
+                                 '2,"bar, ""baz""",2000000,100.0,"[""idle""]",[],1.5',
+                                 ''])
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            print_records_output(ITEMS, 'xml')
+
+    def test_unknown_and_not_applicable_values_are_null(self):
+        items = ({'eta': Timedelta(Timedelta.UNKNOWN), 'ratio': Ratio(Ratio.NOT_APPLICABLE),
+                  'started': Timestamp(Timestamp.NEVER), 'seeds': Count(Count.UNKNOWN)},
+                 {'eta': Timedelta(Timedelta.NOT_APPLICABLE), 'ratio': Ratio(2),
+                  'started': Timestamp(Timestamp.SOON), 'seeds': Count(3)},
+                 {'eta': Timedelta(60), 'ratio': Ratio(0),
+                  'started': Timestamp(Timestamp.NOW), 'seeds': Count(0)},
+                 {'eta': Timedelta(0), 'ratio': Ratio(0),
+                  'started': Timestamp(Timestamp.UNKNOWN), 'seeds': Count(0)},
+                 {'eta': Timedelta(0), 'ratio': Ratio(0),
+                  'started': Timestamp(Timestamp.NOT_APPLICABLE), 'seeds': Count(0)})
+        keys = ('eta', 'ratio', 'started', 'seeds')
+        self.assertEqual(json.loads(print_records_output(items, 'json', keys=keys)), [
+            {'eta': None, 'ratio': None, 'started': None, 'seeds': None},
+            {'eta': None, 'ratio': 2, 'started': None, 'seeds': 3},
+            {'eta': 60, 'ratio': 0, 'started': None, 'seeds': 0},
+            {'eta': 0, 'ratio': 0, 'started': None, 'seeds': 0},
+            {'eta': 0, 'ratio': 0, 'started': None, 'seeds': 0},
+        ])
+        lines = print_records_output(items[:3], 'csv', keys=keys).split('\n')
+        self.assertEqual(lines, ['eta,ratio,started,seeds', ',,,', ',2.0,,3', '60,0.0,,0', ''])
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from stig.commands.cli import _table
+from stig.views import ColumnBase
+
+
+class Name(ColumnBase):
+    header = {'left': 'Name'}
+    align = 'left'
+    min_width = 4
+
+    def get_value(self):
+        return self.data['name']
+
+class Size(ColumnBase):
+    header = {'right': 'Size'}
+    width = 6
+    min_width = 6
+
+    def get_value(self):
+        return self.data['size']
+
+COLUMNS = {'name': Name, 'size': Size}
+ITEMS = ({'name': 'foo', 'size': '1kB'}, {'name': 'a much longer name', 'size': '300MB'})
+
+
+def print_table(columns, lines, items=ITEMS, order=('size', 'name'), **kwargs):
+    buf = io.StringIO()
+    with patch.object(_table, 'TERMSIZE', SimpleNamespace(columns=columns, lines=lines)):
+        with contextlib.redirect_stdout(buf):
+            _table.print_table(items, list(order), COLUMNS, **kwargs)
+    return buf.getvalue().split('\n')[:-1]
+
+
+class TestPrintTable(unittest.TestCase):
+    def test_columns_are_as_wide_as_widest_value(self):
+        self.assertEqual(print_table(80, 25), ['\033[1;4m Size│Name              \033[0m',
+                                               '  1kB│foo               ',
+                                               '300MB│a much longer name'])
+
+    def test_widest_column_is_shrunk(self):
+        self.assertEqual(print_table(15, 25), ['\033[1;4m Size│Name     \033[0m',
+                                               '  1kB│foo      ',
+                                               '300MB│a much lo'])
+
+    def test_columns_are_removed_if_they_cannot_shrink(self):
+        self.assertEqual(print_table(8, 25), ['\033[1;4mName    \033[0m',
+                                              'foo     ',
+                                              'a much l'])
+
+    def test_headers_are_repeated(self):
+        lines = print_table(80, 3)
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], lines[2])
+
+    def test_no_tty(self):
+        self.assertEqual(print_table(None, None), ['1kB\tfoo', '300MB\ta much longer name'])
+
+    def test_no_items(self):
+        self.assertEqual(print_table(80, 25, items=()), [])
+
+    def test_column_widths_are_taken_from_sample(self):
+        items = ITEMS + ({'name': 'longer than the sample', 'size': '1GB'},)
+        self.assertEqual(print_table(80, 25, items=items, sample_size=2),
+                         ['\033[1;4m Size│Name              \033[0m',
+                          '  1kB│foo               ',
+                          '300MB│a much longer name',
+                          '  1GB│longer than the sa'])
+
+    def test_rows_are_written_while_items_are_consumed(self):
+        buf = io.StringIO()
+        written = []
+
+        def items():
+            for i in range(3):
+                written.append(buf.getvalue().count('\n'))
+                yield {'name': 'item%d' % i, 'size': '%dkB' % i}
+
+        with patch.object(_table, 'TERMSIZE', SimpleNamespace(columns=80, lines=25)), \
+             patch.object(_table, 'CHUNK_SIZE', 1):
+            with contextlib.redirect_stdout(buf):
+                _table.print_table(items(), ['size', 'name'], COLUMNS, sample_size=1)
+        self.assertEqual(written, [0, 2, 3])
+        self.assertEqual(buf.getvalue().count('\n'), 4)
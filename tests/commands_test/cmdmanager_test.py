@@ -366,6 +366,30 @@ class TestCommandManagerChainedCalls(TestCommandManagerCallsBase):
         self.cmdmgr.register(true_cmd)
         self.cmdmgr.register(false_cmd)
 
+        self.released = asyncio.Event()
+        self.running = 0
+        self.max_running = 0
+
+        async def block_run(self_):
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            await self.released.wait()
+            self.running -= 1
+
+        async def pause_run(self_):
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            for _ in range(3):
+                await asyncio.sleep(0)
+            self.running -= 1
+
+        async def release_run(self_):
+            self.released.set()
+
+        self.cmdmgr.register(make_cmdcls(name='block', run=block_run, argspecs=(), provides=('T',)))
+        self.cmdmgr.register(make_cmdcls(name='pause', run=pause_run, argspecs=(), provides=('T',)))
+        self.cmdmgr.register(make_cmdcls(name='release', run=release_run, argspecs=(), provides=('T',)))
+
     async def assert_success(self, cmdchain):
         success = self.cmdmgr.run_sync(cmdchain)
         self.assertEqual(success, True)
@@ -594,3 +618,54 @@ class TestCommandManagerChainedCalls(TestCommandManagerCallsBase):
               'errors': [('true: Unrecognized arguments: -x',)]}),
         )
         await self.run_testcases(testcases, do_test)
+
+    async def test_parallel_commands_run_at_the_same_time(self):
+        success = await self.cmdmgr.run_async('block , release')
+        self.assertEqual(success, True)
+
+    async def test_concurrency_limit(self):
+        success = await self.cmdmgr.run_async('pause , pause , pause , pause')
+        self.assertEqual(success, True)
+        self.assertEqual(self.max_running, 4)
+
+        self.max_running = 0
+        self.cmdmgr.concurrency = 2
+        success = await self.cmdmgr.run_async('pause , pause , pause , pause')
+        self.assertEqual(success, True)
+        self.assertEqual(self.max_running, 2)
+
+    async def test_sequential_commands_do_not_overlap(self):
+        success = await self.cmdmgr.run_async('pause ; pause & pause')
+        self.assertEqual(success, True)
+        self.assertEqual(self.max_running, 1)
+
+    async def test_parallel_commands_succeed_if_all_succeed(self):
+        await self.assert_success('true , true')
+        await self.assert_failure('true , false')
+        await self.assert_failure('false , true')
+        await self.assert_success([['true'], 'meanwhile', ['true']])
+        await self.assert_failure([['false'], 'meanwhile', ['true']])
+
+    async def test_parallel_commands_in_conditional_chain(self):
+        async def do_test(cmdchain, success, true_calls=0, false_calls=0):
+            self.true_cb.reset() ; self.false_cb.reset()  # noqa: E702
+            result = await self.cmdmgr.run_async(cmdchain)
+            self.assertEqual(result, success)
+            self.assertEqual(self.true_cb.calls, true_calls)
+            self.assertEqual(self.false_cb.calls, false_calls)
+
+        testcases = (
+            ([['true'], ',', ['true'], '&', ['true']],
+             {'success': True, 'true_calls': 3}),
+            ([['true'], ',', ['false'], '&', ['true']],
+             {'success': False, 'true_calls': 1, 'false_calls': 1}),
+            ([['true'], ',', ['false'], '|', ['true']],
+             {'success': True, 'true_calls': 2, 'false_calls': 1}),
+            ([['false'], '|', ['true'], ',', ['true']],
+             {'success': True, 'true_calls': 2, 'false_calls': 1}),
+            ([['true'], '|', ['true'], ',', ['true']],
+             {'success': True, 'true_calls': 1}),
+            ([['true'], ';', ['false'], ',', ['true'], ';', ['true']],
+             {'success': True, 'true_calls': 3, 'false_calls': 1}),
+        )
+        await self.run_testcases(testcases, do_test)
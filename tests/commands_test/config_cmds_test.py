@@ -417,7 +417,7 @@ class TestSetCmd(CommandTestCase):
         mock_candidates.setting_names.return_value = Candidates(('mock settings',))
         mock_candidates.setting_values.return_value = Candidates(('mock values',))
         await self.assert_completion_candidates(SetCmd, Args(('set', '-'), curarg_index=1, curarg_curpos=1),
-                                                exp_cands=(('--columns', '--sort'),
+                                                exp_cands=(('--columns', '--format', '--sort'),
                                                            ('mock settings',)))
         await self.assert_completion_candidates(SetCmd, Args(('set', 'foo', '-'), curarg_index=2, curarg_curpos=1),
                                                 exp_cands=('mock values',))
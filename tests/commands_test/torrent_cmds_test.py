@@ -1,4 +1,5 @@
 import os
+import tempfile
 from types import SimpleNamespace
 
 import asynctest
@@ -95,9 +96,10 @@ class TestAddTorrentsCmd(CommandTestCase):
         self.srvapi.torrent.response = Response(
             success=True,
             msgs=('Added Some Torrent',),
-            torrent=MockTorrent(id=1, name='Some Torrent'))
+            torrents=(MockTorrent(id=1, name='Some Torrent'),))
         process = await self.execute(AddTorrentsCmd, 'some.torrent')
-        self.srvapi.torrent.assert_called(1, 'add', ('some.torrent',), {'stopped': False, 'path': None})
+        self.srvapi.torrent.assert_called(1, 'add_many', (['some.torrent'],),
+                                          {'stopped': False, 'path': None, 'labels': None})
         self.assertEqual(process.success, True)
         self.assert_stdout('add: Added Some Torrent')
         self.assert_stderr()
@@ -108,9 +110,10 @@ class TestAddTorrentsCmd(CommandTestCase):
         self.srvapi.torrent.response = Response(
             success=False,
             errors=('Bogus torrent',),
-            torrent=None)
+            torrents=())
         process = await self.execute(AddTorrentsCmd, 'some.torrent')
-        self.srvapi.torrent.assert_called(1, 'add', ('some.torrent',), {'stopped': False, 'path': None})
+        self.srvapi.torrent.assert_called(1, 'add_many', (['some.torrent'],),
+                                          {'stopped': False, 'path': None, 'labels': None})
         self.assertEqual(process.success, False)
         self.assert_stdout()
         self.assert_stderr('add: Bogus torrent')
@@ -118,18 +121,14 @@ class TestAddTorrentsCmd(CommandTestCase):
     @patch('stig.commands.cli.AddTorrentsCmd.make_path_absolute', side_effect=lambda path: path)
     async def test_multiple_torrents(self, mock_make_path_absolute):
         from stig.commands.cli import AddTorrentsCmd
-        self.srvapi.torrent.response = [
-            Response(success=True,
-                     msgs=['Added Some Torrent'],
-                     torrent=MockTorrent(id=1, name='Some Torrent')),
-            Response(success=False,
-                     errors=('Something went wrong',),
-                     torrent=None),
-        ]
+        self.srvapi.torrent.response = Response(
+            success=False,
+            msgs=['Added Some Torrent'],
+            errors=('Something went wrong',),
+            torrents=(MockTorrent(id=1, name='Some Torrent'),))
         process = await self.execute(AddTorrentsCmd, 'some.torrent', 'another.torrent')
-        self.srvapi.torrent.assert_called(2, 'add',
-                                          ('some.torrent',), {'stopped': False, 'path': None},
-                                          ('another.torrent',), {'stopped': False, 'path': None})
+        self.srvapi.torrent.assert_called(1, 'add_many', (['some.torrent', 'another.torrent'],),
+                                          {'stopped': False, 'path': None, 'labels': None})
         self.assertEqual(process.success, False)
         self.assert_stdout('add: Added Some Torrent')
         self.assert_stderr('add: Something went wrong')
@@ -140,9 +139,10 @@ class TestAddTorrentsCmd(CommandTestCase):
         self.srvapi.torrent.response = Response(
             success=True,
             msgs=('Added Some Torrent',),
-            torrent=MockTorrent(id=1, name='Some Torrent'))
+            torrents=(MockTorrent(id=1, name='Some Torrent'),))
         process = await self.execute(AddTorrentsCmd, 'some.torrent', '--stopped')
-        self.srvapi.torrent.assert_called(1, 'add', ('some.torrent',), {'stopped': True, 'path': None})
+        self.srvapi.torrent.assert_called(1, 'add_many', (['some.torrent'],),
+                                          {'stopped': True, 'path': None, 'labels': None})
         self.assertEqual(process.success, True)
         self.assert_stdout('add: Added Some Torrent')
         self.assert_stderr()
@@ -198,6 +198,47 @@ class TestAddTorrentsCmd(CommandTestCase):
         mock_fs_path.assert_called_once_with('foo', base='/bar/baz', directories_only=True)
 
 
+class TestWatchTorrentsCmd(CommandTestCase):
+    def setUp(self):
+        super().setUp()
+        self.patch('stig.objects',
+                   srvapi=self.srvapi,
+                   cfg=self.cfg,
+                   localcfg={'watch.interval': 10, 'watch.settle': 0, 'watch.batch-size': 100})
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        super().tearDown()
+
+    async def test_once(self):
+        from stig.commands.cli import WatchTorrentsCmd
+        path = os.path.join(self.tmpdir.name, 'some.torrent')
+        with open(path, 'wb') as f:
+            f.write(b'd4:infod4:name3:fooee')
+        self.srvapi.torrent.response = Response(
+            success=True,
+            msgs=('Added Some Torrent',),
+            torrents=(MockTorrent(id=1, name='Some Torrent'),),
+            results=(Response(success=True),))
+        process = await self.execute(WatchTorrentsCmd, '--once', '--labels', 'foo,bar', self.tmpdir.name)
+        self.srvapi.torrent.assert_called(1, 'add_many', ([path],),
+                                          {'stopped': False, 'path': None, 'labels': ['foo', 'bar']})
+        self.assertEqual(process.success, True)
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, 'done', 'some.torrent')))
+        self.assert_stdout('watch: Added Some Torrent')
+        self.assert_stderr()
+
+    async def test_not_a_directory(self):
+        from stig.commands.cli import WatchTorrentsCmd
+        path = os.path.join(self.tmpdir.name, 'nope')
+        process = await self.execute(WatchTorrentsCmd, '--once', path)
+        self.srvapi.torrent.assert_called(0, 'add_many')
+        self.assertEqual(process.success, False)
+        self.assert_stdout()
+        self.assert_stderr('watch: Not a directory: %s' % (path,))
+
+
 class TestTorrentDetailsCmd(CommandTestCase):
     def setUp(self):
         super().setUp()
@@ -227,13 +268,13 @@ class TestTorrentDetailsCmd(CommandTestCase):
     async def test_single_match(self):
         tlist = (MockTorrent(id=1, name='Torrent A', seeds='50'),)
         await self.do(['mock filter'], tlist=tlist, success_exp=True, errors=())
-        self.mock_display_details.assert_called_once_with(1)
+        self.mock_display_details.assert_called_once_with(1, None)
 
     async def test_multiple_matches_are_sorted_by_name(self):
         tlist = (MockTorrent(id=1, name='Torrent B', seeds='51'),
                  MockTorrent(id=2, name='Torrent A', seeds='50'))
         await self.do(['mock filter'], tlist=tlist, success_exp=True, errors=())
-        self.mock_display_details.assert_called_once_with(2)
+        self.mock_display_details.assert_called_once_with(2, None)
 
     @patch('stig.completion.candidates.torrent_filter')
     async def test_completion_candidates_for_posargs(self, mock_torrent_filter):
@@ -303,6 +344,19 @@ class TestListTorrentsCmd(CommandTestCase):
     async def test_sort_and_filter(self):
         await self.do(['-s', 'name,size', 'downloading', 'uploading'], errors=())
 
+    async def test_format(self):
+        self.srvapi.torrent.response = Response(success=True, errors=(), msgs=(),
+                                                torrents=(MockTorrent(id=1, name='Some Torrent'),
+                                                          MockTorrent(id=2, name='Another Torrent')))
+        process = await self.execute(ListTorrentsCmd, '--format', 'ndjson')
+        self.assertEqual(process.success, True)
+        self.assert_stdout(r'^\{"id": 1, "name": "Some Torrent"\}$',
+                           r'^\{"id": 2, "name": "Another Torrent"\}$')
+        self.assert_stderr()
+
+    async def test_invalid_format(self):
+        await self.do(['--format', 'foo'], errors=("^%s: Argument --format/-f: invalid choice: 'foo'" % ListTorrentsCmd.name,))
+
     async def test_invalid_filter(self):
         def bad_select_torrents(self, *args, **kwargs):
             raise ValueError('Nope!')
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import asynctest
+
+import stig
+from stig import server
+from stig.objects import cmdmgr
+
+PYTHONPATH = os.path.dirname(os.path.dirname(os.path.abspath(stig.__file__)))
+
+# Run forward() with command line arguments and exit with its exit code or
+# FALLBACK if the server refused to run the commands
+FALLBACK = 100
+FORWARD_SCRIPT = """
+import sys
+from stig.server import forward
+exit_code = forward(sys.argv[1:])
+sys.exit(%d if exit_code is None else exit_code)
+""" % (FALLBACK,)
+
+
+class Test_get_socket_path(unittest.TestCase):
+    def test_no_socket_option(self):
+        self.assertEqual(server._get_socket_path(['ls', 'foo']), (server.DEFAULT_SOCKET, ['ls', 'foo']))
+        self.assertEqual(server._get_socket_path([]), (server.DEFAULT_SOCKET, []))
+
+    def test_socket_option_with_separate_value(self):
+        self.assertEqual(server._get_socket_path(['--socket', '/foo/bar', 'ls']), ('/foo/bar', ['ls']))
+
+    def test_socket_option_with_equals_sign(self):
+        self.assertEqual(server._get_socket_path(['--socket=/foo/bar', 'ls']), ('/foo/bar', ['ls']))
+
+    def test_socket_option_without_value(self):
+        self.assertEqual(server._get_socket_path(['--socket']), (server.DEFAULT_SOCKET, ['--socket']))
+
+    def test_socket_option_is_only_removed_at_the_start(self):
+        self.assertEqual(server._get_socket_path(['ls', '--socket', '/foo/bar']),
+                         (server.DEFAULT_SOCKET, ['ls', '--socket', '/foo/bar']))
+
+
+class TestServer(asynctest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cmdmgr.load_cmds_from_module('stig.commands.cli', 'stig.commands.tui')
+        cmdmgr.active_interface = 'cli'
+
+    async def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'stig.socket')
+        self.server = server.Server(self.path)
+        await self.server.start()
+
+    async def tearDown(self):
+        await self.server.stop()
+        self.tmpdir.cleanup()
+
+    async def forward(self, *argv):
+        # Commands run with redirected sys.stdout and sys.stderr, so the client
+        # must run in its own process
+        client = await asyncio.create_subprocess_exec(
+            sys.executable, '-c', FORWARD_SCRIPT, '--socket', self.path, *argv,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            env=dict(os.environ, PYTHONPATH=PYTHONPATH))
+        stdout, stderr = await client.communicate()
+        exit_code = None if client.returncode == FALLBACK else client.returncode
+        return exit_code, stdout.decode('utf-8'), stderr.decode('utf-8')
+
+    async def test_socket_is_only_accessible_by_owner(self):
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o700)
+
+    async def test_command_output_is_forwarded(self):
+        exit_code, stdout, stderr = await self.forward('help')
+        self.assertEqual(exit_code, 0)
+        self.assertIn('SYNTAX', stdout)
+        self.assertEqual(stderr, '')
+
+    async def test_fallback_for_tui_commands(self):
+        self.assertEqual((await self.forward('ls', ';', 'tab'))[0], None)
+
+    async def test_fallback_for_local_options(self):
+        for option in ('--tui', '--debug=server'):
+            self.assertEqual((await self.forward(option, 'help'))[0], None)
+
+    async def test_fallback_for_commands_that_run_until_interrupted(self):
+        self.assertEqual((await self.forward('ls', ';', 'watch', self.tmpdir.name))[0], None)
+
+    async def test_commands_are_cancelled_when_client_disconnects(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def run_forever(clicmds):
+            started.set()
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch.object(cmdmgr, 'run_async', run_forever):
+            reader, writer = await asyncio.open_unix_connection(self.path)
+            request = {'argv': ['help'], 'cwd': os.getcwd(), 'columns': 80, 'lines': 25}
+            writer.write(json.dumps(request).encode('utf-8') + b'\n')
+            await asyncio.wait_for(started.wait(), timeout=5)
+            writer.close()
+            await asyncio.wait_for(cancelled.wait(), timeout=5)
+
+        # Next client isn't blocked
+        self.assertEqual((await self.forward('help'))[0], 0)
+
+    async def test_fallback_for_invalid_arguments(self):
+        self.assertEqual((await self.forward('--no-such-option'))[0], None)
+
+    async def forward_in_thread(self, *argv):
+        # For cases that must not connect to the server; this returns instead
+        # of blocking forever if they do
+        return await self.loop.run_in_executor(
+            None, server.forward, ['--socket', self.path] + list(argv))
+
+    async def test_no_commands(self):
+        self.assertEqual(await self.forward_in_thread(), None)
+
+    async def test_missing_socket(self):
+        await self.server.stop()
+        self.assertEqual(await self.forward_in_thread('help'), None)
+
+    async def test_socket_that_is_accessible_by_others(self):
+        os.chmod(self.path, 0o770)
+        self.assertEqual(await self.forward_in_thread('help'), None)
+
+    async def test_socket_of_other_user(self):
+        with patch('os.getuid', return_value=os.getuid() + 1):
+            self.assertEqual(await self.forward_in_thread('help'), None)
+
+    async def test_server_is_already_running(self):
+        with self.assertRaises(RuntimeError):
+            await server.Server(self.path).start()
@@ -0,0 +1,103 @@
+import unittest
+
+import urwid
+
+from stig.tui.listwalker import VirtualListWalker
+
+
+class ItemWidget(urwid.Text):
+    def __init__(self, id):
+        self.id = id
+        super().__init__(str(id))
+
+
+class TestVirtualListWalker(unittest.TestCase):
+    def make_walker(self, ids=(), cache_size=5):
+        def update_widget(widget, id):
+            widget.id = id
+            widget.set_text(str(id))
+        walker = VirtualListWalker(make_widget=ItemWidget, update_widget=update_widget,
+                                   cache_size=cache_size)
+        walker.set_ids(ids)
+        return walker
+
+    def test_widgets_are_created_on_demand(self):
+        walker = self.make_walker(ids=range(1000))
+        self.assertEqual(len(walker), 1000)
+        self.assertEqual(walker.stats, {'created': 0, 'recycled': 0, 'cached': 0})
+        self.assertEqual(walker[500].id, 500)
+        self.assertEqual(walker.stats, {'created': 1, 'recycled': 0, 'cached': 1})
+        self.assertIs(walker[500], walker[500])
+        self.assertEqual(walker.stats, {'created': 1, 'recycled': 0, 'cached': 1})
+
+    def test_widgets_are_recycled(self):
+        walker = self.make_walker(ids=range(1000), cache_size=3)
+        widgets = [walker[i] for i in range(3)]
+        self.assertEqual(walker.stats, {'created': 3, 'recycled': 0, 'cached': 3})
+        w = walker[999]
+        self.assertEqual(w.id, 999)
+        self.assertIs(w, widgets[0])
+        self.assertEqual(walker.stats, {'created': 3, 'recycled': 1, 'cached': 3})
+        self.assertIs(walker.cached_widget(0), None)
+        self.assertIs(walker.cached_widget(1), widgets[1])
+
+    def test_widgets_of_removed_items_are_recycled(self):
+        walker = self.make_walker(ids=('a', 'b', 'c'))
+        wa, wb = walker[0], walker[1]
+        walker.set_ids(('b', 'd'))
+        self.assertEqual(dict(walker.widgets()), {'b': wb})
+        self.assertIs(walker[1], wa)
+        self.assertEqual(wa.id, 'd')
+        self.assertEqual(walker.stats, {'created': 2, 'recycled': 1, 'cached': 2})
+
+    def test_shrinking_cache_size(self):
+        walker = self.make_walker(ids=range(10), cache_size=10)
+        for i in range(10):
+            walker[i]
+        walker.cache_size = 4
+        self.assertEqual(tuple(id for id,w in walker.widgets()), (6, 7, 8, 9))
+
+    def test_positions(self):
+        walker = self.make_walker(ids=('a', 'b', 'c'))
+        self.assertEqual(tuple(walker.positions()), (0, 1, 2))
+        self.assertEqual(tuple(walker.positions(reverse=True)), (2, 1, 0))
+        self.assertEqual(walker.get_next(0)[1], 1)
+        self.assertEqual(walker.get_next(2), (None, None))
+        self.assertEqual(walker.get_prev(0), (None, None))
+        self.assertEqual(walker.position_of('c'), 2)
+        self.assertEqual(walker.position_of('x'), None)
+
+    def test_focus(self):
+        walker = self.make_walker(ids=('a', 'b', 'c'))
+        self.assertEqual(walker.focus_id, 'a')
+        walker.set_focus(2)
+        self.assertEqual(walker.get_focus()[1], 2)
+        self.assertEqual(walker.focus_id, 'c')
+        with self.assertRaises(IndexError):
+            walker.set_focus(3)
+        walker.set_ids(('a',))
+        self.assertEqual(walker.focus_id, 'a')
+        walker.clear()
+        self.assertEqual(walker.focus_id, None)
+        self.assertEqual(walker.get_focus(), (None, None))
+
+    def test_listbox_only_renders_visible_widgets(self):
+        walker = self.make_walker(ids=range(10000), cache_size=30)
+        listbox = urwid.ListBox(walker)
+        listbox.render((20, 10), focus=True)
+        self.assertLessEqual(walker.stats['created'], 11)
+        for _ in range(100):
+            listbox.keypress((20, 10), 'page down')
+            listbox.render((20, 10), focus=True)
+        self.assertLessEqual(walker.stats['created'], 30)
+        self.assertGreater(walker.get_focus()[1], 900)
+
+    def test_setting_same_ids_is_not_a_modification(self):
+        walker = self.make_walker(ids=range(100))
+        modified = []
+        urwid.connect_signal(walker, 'modified', lambda: modified.append(True))
+        walker.set_ids(range(100))
+        self.assertEqual(modified, [])
+        walker.set_ids(range(99, -1, -1))
+        self.assertEqual(modified, [True])
+        self.assertEqual(walker.position_of(99), 0)
@@ -621,6 +621,19 @@ class TestInt(_TestBase):
         self.assertEqual(Int('1.4'), 1)
         self.assertEqual(Int('1.5'), 2)
 
+    def test_plain_numbers_are_equivalent_to_strings(self):
+        for args in ({}, {'unit': 'B'}, {'unit': 'b', 'prefix': 'binary'}, {'hide_unit': True}):
+            for value in (0, 1024, 1536.4, -3):
+                fast, slow = Int(value, **args), Int(str(value), **args)
+                self.assertEqual(type(fast), type(slow))
+                self.assertEqual(fast, slow)
+                self.assertEqual(str(fast), str(slow))
+                self.assertEqual(fast._args, slow._args)
+        with self.assertRaises(ValueError):
+            Int(float('inf'))
+        with self.assertRaises(ValueError):
+            Int(5, prefix='foo')
+
 class TestPercent(_TestBase):
     def test_string(self):
         self.assertEqual(str(Percent(0)), '0%')